@@ -0,0 +1,330 @@
+"""
+Turtle 실행 성능 벤치마크
+
+커리큘럼(frontend/src/data/pythonCurriculum.ts)의 turtle 예제와 부하용 합성 프로그램을
+서버 작업 프로세스와 같은 진입점(turtle_runner.run_turtle_code)으로 실행하여
+정적 이미지 형식(png/webp/svg)과 애니메이션 출력(frames/apng/webp/gif)별로
+run_turtle_code가 기록하는 단계별 시간(exec, integrate, render, encode, base64),
+프레임 수, 최대 메모리(RSS), 응답 크기와 결과 캐시(RenderCache) 저장/적중 시간을 JSON으로 저장한다.
+저장해 둔 기준 결과와 비교하여 임계값보다 느려진 항목이 있으면 종료 코드 1을 반환한다.
+
+사용법:
+    python benchmark_turtle.py -o results.json
+    python benchmark_turtle.py -o results.json --baseline baseline.json --threshold 0.2
+    python benchmark_turtle.py --filter curriculum --modes static --formats png,svg
+    python benchmark_turtle.py --modes animate --outputs frames,apng,gif --binary --cache-dir /tmp/turtle-cache
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CURRICULUM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               '..', 'frontend', 'src', 'data', 'pythonCurriculum.ts')
+
+# 부하용 합성 프로그램
+SYNTHETIC_CASES = {
+    'deep_loops': (
+        "for i in range(60):\n"
+        "    for j in range(60):\n"
+        "        t.forward(2)\n"
+        "        t.right(1)\n"
+        "    t.left(61)\n"
+    ),
+    'many_circles': (
+        "for i in range(120):\n"
+        "    t.circle(20 + i)\n"
+        "    t.right(3)\n"
+    ),
+    'large_fill': (
+        "t.color('red', 'yellow')\n"
+        "t.begin_fill()\n"
+        "for i in range(720):\n"
+        "    t.forward(300)\n"
+        "    t.right(170.5)\n"
+        "t.end_fill()\n"
+    ),
+    'long_animation': (
+        "colors = ['red', 'orange', 'green', 'blue', 'purple']\n"
+        "for i in range(2000):\n"
+        "    t.pencolor(colors[i % 5])\n"
+        "    t.forward(i % 250)\n"
+        "    t.right(91)\n"
+    ),
+    'dots_and_pens': (
+        "for i in range(400):\n"
+        "    t.pensize(i % 5 + 1)\n"
+        "    t.forward(10)\n"
+        "    t.dot(i % 15 + 3)\n"
+        "    t.left(37)\n"
+    ),
+}
+
+# 기준 결과와 비교하는 지표와, 노이즈로 보고 무시할 최소 증가량
+COMPARED_METRICS = {
+    'total_ms': 10.0,
+    'payload_bytes': 1024,
+    'peak_rss_mb': 5.0,
+}
+# 단계별 시간(timings의 각 단계)을 비교할 때 무시할 최소 증가량 (ms)
+COMPARED_STAGE_MIN_DELTA_MS = 5.0
+
+
+def load_curriculum_cases(path: str = CURRICULUM_PATH) -> Dict[str, str]:
+    """커리큘럼 데이터에서 turtle을 사용하는 활동의 starterCode 추출 (활동 ID -> 코드)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    cases = {}
+    # 각 활동은 "id": "..." 다음에 JSON 문자열 형식의 "starterCode": "..."를 가짐
+    pattern = re.compile(r'"id":\s*"([^"]+)"(?:(?!"id":).)*?"starterCode":\s*("(?:[^"\\]|\\.)*")', re.S)
+    for activity_id, literal in pattern.findall(source):
+        code = json.loads(literal)
+        if 'import turtle' in code or 'from turtle' in code:
+            cases[f'curriculum:{activity_id}'] = code
+    return cases
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _payload_bytes(result: Dict, binary: bool) -> int:
+    """응답 크기 - binary이면 이미지 바이트 합계, 아니면 timings를 뺀 JSON 크기"""
+    if binary:
+        images = result.get('frames') or [result.get('animation') or result.get('image') or b'']
+        return sum(len(image) for image in images)
+    body = {key: value for key, value in result.items() if key != 'timings'}
+    return len(json.dumps(body, ensure_ascii=False).encode('utf-8'))
+
+
+def _measure_once(job: Dict) -> Dict:
+    """서버 작업 프로세스와 같은 옵션으로 run_turtle_code를 한 번 실행 (캐시 미적중과 같은 경로)"""
+    import turtle_runner as tr
+
+    animate = job['mode'] == 'animate'
+    started = time.perf_counter()
+    result = tr.run_turtle_code(job['code'], job['width'], job['height'], animate, renderer=job['renderer'],
+                                output=job['variant'] if animate else 'frames',
+                                format='png' if animate else job['variant'], binary=job['binary'])
+    total_s = time.perf_counter() - started
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    return {'result': result, 'total_s': total_s}
+
+
+def _measure_cache(job: Dict, result: Dict) -> Optional[Dict]:
+    """
+    실행 결과를 RenderCache에 저장하고 다시 찾는 시간 (ms, 난수/시간을 쓰는 코드는 None)
+
+    cache_dir가 있으면 그 아래 임시 디렉토리에 디스크 계층을 만들고, 메모리 계층이 없는
+    새 캐시로 다시 읽어 서버 재시작 후의 디스크 적중 시간도 잰다.
+    """
+    from render_cache import RenderCache, make_cache_key, is_cacheable
+
+    if not is_cacheable(job['code']):
+        return None
+    animate = job['mode'] == 'animate'
+    # main.turtle_cache_key와 같은 옵션
+    key = make_cache_key(job['code'], width=job['width'], height=job['height'], animate=animate,
+                         output=job['variant'] if animate else 'frames',
+                         format='png' if animate else job['variant'], renderer=job['renderer'],
+                         max_frames=None, target_duration=None, binary=job['binary'])
+    value = {k: v for k, v in result.items() if k != 'timings'}
+
+    def timed(fn, *args) -> float:
+        started = time.perf_counter()
+        fn(*args)
+        return round((time.perf_counter() - started) * 1000, 3)
+
+    with tempfile.TemporaryDirectory(dir=job['cache_dir']) if job['cache_dir'] else nullcontext() as disk_dir:
+        cache = RenderCache(max_memory_bytes=256 * 1024 * 1024, disk_dir=disk_dir)
+        timings = {
+            'store_ms': timed(cache.put, key, value),
+            'memory_hit_ms': timed(cache.get, key),
+        }
+        if disk_dir:
+            timings['disk_hit_ms'] = timed(RenderCache(max_memory_bytes=0, disk_dir=disk_dir).get, key)
+    return timings
+
+
+def run_case(job: Dict) -> Dict:
+    """
+    하나의 (코드, 모드, 형식)을 warmup번 실행한 뒤(결과 버림) repeat번 실행하여 단계별 중앙값 기록
+
+    작업마다 새 프로세스에서 실행되므로 peak_rss_mb는 이 케이스만의 최대 메모리다
+    (인터프리터와 matplotlib/NumPy/PIL import 포함).
+    """
+    result = {'case': job['case'], 'mode': job['mode'], 'variant': job['variant']}
+    try:
+        # 첫 실행의 지연 import/거북이 이미지 준비 비용은 제외
+        for _ in range(job['warmup']):
+            _measure_once(job)
+        runs = [_measure_once(job) for _ in range(job['repeat'])]
+        cache = _measure_cache(job, runs[-1]['result'])
+    except Exception as e:
+        result.update({'success': False, 'error': f"{type(e).__name__}: {e}"})
+        return result
+
+    stages = list(dict.fromkeys(stage for run in runs for stage in run['result']['timings']))
+    last = runs[-1]['result']
+    result['timings'] = {stage: round(statistics.median(run['result']['timings'].get(stage, 0.0) for run in runs), 2)
+                         for stage in stages}
+    result['total_ms'] = round(statistics.median(run['total_s'] for run in runs) * 1000, 2)
+    result['cache'] = cache
+    result['frame_count'] = last.get('frame_count', 1)
+    result['source_frame_count'] = last.get('source_frame_count')
+    result['segments'] = last['stats']['segments']
+    result['payload_bytes'] = _payload_bytes(last, job['binary'])
+    result['peak_rss_mb'] = _peak_rss_mb()
+    result['success'] = True
+    result['error'] = None
+    return result
+
+
+def compare_results(results: List[Dict], baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    기준 결과보다 threshold 비율 이상 나빠진 지표 목록
+
+    단계별 시간은 'timings.<단계>' 지표로 비교한다.
+
+    Returns:
+        list: [{'case', 'mode', 'variant', 'metric', 'baseline', 'current', 'change'}]
+    """
+    def metrics(item: Dict) -> Dict:
+        values = {metric: item.get(metric) for metric in COMPARED_METRICS}
+        values.update({f'timings.{stage}': ms for stage, ms in (item.get('timings') or {}).items()})
+        return values
+
+    previous = {(item['case'], item['mode'], item.get('variant')): item for item in baseline.get('results', [])}
+    regressions = []
+    for item in results:
+        old = previous.get((item['case'], item['mode'], item['variant']))
+        if old is None:
+            continue
+        label = {'case': item['case'], 'mode': item['mode'], 'variant': item['variant']}
+        if old.get('success') and not item.get('success'):
+            regressions.append({**label, 'metric': 'success', 'baseline': True, 'current': False, 'change': None})
+            continue
+        before_values, after_values = metrics(old), metrics(item)
+        for metric, after in after_values.items():
+            before = before_values.get(metric)
+            if not before or after is None:
+                continue
+            min_delta = COMPARED_METRICS.get(metric, COMPARED_STAGE_MIN_DELTA_MS)
+            if after > before * (1 + threshold) and after - before > min_delta:
+                regressions.append({**label, 'metric': metric, 'baseline': before, 'current': after,
+                                    'change': round(after / before - 1, 3)})
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Turtle 실행 성능 벤치마크')
+    parser.add_argument('-o', '--output', help='결과 JSON 파일 경로 (생략하면 저장하지 않음)')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일 경로')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='회귀로 판단할 증가 비율 (기본 0.2 = 20%%)')
+    parser.add_argument('--repeat', type=int, default=3, help='케이스별 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--warmup', type=int, default=1, help='측정 전에 버리는 실행 횟수')
+    parser.add_argument('--modes', default='static,animate', help='실행 모드 (static,animate)')
+    parser.add_argument('--formats', default='png', help='정적 모드의 이미지 형식 (png,webp,svg)')
+    parser.add_argument('--outputs', default='frames', help='애니메이션 모드의 출력 형식 (frames,apng,webp,gif)')
+    parser.add_argument('--binary', action='store_true',
+                        help='이미지를 data URI 대신 바이트로 받음 (바이너리 응답 경로)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='결과 캐시 디스크 계층을 측정할 디렉토리 (생략하면 메모리 계층만)')
+    parser.add_argument('--filter', default='', help='이름에 이 문자열이 포함된 케이스만 실행')
+    parser.add_argument('--renderer', default=None, help='렌더러 백엔드 (기본값: TURTLE_RENDERER)')
+    parser.add_argument('--width', type=int, default=600)
+    parser.add_argument('--height', type=int, default=600)
+    args = parser.parse_args(argv)
+
+    cases = {**load_curriculum_cases(), **{f'synthetic:{name}': code for name, code in SYNTHETIC_CASES.items()}}
+    renderer = args.renderer or os.getenv('TURTLE_RENDERER', 'matplotlib')
+    variants = {
+        'static': [item.strip() for item in args.formats.split(',') if item.strip()],
+        'animate': [item.strip() for item in args.outputs.split(',') if item.strip()],
+    }
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    jobs = [
+        {'case': name, 'mode': mode, 'variant': variant, 'code': code, 'repeat': args.repeat,
+         'warmup': args.warmup, 'width': args.width, 'height': args.height, 'renderer': renderer,
+         'binary': args.binary, 'cache_dir': args.cache_dir}
+        for name, code in cases.items() if args.filter in name
+        for mode in modes
+        for variant in variants.get(mode, [])
+    ]
+
+    # 케이스마다 새 프로세스를 사용하여 메모리 측정이 서로 섞이지 않도록 함
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for result in pool.imap(run_case, jobs):
+            results.append(result)
+            label = f"{result['case']:<28} {result['mode']:<8} {result['variant']:<7}"
+            if result['success']:
+                stages = '  '.join(f"{stage} {ms:.1f}ms" for stage, ms in result['timings'].items())
+                print(f"{label} total {result['total_ms']:>9.1f}ms  frames {result['frame_count']:>5}  "
+                      f"{result['payload_bytes'] / 1024:>9.1f}KB  rss {result['peak_rss_mb']}MB  ({stages})")
+            else:
+                print(f"{label} 실패: {result['error']}")
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'renderer': renderer,
+            'binary': args.binary,
+            'cache_dir': args.cache_dir,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'width': args.width,
+            'height': args.height,
+        },
+        'results': results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        report['comparison'] = {'baseline': args.baseline, 'threshold': args.threshold,
+                                'regressions': regressions}
+        if regressions:
+            exit_code = 1
+            print(f"\n회귀 {len(regressions)}건 (임계값 {args.threshold:.0%}):")
+            for item in regressions:
+                print(f"  {item['case']} [{item['mode']}/{item['variant']}] {item['metric']}: "
+                      f"{item['baseline']} -> {item['current']}")
+        else:
+            print(f"\n기준 결과 대비 회귀 없음 (임계값 {args.threshold:.0%})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+오류 보고 코드 검증 실행기
+
+학생이 보고한 코드를 제한된 내장 함수만으로 실행하여 오류가 재현되는지 확인한다.
+API 프로세스가 아닌 실행 풀(execution_pool)의 작업 프로세스에서 호출되므로,
+작업마다 출력 캡처가 분리되고 제한 시간/CPU/메모리 제한은 실행 풀이 적용한다.
+
+출력은 BoundedOutput으로 캡처하여, 반복문 안의 print가 아무리 많아도
+앞부분과 뒷부분만 정해진 크기까지 보관한다. 실행 풀의 제한 시간보다 조금 짧은
+time_limit을 주면 그 시간이 지났을 때 실행을 중단하고, 그때까지 캡처한 출력과 함께
+시간 초과 결과를 돌려준다 (실행 풀이 프로세스를 종료하면 출력이 모두 사라지므로).
+"""
+import ctypes
+import hashlib
+import io
+import sys
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Callable, Optional
+
+# 검증 방식(허용 내장 함수, 실행 방법)이 바뀌면 올려서 저장된 검증 결과를 무효화
+VERIFIER_VERSION = '1'
+
+# 캡처하는 출력의 기본 최대 크기 (바이트, 앞부분과 뒷부분을 절반씩 보관)
+DEFAULT_MAX_OUTPUT_BYTES = 64 * 1024
+
+# 스트리밍 검증에서 출력을 모아서 보내는 간격 (초)
+STREAM_FLUSH_INTERVAL = 0.1
+
+
+def captured_print(*args, sep=' ', end='\n', file=None, flush=False):
+    """
+    내장 print와 같지만 한 번의 write로 기록
+
+    내장 print는 인자와 구분자마다 write를 호출하므로, 파이썬으로 구현한
+    BoundedOutput에서는 반복문 안의 print가 훨씬 느려진다.
+    """
+    if sep is not None and not isinstance(sep, str):
+        raise TypeError(f"sep must be None or a string, not {type(sep).__name__}")
+    if end is not None and not isinstance(end, str):
+        raise TypeError(f"end must be None or a string, not {type(end).__name__}")
+    text = (' ' if sep is None else sep).join(map(str, args)) + ('\n' if end is None else end)
+    (sys.stdout if file is None else file).write(text)
+
+
+# 검증 코드에서 사용할 수 있는 내장 함수
+ALLOWED_BUILTINS = {
+    'print': captured_print,
+    'len': len,
+    'range': range,
+    'str': str,
+    'int': int,
+    'float': float,
+    'list': list,
+    'dict': dict,
+    'tuple': tuple,
+    'set': set,
+    'abs': abs,
+    'max': max,
+    'min': min,
+    'sum': sum,
+    'sorted': sorted,
+    'enumerate': enumerate,
+    'zip': zip,
+    'map': map,
+    'filter': filter,
+}
+
+
+def code_hash(code: str) -> str:
+    """검증 결과를 저장하는 키 (코드의 sha256)"""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def output_digest(output: str) -> str:
+    """출력 내용 비교용 요약 (sha256)"""
+    return hashlib.sha256(output.encode('utf-8')).hexdigest()
+
+
+class BoundedOutput(io.TextIOBase):
+    """
+    크기가 제한된 텍스트 출력 캡처
+
+    처음 max_bytes/2 바이트(앞부분)와 마지막 max_bytes/2 바이트(뒷부분)만 보관하고,
+    그 사이는 버린 바이트 수만 기록한다. getvalue()는 잘린 경우 가운데에 생략 표시를 넣는다.
+
+    Args:
+        max_bytes: 보관할 최대 크기 (UTF-8 바이트)
+        listener: 앞부분에 기록되는 텍스트를 바로 전달받을 함수 (스트리밍용, 앞부분이 차면 더 호출되지 않음)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES, listener: Optional[Callable[[str], None]] = None):
+        self.head_limit = max_bytes // 2
+        self.tail_limit = max_bytes - self.head_limit
+        self.listener = listener
+        self.total_bytes = 0
+        self._head = bytearray()
+        self._head_full = self.head_limit == 0
+        # 뒷부분: 한도의 2배까지 쌓이면 마지막 tail_limit 바이트만 남김 (쓰기당 상수 시간)
+        self._tail = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        data = text.encode('utf-8', 'surrogateescape')
+        self.total_bytes += len(data)
+
+        if not self._head_full:
+            room = self.head_limit - len(self._head)
+            head, data = data[:room], data[room:]
+            self._head += head
+            self._head_full = len(self._head) >= self.head_limit
+            if self.listener is not None and head:
+                self.listener(head.decode('utf-8', 'ignore'))
+        if data:
+            self._tail += data
+            if len(self._tail) > 2 * self.tail_limit:
+                del self._tail[:-self.tail_limit or None]
+        return len(text)
+
+    def _tail_bytes(self) -> bytes:
+        return bytes(self._tail[-self.tail_limit:]) if self.tail_limit else b''
+
+    @property
+    def truncated(self) -> bool:
+        """가운데 부분을 버렸는지 여부"""
+        return self.total_bytes > len(self._head) + min(len(self._tail), self.tail_limit)
+
+    def getvalue(self) -> str:
+        tail = self._tail_bytes()
+        head = self._head.decode('utf-8', 'ignore')
+        if not self.truncated:
+            return head + tail.decode('utf-8', 'ignore')
+        omitted = self.total_bytes - len(self._head) - len(tail)
+        return f"{head}\n... (출력이 너무 길어 {omitted:,}바이트 생략) ...\n{tail.decode('utf-8', 'ignore')}"
+
+
+class SoftTimeoutExceeded(BaseException):
+    """
+    검증 코드 실행이 time_limit을 넘긴 경우
+
+    사용자 코드의 `except Exception`에 잡히지 않도록 BaseException을 상속한다.
+    """
+    pass
+
+
+class SoftDeadline:
+    """
+    with 블록을 실행하는 스레드에 seconds 후 SoftTimeoutExceeded를 발생시키는 컨텍스트 관리자
+
+    타이머 스레드가 대상 스레드에 비동기 예외를 설정하므로 메인 스레드가 아닌
+    스레드(스트리밍 검증)에서도 동작한다. 파이썬 바이트코드를 실행하는 중에만 예외가
+    전달되므로, 오래 걸리는 내장 함수 호출은 실행 풀의 제한 시간으로 중단된다.
+    seconds가 None이면 아무것도 하지 않는다.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self._lock = threading.Lock()
+        self._finished = False
+        self._fired = False
+        self._timer = None
+        self._thread_id = None
+
+    def _set_async_exc(self, exc):
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self._thread_id),
+                                                   ctypes.py_object(exc) if exc is not None else None)
+
+    def _fire(self):
+        with self._lock:
+            if not self._finished:
+                self._fired = True
+                self._set_async_exc(SoftTimeoutExceeded)
+
+    def __enter__(self):
+        if self.seconds is not None:
+            self._thread_id = threading.get_ident()
+            self._timer = threading.Timer(self.seconds, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._timer is None:
+            return False
+        self._timer.cancel()
+        with self._lock:
+            self._finished = True
+            if self._fired:
+                # 아직 전달되지 않은 예외는 with 블록 밖에서 발생하지 않도록 취소
+                self._set_async_exc(None)
+        return False
+
+
+def verify_code(code: str, max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+                listener: Optional[Callable[[str], None]] = None, time_limit: Optional[float] = None) -> dict:
+    """
+    제한된 globals/locals로 코드를 실행하여 오류 발생 여부 확인
+
+    작업 프로세스는 한 번에 하나의 작업만 실행하므로 sys.stdout/sys.stderr를
+    바꿔도 다른 검증의 출력과 섞이지 않는다.
+
+    Args:
+        code: 검증할 코드
+        max_output_bytes: 표준 출력/표준 오류 각각 보관할 최대 크기 (바이트)
+        listener: 표준 출력을 바로 전달받을 함수 (BoundedOutput 참고)
+        time_limit: 실행 제한 시간 (초, 벽시계 기준) - 넘기면 그때까지의 표준 출력과 함께
+            TimeoutError 결과를 반환 (None이면 실행 풀의 제한 시간만 적용)
+
+    Returns:
+        dict: {
+            'error_occurred': bool,
+            'error_message': str,
+            'error_type': str (예외 클래스 이름),
+            'output': str (정상 실행이면 표준 출력, 오류면 표준 오류 출력 - 잘린 경우 생략 표시 포함),
+            'output_truncated': bool,
+            'timed_out': bool (time_limit 초과 여부 - 서버 부하에 따라 달라지므로 저장하지 않음)
+        }
+    """
+    stdout = BoundedOutput(max_output_bytes, listener)
+    stderr = BoundedOutput(max_output_bytes)
+    restricted_globals = {'__builtins__': dict(ALLOWED_BUILTINS)}
+
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr), SoftDeadline(time_limit):
+            exec(code, restricted_globals, {})
+    except SoftTimeoutExceeded:
+        return {
+            'error_occurred': True,
+            'error_message': f"코드 실행 시간이 초과되었습니다 ({time_limit:g}초)",
+            'error_type': 'TimeoutError',
+            'output': stdout.getvalue(),
+            'output_truncated': stdout.truncated,
+            'timed_out': True,
+        }
+    except MemoryError:
+        raise  # 실행 풀이 메모리 제한 초과로 처리하도록 그대로 전달
+    except Exception as e:
+        return {
+            'error_occurred': True,
+            'error_message': str(e),
+            'error_type': type(e).__name__,
+            'output': stderr.getvalue(),
+            'output_truncated': stderr.truncated,
+            'timed_out': False,
+        }
+
+    return {
+        'error_occurred': False,
+        'error_message': '',
+        'error_type': '',
+        'output': stdout.getvalue(),
+        'output_truncated': stdout.truncated,
+        'timed_out': False,
+    }
+
+
+def stream_verify_code(code: str, max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+                       time_limit: Optional[float] = None):
+    """
+    verify_code와 같지만 실행 중에 표준 출력을 이벤트로 내보내는 제너레이터
+
+    코드는 별도 스레드에서 실행하고, STREAM_FLUSH_INTERVAL마다 그동안 쌓인 출력을 한 번에 보낸다.
+    전달되는 출력은 BoundedOutput의 앞부분뿐이므로 스트리밍 양도 max_output_bytes/2로 제한된다.
+    time_limit을 넘기면 실행 스레드가 중단되어 시간 초과 결과가 전달되고, 그 전에 실행 풀의
+    제한 시간/CPU 초과에 걸리면 작업 프로세스가 교체되면서 실행 중인 스레드도 함께 종료된다.
+
+    Yields:
+        dict: {'type': 'output', 'text': str} (0번 이상)
+              {'type': 'result', ...verify_code 결과} (마지막)
+    """
+    pending = []
+    lock = threading.Lock()
+    outcome = {}
+
+    def forward(text: str):
+        with lock:
+            pending.append(text)
+
+    def run():
+        try:
+            outcome['result'] = verify_code(code, max_output_bytes, forward, time_limit)
+        except MemoryError:
+            outcome['memory_error'] = True
+
+    thread = threading.Thread(target=run, name='verify-code', daemon=True)
+    thread.start()
+    while True:
+        thread.join(STREAM_FLUSH_INTERVAL)
+        with lock:
+            text = ''.join(pending)
+            pending.clear()
+        if text:
+            yield {'type': 'output', 'text': text}
+        if not thread.is_alive():
+            break
+
+    if outcome.get('memory_error'):
+        raise MemoryError()
+    yield {'type': 'result', **outcome['result']}
@@ -1,4 +1,7 @@
 import sqlite3
+import os
+import queue
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 import logging
@@ -7,48 +10,239 @@ logger = logging.getLogger(__name__)
 
 DATABASE_PATH = "edupy.db"
 
+# 연결마다 재사용하는 준비된 SQL 문(prepared statement) 수
+CACHED_STATEMENTS = 256
+
+
+class ConnectionPool:
+    """
+    SQLite 연결 풀
+
+    연결을 요청마다 새로 열지 않고 재사용하므로, 연결을 열 때의 파일/스키마 읽기와
+    SQL 문 준비(sqlite3 모듈의 연결별 statement cache)를 요청마다 반복하지 않는다.
+    연결은 WAL 모드로 열어 대시보드 조회가 오류 보고 저장과 서로 막지 않고 동시에 실행된다.
+
+    연결은 한 번에 한 스레드만 사용하지만, 반환된 뒤에는 다른 스레드가 가져갈 수 있다.
+
+    Args:
+        path: 데이터베이스 파일 경로
+        size: 최대 연결 수 (모두 사용 중이면 반환될 때까지 대기)
+        busy_timeout: 잠금/연결 대기 제한 시간 (밀리초)
+        cache_mb: 연결별 페이지 캐시 크기 (MB)
+        mmap_mb: 메모리 맵으로 읽는 최대 크기 (MB, 0이면 사용 안 함)
+    """
+
+    def __init__(self, path: str, size: int = 8, busy_timeout: int = 5000, cache_mb: int = 16, mmap_mb: int = 256):
+        self.path = path
+        self.size = max(1, size)
+        self.busy_timeout = busy_timeout
+        self.pragmas = (
+            "PRAGMA journal_mode = WAL",
+            "PRAGMA synchronous = NORMAL",  # WAL에서는 체크포인트 때만 fsync (전원 장애 시 마지막 커밋만 유실 가능)
+            f"PRAGMA busy_timeout = {int(busy_timeout)}",
+            f"PRAGMA cache_size = {-int(cache_mb) * 1024}",  # 음수는 KB 단위
+            f"PRAGMA mmap_size = {int(mmap_mb) * 1024 * 1024}",
+            "PRAGMA temp_store = MEMORY",
+        )
+        self._idle = queue.LifoQueue()  # 최근에 쓴 연결부터 재사용 (캐시가 데워진 연결)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout / 1000,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS
+        )
+        conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """쉬고 있는 연결을 가져오거나, 최대 연결 수 미만이면 새로 엶"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("데이터베이스 연결 풀이 닫혔습니다")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.busy_timeout / 1000)
+        except queue.Empty:
+            raise sqlite3.OperationalError("데이터베이스 연결을 기다리는 시간이 초과되었습니다") from None
+
+    def release(self, conn: sqlite3.Connection):
+        """연결을 풀에 반환 (끝나지 않은 트랜잭션은 롤백하여 잠금을 남기지 않음)"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # 사용할 수 없게 된 연결은 버리고 다음 요청에서 새로 엶
+            self._discard(conn)
+            return
+        if self._closed:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """쉬고 있는 연결을 모두 닫음 (사용 중인 연결은 반환될 때 닫힘)"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+class PooledConnection:
+    """
+    풀에서 가져온 연결
+
+    sqlite3.Connection과 같이 사용하고, close()를 호출하면 연결을 닫지 않고 풀에 반환한다.
+    """
+
+    _conn: Optional[sqlite3.Connection] = None
+
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        self._conn = pool.acquire()
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("이미 반환된 데이터베이스 연결입니다")
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """연결 풀 (첫 사용 시 환경 변수 설정으로 생성, DATABASE_PATH가 바뀌면 새로 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.path != DATABASE_PATH:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(
+                DATABASE_PATH,
+                size=int(os.getenv("DB_POOL_SIZE", "8")),
+                busy_timeout=int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000")),
+                cache_mb=int(os.getenv("DB_CACHE_MB", "16")),
+                mmap_mb=int(os.getenv("DB_MMAP_MB", "256"))
+            )
+        return _pool
+
+
+def close_db_connections():
+    """연결 풀의 연결을 모두 닫음 (서버 종료 시)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
 def get_db_connection():
-    """데이터베이스 연결 생성"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
-    return conn
+    """데이터베이스 연결 가져오기 (close() 하면 연결 풀에 반환)"""
+    return PooledConnection(get_pool())
 
 def init_database():
     """데이터베이스 초기화 및 테이블 생성"""
     conn = get_db_connection()
     cursor = conn.cursor()
-    
-    # 오류 보고 테이블 생성
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS error_reports (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            level TEXT NOT NULL,
-            activity TEXT NOT NULL,
-            error_message TEXT NOT NULL,
-            user_code TEXT NOT NULL,
-            timestamp TEXT NOT NULL,
-            resolved BOOLEAN DEFAULT 0,
-            resolved_at DATETIME,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # 인덱스 생성 (검색 성능 향상)
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_level ON error_reports(level)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_activity ON error_reports(activity)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_timestamp ON error_reports(timestamp)
-    """)
-    
-    conn.commit()
-    conn.close()
-    
+
+    try:
+        # 오류 보고 테이블 생성
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS error_reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                level TEXT NOT NULL,
+                activity TEXT NOT NULL,
+                error_message TEXT NOT NULL,
+                user_code TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                resolved BOOLEAN DEFAULT 0,
+                resolved_at DATETIME,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # 인덱스 생성 (검색 성능 향상)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_level ON error_reports(level)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_activity ON error_reports(activity)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_timestamp ON error_reports(timestamp)
+        """)
+
+        # 코드 검증 결과 테이블 (같은 코드는 검증기 버전이 같으면 다시 실행하지 않음)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS verification_results (
+                code_hash TEXT PRIMARY KEY,
+                verifier_version TEXT NOT NULL,
+                error_occurred BOOLEAN NOT NULL,
+                error_type TEXT NOT NULL,
+                error_message TEXT NOT NULL,
+                output TEXT NOT NULL,
+                output_truncated BOOLEAN NOT NULL DEFAULT 0,
+                output_digest TEXT NOT NULL,
+                verified_at DATETIME NOT NULL
+            )
+        """)
+
+        # 이전 버전에서 만든 검증 결과 테이블에 없는 열 추가
+        cursor.execute("PRAGMA table_info(verification_results)")
+        columns = {row['name'] for row in cursor.fetchall()}
+        if 'output_truncated' not in columns:
+            cursor.execute("ALTER TABLE verification_results ADD COLUMN output_truncated BOOLEAN NOT NULL DEFAULT 0")
+
+        conn.commit()
+    finally:
+        conn.close()
+
     logger.info("Database initialized successfully")
 
 def check_duplicate_error(level: str, activity: str, error_message: str) -> Optional[Dict]:
@@ -306,3 +500,150 @@ def toggle_error_resolved(error_id: int) -> bool:
     finally:
         conn.close()
 
+
+def get_error_reports_for_verification(ids: Optional[List[int]] = None, filter_status: str = 'unresolved',
+                                       level: Optional[str] = None, activity: Optional[str] = None,
+                                       limit: int = 500) -> List[Dict]:
+    """
+    일괄 검증할 오류 보고의 코드를 한 번의 쿼리로 조회
+
+    Args:
+        ids: 조회할 오류 ID 목록 (지정하면 나머지 필터는 무시)
+        filter_status: 'all', 'resolved', 'unresolved'
+        level: 레벨 필터
+        activity: 활동 필터
+        limit: 최대 개수
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        conditions = []
+        params = []
+        if ids is not None:
+            if not ids:
+                return []
+            conditions.append(f"id IN ({', '.join('?' for _ in ids)})")
+            params.extend(ids)
+        else:
+            if filter_status == 'resolved':
+                conditions.append("resolved = 1")
+            elif filter_status == 'unresolved':
+                conditions.append("resolved = 0")
+            if level is not None:
+                conditions.append("level = ?")
+                params.append(level)
+            if activity is not None:
+                conditions.append("activity = ?")
+                params.append(activity)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor.execute(f"""
+            SELECT id, level, activity, error_message, user_code, resolved
+            FROM error_reports
+            {where}
+            ORDER BY created_at DESC
+            LIMIT ?
+        """, (*params, limit))
+
+        return [dict(row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+def mark_errors_resolved(ids: List[int]) -> List[int]:
+    """
+    여러 오류를 한 번에 해결됨으로 표시 (이미 해결된 오류는 그대로)
+
+    Returns:
+        새로 해결됨으로 표시된 오류 ID 목록
+    """
+    if not ids:
+        return []
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        placeholders = ', '.join('?' for _ in ids)
+        cursor.execute(f"""
+            SELECT id FROM error_reports
+            WHERE resolved = 0 AND id IN ({placeholders})
+        """, ids)
+        resolved_ids = [row['id'] for row in cursor.fetchall()]
+        if resolved_ids:
+            cursor.execute(f"""
+                UPDATE error_reports
+                SET resolved = 1, resolved_at = CURRENT_TIMESTAMP
+                WHERE id IN ({', '.join('?' for _ in resolved_ids)})
+            """, resolved_ids)
+        conn.commit()
+        logger.info(f"{len(resolved_ids)} errors marked as resolved")
+        return resolved_ids
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Failed to mark errors resolved: {str(e)}")
+        raise
+    finally:
+        conn.close()
+
+def get_verification_results(code_hashes: List[str], verifier_version: str) -> Dict[str, Dict]:
+    """
+    저장된 코드 검증 결과를 한 번의 쿼리로 조회 (검증기 버전이 다른 결과는 제외)
+
+    Returns:
+        dict: 코드 해시 -> 검증 결과
+    """
+    if not code_hashes:
+        return {}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"""
+            SELECT code_hash, error_occurred, error_type, error_message, output, output_truncated,
+                   output_digest, verified_at
+            FROM verification_results
+            WHERE verifier_version = ? AND code_hash IN ({', '.join('?' for _ in code_hashes)})
+        """, (verifier_version, *code_hashes))
+
+        results = {}
+        for row in cursor.fetchall():
+            result = dict(row)
+            result['error_occurred'] = bool(result['error_occurred'])
+            result['output_truncated'] = bool(result['output_truncated'])
+            result['timed_out'] = False  # 시간 초과 결과는 저장하지 않음
+            results[result.pop('code_hash')] = result
+        return results
+    finally:
+        conn.close()
+
+def save_verification_result(code_hash: str, verifier_version: str, result: Dict) -> str:
+    """
+    코드 검증 결과 저장 (같은 코드의 이전 결과는 덮어씀)
+
+    Args:
+        result: error_occurred, error_type, error_message, output, output_truncated, output_digest
+
+    Returns:
+        검증 시각 (verified_at)
+    """
+    verified_at = datetime.now().isoformat(timespec='seconds')
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            INSERT OR REPLACE INTO verification_results
+                (code_hash, verifier_version, error_occurred, error_type, error_message, output,
+                 output_truncated, output_digest, verified_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (code_hash, verifier_version, int(result['error_occurred']), result['error_type'],
+              result['error_message'], result['output'], int(result['output_truncated']),
+              result['output_digest'], verified_at))
+        conn.commit()
+        return verified_at
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Failed to save verification result: {str(e)}")
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,483 @@
+"""
+사용자 코드 실행 작업을 별도 프로세스에서 처리하는 실행 풀
+
+API 프로세스의 이벤트 루프를 막지 않도록 turtle 실행/렌더링 같은 무거운 작업을
+미리 실행해 둔(pre-forked) 작업 프로세스에 보내고, 결과를 await 할 수 있게 한다.
+
+- 작업 프로세스는 시작할 때 무거운 모듈(matplotlib/NumPy/PIL 등)을 미리 import
+- 작업마다 CPU 시간(RLIMIT_CPU)과 주소 공간(RLIMIT_AS) 제한을 적용 (Unix)
+  hard 제한도 함께 낮춰 사용자 코드가 setrlimit으로 제한을 풀 수 없게 하고,
+  CPU hard 제한은 작업 프로세스 수명 동안의 총량(작업별 제한 x 교체 전 작업 수)으로 정함
+- 제한 시간을 넘기거나 호출 측이 취소(클라이언트 연결 종료)하면
+  해당 작업 프로세스를 종료하고 새 프로세스로 교체
+- 작업 프로세스는 정해진 횟수만큼 작업을 처리하면 새 프로세스로 교체
+- 제너레이터를 반환하는 작업은 항목을 하나씩 스트리밍
+"""
+import asyncio
+import importlib
+import inspect
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows: 자원 제한 없이 실행
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# 작업 프로세스가 모듈을 미리 import 할 때까지 기다리는 최대 시간 (초)
+WORKER_READY_TIMEOUT = 60.0
+
+# 작업 프로세스가 연속으로 이만큼 시작하지 못하면 기다리던 작업에 WorkerCrashedError 전달
+WORKER_START_RETRIES = 3
+# 시작하지 못한 작업 프로세스를 다시 실행하기 전 대기 시간 (초, 연속 실패마다 두 배, 최대 MAX)
+WORKER_RESTART_BACKOFF = 0.5
+WORKER_RESTART_BACKOFF_MAX = 10.0
+
+# CPU 제한이 있고 교체 횟수를 지정하지 않은 경우의 교체 전 최대 작업 수
+# (CPU hard 제한은 다시 올릴 수 없으므로 작업 프로세스 수명 동안의 총량을 정해야 함)
+CPU_LIMITED_MAX_JOBS = 100
+
+
+class PoolBusyError(Exception):
+    """실행 중/대기 중인 작업이 대기열 한도를 넘은 경우"""
+    pass
+
+
+class JobTimeoutError(Exception):
+    """작업이 제한 시간 안에 끝나지 않은 경우"""
+    pass
+
+
+class ResourceLimitError(Exception):
+    """작업이 CPU 시간 또는 메모리 제한을 넘은 경우"""
+    pass
+
+
+class WorkerCrashedError(Exception):
+    """작업 프로세스가 결과를 돌려주지 못하고 종료된 경우"""
+    pass
+
+
+class _CpuLimitExceeded(BaseException):
+    """
+    작업 프로세스 안에서 CPU 시간 제한 초과 시 발생
+
+    사용자 코드의 `except Exception`에 잡히지 않도록 BaseException을 상속한다.
+    """
+    pass
+
+
+def _raise_cpu_limit(signum, frame):
+    raise _CpuLimitExceeded()
+
+
+def _address_space_bytes() -> Optional[int]:
+    """현재 프로세스의 가상 주소 공간 크기 (Linux 이외에는 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _set_cpu_limit(seconds: Optional[float]):
+    """지금까지 사용한 CPU 시간 + seconds를 soft 제한으로 설정 (None이면 hard 제한까지)"""
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds is None:
+        soft = hard
+    else:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(math.ceil(usage.ru_utime + usage.ru_stime + seconds))
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _set_hard_limit(limit: int, value: int):
+    """soft/hard 제한을 모두 value로 낮춤 (기존 hard 제한보다 크게는 올리지 않음)"""
+    _, hard = resource.getrlimit(limit)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(limit, (value, value))
+
+
+def _worker_main(conn, preload: Sequence[str], cpu_limit: Optional[float], memory_limit: Optional[int],
+                 cpu_budget: Optional[float] = None):
+    """
+    작업 프로세스 루프
+
+    모듈을 미리 import 하고 ('ready', None)을 보낸 뒤,
+    (fn, args, kwargs)를 받아 실행하고 결과를 돌려보낸다.
+    - ('ok', result): 일반 결과
+    - ('item', value) ... ('done', None): 제너레이터 결과
+    - ('error', message): 예외 발생
+    - ('limit', message): CPU 시간/메모리 제한 초과 (이후 프로세스는 교체됨)
+
+    cpu_budget은 이 프로세스가 쓸 수 있는 총 CPU 시간(hard 제한)이다. hard 제한은 낮추기만
+    할 수 있으므로 작업별 제한(cpu_limit)은 soft 제한으로 적용하고(초과하면 SIGXCPU),
+    사용자 코드가 soft 제한을 올려도 hard 제한을 넘으면 커널이 프로세스를 종료한다.
+    """
+    for module_name in preload:
+        importlib.import_module(module_name)
+
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+        if cpu_budget:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            _set_hard_limit(resource.RLIMIT_CPU, int(math.ceil(usage.ru_utime + usage.ru_stime + cpu_budget)))
+        if memory_limit:
+            # 미리 import 한 모듈이 차지한 주소 공간을 기준으로 제한 (soft = hard)
+            baseline = _address_space_bytes() or 0
+            _set_hard_limit(resource.RLIMIT_AS, baseline + memory_limit)
+
+    conn.send(('ready', None))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        fn, args, kwargs = job
+        try:
+            _set_cpu_limit(cpu_limit)
+            result = fn(*args, **kwargs)
+            if inspect.isgenerator(result):
+                for item in result:
+                    conn.send(('item', item))
+                conn.send(('done', None))
+            else:
+                conn.send(('ok', result))
+        except _CpuLimitExceeded:
+            conn.send(('limit', f"CPU 사용 시간 제한({cpu_limit:g}초)을 초과했습니다"))
+        except MemoryError:
+            conn.send(('limit', "메모리 사용량 제한을 초과했습니다"))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+        finally:
+            try:
+                _set_cpu_limit(None)
+            except _CpuLimitExceeded:
+                pass
+
+
+class _Worker:
+    """작업 프로세스 하나와 통신 파이프"""
+
+    def __init__(self, context, preload, cpu_limit, memory_limit, cpu_budget=None):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main,
+                                       args=(child_conn, tuple(preload), cpu_limit, memory_limit, cpu_budget),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False  # 모듈 preload 완료 여부
+        self.jobs = 0  # 처리한 작업 수
+        self.retire = False  # 작업 후 교체해야 하는지 여부
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        """프로세스 강제 종료 (결과를 기다리던 스레드는 EOFError로 깨어남)"""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+    def stop(self):
+        """남은 작업 없이 정상 종료 요청"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class ExecutionPool:
+    """
+    미리 실행해 둔 작업 프로세스 풀
+
+    Args:
+        max_workers: 작업 프로세스 수 (기본: CPU 코어 수)
+        max_queue: 작업 프로세스를 기다릴 수 있는 최대 작업 수 (초과 시 PoolBusyError)
+        timeout: 작업별 기본 제한 시간 (초, 벽시계 기준)
+        name: 로그에 표시할 풀 이름
+        preload: 작업 프로세스 시작 시 미리 import 할 모듈 이름 목록
+        max_jobs_per_worker: 작업 프로세스 하나가 처리할 최대 작업 수
+            (0이면 제한 없음, cpu_limit이 있으면 CPU_LIMITED_MAX_JOBS)
+        cpu_limit: 작업별 CPU 시간 제한 (초, None이면 제한 없음)
+        memory_limit: 작업 프로세스의 추가 주소 공간 제한 (바이트, None이면 제한 없음)
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, timeout: float = 30.0,
+                 name: str = 'execution', preload: Sequence[str] = (), max_jobs_per_worker: int = 0,
+                 cpu_limit: float = None, memory_limit: int = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = self.max_workers * 4 if max_queue is None else max_queue
+        self.timeout = timeout
+        self.name = name
+        self.preload = tuple(preload)
+        if cpu_limit and not max_jobs_per_worker:
+            max_jobs_per_worker = CPU_LIMITED_MAX_JOBS
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.cpu_limit = cpu_limit
+        # 작업 프로세스 수명 동안의 CPU hard 제한 (작업 사이의 처리 시간을 위해 작업 하나만큼 여유)
+        self.cpu_budget = cpu_limit * (max_jobs_per_worker + 1) if cpu_limit else None
+        self.memory_limit = memory_limit
+        # spawn: 이벤트 루프/스레드가 있는 부모를 fork하지 않도록 모든 플랫폼에서 동일하게 사용
+        # (작업 프로세스는 부모의 __main__ 모듈을 __mp_main__으로 다시 import 하므로
+        #  실행 스크립트는 import 시점에 DB 초기화나 풀 생성 같은 부작용이 없어야 함)
+        self._context = multiprocessing.get_context('spawn')
+        self._idle: Optional[asyncio.Queue] = None
+        # 파이프 수신 전용 스레드: 작업 프로세스마다 수신 하나 + 교체 중인 프로세스의 수신 하나
+        # (기본 실행기를 나눠 쓰면 스레드가 모자라 끝난 작업의 수신이 대기하다 제한 시간에 걸릴 수 있음)
+        self._receiver: Optional[ThreadPoolExecutor] = None
+        self._workers = []
+        self._pending = 0  # 실행 중 + 대기 중인 작업 수
+        self._started = False
+        self._recycled = 0  # 교체된 작업 프로세스 수
+        self._start_failures = 0  # 연속으로 시작하지 못한 작업 프로세스 수
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context, self.preload, self.cpu_limit, self.memory_limit, self.cpu_budget)
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+        return worker
+
+    def start(self):
+        """작업 프로세스를 미리 실행 (여러 번 호출해도 한 번만 실행)"""
+        if self._started:
+            return
+        self._idle = asyncio.Queue()
+        self._receiver = ThreadPoolExecutor(max_workers=self.max_workers * 2,
+                                            thread_name_prefix=f'{self.name}-recv')
+        for _ in range(self.max_workers):
+            self._spawn()
+        self._started = True
+        logger.info(f"{self.name} pool started with {self.max_workers} workers (max queue {self.max_queue})")
+
+    def shutdown(self):
+        """모든 작업 프로세스 종료"""
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+        if self._receiver is not None:
+            # 작업 프로세스가 모두 종료되어 수신 중인 스레드는 EOFError로 끝남
+            self._receiver.shutdown(wait=False, cancel_futures=True)
+            self._receiver = None
+        self._started = False
+        logger.info(f"{self.name} pool stopped")
+
+    def stats(self) -> dict:
+        """풀 상태 (작업 프로세스 수, 대기 작업 수 등)"""
+        return {
+            'workers': self.max_workers,
+            'idle': self._idle.qsize() if self._idle is not None else 0,
+            'pending': self._pending,
+            'max_queue': self.max_queue,
+            'recycled': self._recycled,
+            'start_failures': self._start_failures,
+        }
+
+    def _replace(self, worker: _Worker, graceful: bool = False, delay: float = 0):
+        """
+        작업 프로세스를 종료하고 새 프로세스로 교체
+
+        새 프로세스는 바로(delay가 있으면 그만큼 뒤에) 실행하고, 이전 프로세스의 종료 대기(join)는
+        이벤트 루프를 막지 않도록 기본 실행기(스레드)에서 처리한다.
+        강제 종료는 신호만 먼저 보내 바로 CPU 사용을 멈춘다.
+        """
+        if not graceful and worker.is_alive():
+            worker.process.kill()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self._recycled += 1
+
+        finish = worker.stop if graceful else worker.kill
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if self._started:
+                self._spawn()
+            finish()
+            return
+        if self._started:
+            if delay:
+                loop.call_later(delay, self._respawn)
+            else:
+                self._spawn()
+        loop.run_in_executor(None, finish)
+
+    def _respawn(self):
+        """지연된 교체 프로세스 실행 (그 사이 풀이 종료되었으면 무시)"""
+        if self._started:
+            self._spawn()
+
+    def _start_failed(self, worker: _Worker):
+        """
+        시작하지 못한 작업 프로세스를 대기 시간을 두고 교체
+
+        Raises:
+            WorkerCrashedError: 연속 실패가 WORKER_START_RETRIES번에 이른 경우
+        """
+        self._start_failures += 1
+        delay = min(WORKER_RESTART_BACKOFF * 2 ** (self._start_failures - 1), WORKER_RESTART_BACKOFF_MAX)
+        self._replace(worker, delay=delay)
+        if self._start_failures >= WORKER_START_RETRIES:
+            raise WorkerCrashedError(f"{self.name} 작업 프로세스가 {self._start_failures}번 연속으로 "
+                                     f"시작하지 못했습니다")
+
+    async def _wait_ready(self, worker: _Worker):
+        """작업 프로세스의 모듈 preload 완료 메시지를 기다림"""
+        loop = asyncio.get_running_loop()
+        try:
+            status, _ = await asyncio.wait_for(loop.run_in_executor(self._receiver, worker.conn.recv),
+                                               WORKER_READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise WorkerCrashedError(f"{self.name} 작업 프로세스가 준비되지 않았습니다")
+        except (EOFError, OSError):
+            raise WorkerCrashedError(f"{self.name} 작업 프로세스가 시작하지 못했습니다")
+        if status != 'ready':
+            raise WorkerCrashedError(f"{self.name} 작업 프로세스가 잘못된 응답을 보냈습니다")
+        worker.ready = True
+
+    async def _acquire(self) -> _Worker:
+        """대기열 한도를 확인하고 쉬고 있는 작업 프로세스를 가져옴"""
+        self.start()
+        if self._pending >= self.max_workers + self.max_queue:
+            raise PoolBusyError(f"{self.name} 작업 대기열이 가득 찼습니다")
+        self._pending += 1
+        try:
+            while True:
+                worker = await self._idle.get()
+                if not worker.ready:
+                    try:
+                        await self._wait_ready(worker)
+                    except WorkerCrashedError as e:
+                        # 시작하지 못한 프로세스는 점점 길게 기다렸다가 교체하고, 계속 실패하면 포기
+                        logger.error(str(e))
+                        self._start_failed(worker)
+                        continue
+                    except BaseException:
+                        self._idle.put_nowait(worker)
+                        raise
+                    self._start_failures = 0
+                if not worker.is_alive():
+                    # 유휴 상태에서 종료된 프로세스는 교체
+                    self._replace(worker)
+                    continue
+                return worker
+        except BaseException:
+            self._pending -= 1
+            raise
+
+    def _release(self, worker: _Worker):
+        """작업이 끝난 작업 프로세스를 반납 (처리 횟수를 넘겼으면 교체)"""
+        self._pending -= 1
+        worker.jobs += 1
+        if worker.retire or (self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker):
+            self._replace(worker, graceful=True)
+        else:
+            self._idle.put_nowait(worker)
+
+    def _discard(self, worker: _Worker):
+        """진행 중인 작업을 버리고 작업 프로세스를 교체"""
+        self._pending -= 1
+        self._replace(worker)
+
+    async def _receive(self, worker: _Worker, deadline: float):
+        """작업 프로세스의 다음 메시지를 제한 시간 안에 받음"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        loop = asyncio.get_running_loop()
+        try:
+            status, value = await asyncio.wait_for(loop.run_in_executor(self._receiver, worker.conn.recv), remaining)
+        except asyncio.TimeoutError:
+            raise  # Python 3.11부터 TimeoutError는 OSError의 하위 클래스
+        except (EOFError, OSError):
+            raise WorkerCrashedError(f"{self.name} 작업 프로세스가 비정상 종료되었습니다")
+        if status == 'limit':
+            worker.retire = True  # 제한에 걸린 프로세스는 상태를 믿을 수 없으므로 교체
+        return status, value
+
+    async def run(self, fn, *args, timeout: float = None, **kwargs):
+        """
+        작업 프로세스에서 fn(*args, **kwargs)를 실행하고 결과 반환
+
+        Raises:
+            PoolBusyError: 대기열이 가득 찬 경우
+            JobTimeoutError: 제한 시간을 넘긴 경우
+            ResourceLimitError: CPU 시간 또는 메모리 제한을 넘긴 경우
+            WorkerCrashedError: 작업 프로세스가 비정상 종료된 경우
+            RuntimeError: fn에서 예외가 발생한 경우
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker = await self._acquire()
+        try:
+            deadline = time.monotonic() + timeout
+            worker.conn.send((fn, args, kwargs))
+            status, value = await self._receive(worker, deadline)
+        except asyncio.TimeoutError:
+            self._discard(worker)
+            raise JobTimeoutError(f"실행 시간이 초과되었습니다 ({timeout:g}초)")
+        except BaseException:
+            # 취소(클라이언트 연결 종료) 또는 프로세스 오류: 진행 중인 작업을 버리고 교체
+            self._discard(worker)
+            raise
+        self._release(worker)
+
+        if status == 'limit':
+            raise ResourceLimitError(value)
+        if status == 'error':
+            raise RuntimeError(value)
+        return value
+
+    async def stream(self, fn, *args, timeout: float = None, **kwargs):
+        """
+        제너레이터 함수 fn을 작업 프로세스에서 실행하고 항목을 하나씩 전달하는 async 제너레이터
+
+        제한 시간은 전체 스트림에 적용된다. 호출 측이 순회를 중단하면
+        작업 프로세스를 종료하여 남은 작업을 버린다.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker = await self._acquire()
+        finished = False
+        try:
+            deadline = time.monotonic() + timeout
+            worker.conn.send((fn, args, kwargs))
+            while True:
+                try:
+                    status, value = await self._receive(worker, deadline)
+                except asyncio.TimeoutError:
+                    raise JobTimeoutError(f"실행 시간이 초과되었습니다 ({timeout:g}초)")
+                if status == 'item':
+                    yield value
+                    continue
+                finished = True
+                if status == 'limit':
+                    raise ResourceLimitError(value)
+                if status == 'error':
+                    raise RuntimeError(value)
+                if status == 'ok':
+                    yield value
+                return
+        finally:
+            if finished:
+                self._release(worker)
+            else:
+                self._discard(worker)
@@ -1,16 +1,28 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from fastapi.exceptions import RequestValidationError
 from dotenv import load_dotenv
 import resend
 import os
+import json
+import hashlib
+import time
+import asyncio
 import logging
-import sys
-from io import StringIO
 import requests
-from typing import List, Dict
-from turtle_runner import run_turtle_code
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Literal, Optional, Sequence
+from turtle_runner import run_turtle_code, stream_turtle_frames, DEFAULT_RENDERER
+from render_cache import RenderCache, make_cache_key, is_cacheable
+from stage_timing import StageTimer, StageHistograms, format_server_timing
+from code_verifier import verify_code as run_code_verification, stream_verify_code, code_hash, output_digest, VERIFIER_VERSION
+from execution_pool import ExecutionPool, PoolBusyError, JobTimeoutError, ResourceLimitError, WorkerCrashedError
 from database import init_database, save_error_report, get_error_reports, get_error_statistics, get_error_by_id, toggle_error_resolved
+from database import get_error_reports_for_verification, mark_errors_resolved
+from database import get_verification_results, save_verification_result, close_db_connections
 
 # .env 파일 로드
 load_dotenv()
@@ -19,6 +31,27 @@ load_dotenv()
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 DEBUG = os.getenv("DEBUG", "true").lower() == "true"
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
+TURTLE_POOL_WORKERS = int(os.getenv("TURTLE_POOL_WORKERS", "0")) or None  # 0이면 CPU 코어 수
+TURTLE_POOL_MAX_QUEUE = int(os.getenv("TURTLE_POOL_MAX_QUEUE", "-1"))  # -1이면 작업 프로세스 수 x 4
+TURTLE_JOB_TIMEOUT = float(os.getenv("TURTLE_JOB_TIMEOUT", "30"))
+TURTLE_JOB_CPU_SECONDS = float(os.getenv("TURTLE_JOB_CPU_SECONDS", "20"))  # 0이면 제한 없음
+TURTLE_WORKER_MEMORY_MB = int(os.getenv("TURTLE_WORKER_MEMORY_MB", "512"))  # 0이면 제한 없음
+TURTLE_WORKER_MAX_JOBS = int(os.getenv("TURTLE_WORKER_MAX_JOBS", "200"))  # 0이면 교체하지 않음
+TURTLE_CACHE_MEMORY_MB = int(os.getenv("TURTLE_CACHE_MEMORY_MB", "64"))  # 0이면 메모리 캐시 사용 안 함
+TURTLE_CACHE_DIR = os.getenv("TURTLE_CACHE_DIR") or None  # 지정하면 디스크 캐시 사용
+TURTLE_CACHE_DISK_MB = int(os.getenv("TURTLE_CACHE_DISK_MB", "1024"))  # 0이면 제한 없음
+TURTLE_BATCH_MAX_ITEMS = int(os.getenv("TURTLE_BATCH_MAX_ITEMS", "200"))  # 일괄 실행 요청당 최대 코드 수
+TURTLE_IMAGE_MAX_AGE = int(os.getenv("TURTLE_IMAGE_MAX_AGE", "86400"))  # 이미지 응답의 HTTP 캐시 유효 시간 (초)
+TURTLE_MAX_CANVAS_SIZE = int(os.getenv("TURTLE_MAX_CANVAS_SIZE", "2000"))  # 요청할 수 있는 캔버스 최대 너비/높이 (픽셀)
+VERIFY_POOL_WORKERS = int(os.getenv("VERIFY_POOL_WORKERS", "2"))  # 동시에 실행하는 코드 검증 수
+VERIFY_POOL_MAX_QUEUE = int(os.getenv("VERIFY_POOL_MAX_QUEUE", "-1"))  # -1이면 작업 프로세스 수 x 4
+VERIFY_TIMEOUT = float(os.getenv("VERIFY_TIMEOUT", "5"))
+# 작업 프로세스 안에서 코드 실행을 중단하는 시간 - 실행 풀이 프로세스를 종료하기 전에 캡처한 출력을 돌려받음
+VERIFY_SOFT_TIMEOUT = VERIFY_TIMEOUT * 0.9
+VERIFY_WORKER_MEMORY_MB = int(os.getenv("VERIFY_WORKER_MEMORY_MB", "256"))  # 0이면 제한 없음
+VERIFY_WORKER_MAX_JOBS = int(os.getenv("VERIFY_WORKER_MAX_JOBS", "500"))  # 0이면 교체하지 않음
+VERIFY_OUTPUT_MAX_KB = int(os.getenv("VERIFY_OUTPUT_MAX_KB", "64"))  # 보관할 출력 크기 (앞부분/뒷부분 절반씩)
+VERIFY_BATCH_MAX_ITEMS = int(os.getenv("VERIFY_BATCH_MAX_ITEMS", "500"))  # 일괄 검증 요청당 최대 오류 수
 
 # 로깅 설정
 logging.basicConfig(
@@ -27,13 +60,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-logger.info(f"Starting EduPy API in {ENVIRONMENT} mode")
-logger.info(f"Debug mode: {DEBUG}")
-logger.info(f"CORS origins: {CORS_ORIGINS}")
-
-# 데이터베이스 초기화
-init_database()
-
 app = FastAPI(
     title="EduPy API",
     description="Educational Python Learning Platform API",
@@ -41,8 +67,100 @@ app = FastAPI(
     debug=DEBUG
 )
 
-# Resend API 키 설정
-resend.api_key = os.getenv("RESEND_API_KEY")
+# 저장된 검증 결과의 버전 - 제한 시간/메모리 제한에 따라 결과(시간 초과 등)가 달라지므로 함께 포함
+VERIFY_RESULT_VERSION = f"{VERIFIER_VERSION}-t{VERIFY_TIMEOUT:g}-m{VERIFY_WORKER_MEMORY_MB}-o{VERIFY_OUTPUT_MAX_KB}"
+
+# 실행 풀과 결과 캐시는 startup에서 생성
+# (spawn으로 시작한 작업 프로세스는 `python main.py` 실행 시 이 모듈을 다시 import 하므로
+#  import 시점에는 DB 초기화, 디스크 캐시 검사 같은 부작용이 없어야 함)
+turtle_pool: Optional[ExecutionPool] = None
+verify_pool: Optional[ExecutionPool] = None
+turtle_cache: Optional[RenderCache] = None
+
+# Turtle 요청의 단계별 소요 시간 분포
+turtle_timings = StageHistograms()
+
+@app.on_event("startup")
+async def start_execution_pools():
+    global turtle_pool, verify_pool, turtle_cache
+
+    logger.info(f"Starting EduPy API in {ENVIRONMENT} mode")
+    logger.info(f"Debug mode: {DEBUG}")
+    logger.info(f"CORS origins: {CORS_ORIGINS}")
+
+    # 데이터베이스 초기화
+    init_database()
+
+    # Resend API 키 설정
+    resend.api_key = os.getenv("RESEND_API_KEY")
+
+    # Turtle 코드 실행 풀 (이벤트 루프를 막지 않도록 별도 프로세스에서 실행)
+    # 작업 프로세스는 turtle_runner(matplotlib/NumPy/PIL)를 미리 import 하고 CPU/메모리 제한을 적용
+    turtle_pool = ExecutionPool(
+        max_workers=TURTLE_POOL_WORKERS,
+        max_queue=None if TURTLE_POOL_MAX_QUEUE < 0 else TURTLE_POOL_MAX_QUEUE,
+        timeout=TURTLE_JOB_TIMEOUT,
+        name="turtle",
+        preload=("turtle_runner",),
+        max_jobs_per_worker=TURTLE_WORKER_MAX_JOBS,
+        cpu_limit=TURTLE_JOB_CPU_SECONDS or None,
+        memory_limit=TURTLE_WORKER_MEMORY_MB * 1024 * 1024 or None
+    )
+
+    # 오류 보고 코드 검증 풀 (검증마다 출력 캡처와 제한 시간이 분리되고, 동시 실행 수가 제한됨)
+    verify_pool = ExecutionPool(
+        max_workers=VERIFY_POOL_WORKERS,
+        max_queue=None if VERIFY_POOL_MAX_QUEUE < 0 else VERIFY_POOL_MAX_QUEUE,
+        timeout=VERIFY_TIMEOUT,
+        name="verify",
+        preload=("code_verifier",),
+        max_jobs_per_worker=VERIFY_WORKER_MAX_JOBS,
+        cpu_limit=VERIFY_TIMEOUT,
+        memory_limit=VERIFY_WORKER_MEMORY_MB * 1024 * 1024 or None
+    )
+
+    # Turtle 실행 결과 캐시 (같은 코드와 옵션이면 다시 실행하지 않음)
+    turtle_cache = RenderCache(
+        max_memory_bytes=TURTLE_CACHE_MEMORY_MB * 1024 * 1024,
+        disk_dir=TURTLE_CACHE_DIR,
+        max_disk_bytes=TURTLE_CACHE_DISK_MB * 1024 * 1024
+    )
+
+    turtle_pool.start()
+    verify_pool.start()
+
+@app.on_event("shutdown")
+async def stop_execution_pools():
+    if turtle_pool is not None:
+        turtle_pool.shutdown()
+    if verify_pool is not None:
+        verify_pool.shutdown()
+    close_db_connections()
+
+# 클라이언트 연결 종료 확인 간격 (초)
+DISCONNECT_POLL_INTERVAL = 0.5
+
+class ClientDisconnected(Exception):
+    """작업 대기 중 클라이언트 연결이 끊어진 경우"""
+    pass
+
+async def await_unless_disconnected(http_request: Request, coro):
+    """
+    클라이언트 연결이 유지되는 동안 코루틴 결과를 기다림
+
+    연결이 끊기면 작업을 취소하고(실행 풀은 작업 프로세스를 교체) ClientDisconnected 발생
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
 
 # CORS 설정 - 환경에 따라 다른 origin 허용
 app.add_middleware(
@@ -51,8 +169,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-Frame-Count"],
 )
 
+class VaryAcceptMiddleware:
+    """
+    지정한 경로의 모든 응답에 Vary: Accept 추가
+
+    Accept 헤더로 응답 형식을 고르는 API는 HTTPException/검증 오류 응답도 Accept 값마다
+    달라질 수 있으므로, 공유 캐시가 한 형식의 응답(오류 포함)을 다른 Accept 값에 재사용하지 않도록 한다.
+    """
+
+    def __init__(self, app, paths: Sequence[str]):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_vary(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).add_vary_header("Accept")
+            await send(message)
+
+        await self.app(scope, receive, send_with_vary)
+
+app.add_middleware(VaryAcceptMiddleware, paths=["/api/turtle/execute", "/api/turtle/image"])
+
 @app.get("/")
 async def root():
     return {
@@ -91,45 +236,398 @@ class ErrorReport(BaseModel):
     user_code: str
     timestamp: str
 
+# Turtle 렌더링 옵션 (실행 풀에 작업을 보내기 전에 검증하여 잘못된 값은 422로 바로 거절)
+class TurtleRenderOptions(BaseModel):
+    width: int = Field(600, ge=1, le=TURTLE_MAX_CANVAS_SIZE)
+    height: int = Field(600, ge=1, le=TURTLE_MAX_CANVAS_SIZE)
+    animate: bool = False  # True이면 애니메이션 프레임 반환
+    output: Literal["frames", "apng", "webp", "gif"] = "frames"  # 애니메이션 출력 형식: frames(PNG 배열), apng, webp, gif(단일 애니메이션 이미지)
+    format: Literal["png", "webp", "svg"] = "png"  # 정적 이미지 형식: png, webp, svg
+    max_frames: Optional[int] = Field(None, ge=1)  # 애니메이션 최대 프레임 수 (서버 최대값 TURTLE_MAX_FRAMES를 넘지 않음)
+    target_duration: Optional[float] = Field(None, gt=0)  # 애니메이션 목표 재생 시간 (초, 프레임 간격 100ms 기준)
+
+    @model_validator(mode="after")
+    def check_svg_static(self):
+        if self.animate and self.format == "svg":
+            raise ValueError("svg 형식은 정적 이미지(animate=False)에서만 사용할 수 있습니다")
+        return self
+
 # Turtle 코드 실행 요청 모델
-class TurtleCodeRequest(BaseModel):
+class TurtleCodeRequest(TurtleRenderOptions):
     code: str
-    width: int = 600
-    height: int = 600
-    animate: bool = False  # True이면 애니메이션 프레임 반환
+    stream: Optional[str] = None  # 프레임 스트리밍 형식: sse, ndjson (None이면 한 번에 응답)
+
+# 스트리밍 형식별 미디어 타입
+STREAM_MEDIA_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+# Accept 헤더로 요청할 수 있는 바이너리 응답 형식: 미디어 타입 -> (정적 이미지 format, 애니메이션 output)
+# None이면 해당 모드에서 지원하지 않음. multipart는 프레임을 렌더링되는 대로 PNG 파트로 전송
+# image/png은 애니메이션이면 APNG (APNG를 지원하지 않는 클라이언트는 첫 프레임만 표시)
+TURTLE_BINARY_MEDIA_TYPES = {
+    "image/png": ("png", "apng"),
+    "image/apng": (None, "apng"),
+    "image/webp": ("webp", "webp"),
+    "image/gif": (None, "gif"),
+    "image/svg+xml": ("svg", None),
+    "multipart/x-mixed-replace": (None, "frames"),
+}
+MULTIPART_BOUNDARY = "turtle-frame"
+
+def negotiate_turtle_media_type(accept: Optional[str], animate: bool, default: Optional[str] = None) -> Optional[str]:
+    """
+    Accept 헤더에서 가장 선호하는 turtle 응답 형식 선택
+
+    Args:
+        accept: Accept 헤더 값
+        animate: 애니메이션 요청 여부 (모드에서 지원하지 않는 형식은 건너뜀)
+        default: image/*, */* 또는 Accept 헤더가 없을 때 사용할 형식 (None이면 JSON)
+
+    Returns:
+        바이너리 응답 미디어 타입, JSON으로 응답하면 None
+    """
+    candidates = []
+    for order, part in enumerate((accept or "").split(",")):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, order, media_type.lower()))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type == "application/json":
+            return None
+        if media_type in ("*/*", "image/*"):
+            return default
+        if media_type in TURTLE_BINARY_MEDIA_TYPES:
+            if TURTLE_BINARY_MEDIA_TYPES[media_type][1 if animate else 0] is not None:
+                return media_type
+    return default
+
+def format_stream_event(event: Dict, stream: str) -> str:
+    """
+    스트리밍 이벤트를 SSE 메시지 또는 NDJSON 한 줄로 변환
+    """
+    data = json.dumps(event, ensure_ascii=False)
+    if stream == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+def check_stream_format(stream: str):
+    """지원하지 않는 스트리밍 형식이면 400 오류"""
+    if stream not in STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 스트리밍 형식입니다: {stream} (가능: sse, ndjson)"
+        )
+
+def check_turtle_stream_options(request: TurtleCodeRequest):
+    """프레임 스트리밍에 적용할 수 없는 옵션이면 400 오류 (애니메이션 프레임은 하나씩 PNG로 전송)"""
+    if request.animate and request.output != "frames":
+        raise HTTPException(
+            status_code=400,
+            detail=f"스트리밍은 프레임을 하나씩 전송하므로 {request.output} 출력 형식을 사용할 수 없습니다 (가능: frames)"
+        )
+    if request.animate and request.format != "png":
+        raise HTTPException(
+            status_code=400,
+            detail=f"애니메이션 프레임은 png 형식으로만 스트리밍할 수 있습니다: {request.format}"
+        )
+
+def batch_semaphore(pool: ExecutionPool) -> asyncio.Semaphore:
+    """일괄 처리 항목의 동시 실행 제한 (다른 요청이 대기열을 쓸 수 있도록 작업 프로세스 수로 제한)"""
+    return asyncio.Semaphore(pool.max_workers)
+
+def stream_batch_results(items: Sequence, run_item: Callable[[int, Any], Awaitable[Dict]], stream: str,
+                         finish: Callable[[List[Dict]], AsyncIterator[Dict]],
+                         on_close: Optional[Callable[[], None]] = None) -> StreamingResponse:
+    """
+    일괄 처리 항목을 동시에 실행하고, 끝나는 순서대로 결과 이벤트를 스트리밍하는 응답
+
+    이벤트: start(count) → run_item(index, item)의 결과 x count → finish(끝난 순서의 결과 목록)가 내보내는 이벤트
+    동시 실행 수 제한(batch_semaphore)은 run_item에서 적용한다.
+    클라이언트 연결이 끊기면 남은 작업을 취소하고(실행 중인 작업 프로세스는 교체됨) on_close를 호출한다.
+    """
+    async def event_stream():
+        tasks = [asyncio.ensure_future(run_item(index, item)) for index, item in enumerate(items)]
+        try:
+            yield format_stream_event({"type": "start", "count": len(tasks)}, stream)
+            results = []
+            for next_result in asyncio.as_completed(tasks):
+                event = await next_result
+                results.append(event)
+                yield format_stream_event(event, stream)
+            async for event in finish(results):
+                yield format_stream_event(event, stream)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if on_close is not None:
+                on_close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type=STREAM_MEDIA_TYPES[stream],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def turtle_cache_key(request: TurtleCodeRequest, binary: bool = False) -> Optional[str]:
+    """
+    실행 결과 캐시 키 (난수/시간을 사용하는 코드는 결과가 매번 달라 None)
+
+    결과가 항상 같으므로 바이너리 응답의 ETag로도 사용
+    """
+    if not is_cacheable(request.code):
+        return None
+    return make_cache_key(
+        request.code, width=request.width, height=request.height, animate=request.animate,
+        output=request.output, format=request.format, renderer=DEFAULT_RENDERER,
+        max_frames=request.max_frames, target_duration=request.target_duration, binary=binary
+    )
+
+async def run_turtle_request(request: TurtleCodeRequest, binary: bool = False):
+    """
+    캐시를 확인한 뒤 실행 풀에서 Turtle 코드를 실행
+
+    시간/자원 제한 초과는 실패 결과로 바꾸고, PoolBusyError/WorkerCrashedError는 그대로 전달.
+    결과의 timings에는 작업 프로세스가 잰 단계(exec, integrate, render, encode, base64)에
+    cache(캐시 조회), queue(대기열 대기와 프로세스 간 전송), total을 더해 기록한다.
+    시간/자원 제한을 넘겨 작업 프로세스가 단계를 보고하지 못한 경우 풀에서 보낸 시간 전체를
+    killed로 기록한다 (대기 시간과 실행 시간을 나눌 수 없으므로 queue에 넣지 않음).
+    binary이면 이미지를 data URI 대신 바이트로 받는다 (run_turtle_code 참고).
+
+    Returns:
+        tuple: (run_turtle_code 결과 dict, 캐시 적중 여부)
+    """
+    started = time.perf_counter()
+    timer = StageTimer()
+
+    # 난수/시간을 사용하지 않는 코드는 실행 결과가 항상 같으므로 캐시에서 찾음
+    cached = False
+    with timer.stage('cache'):
+        cache_key = turtle_cache_key(request, binary)
+        result = await turtle_cache.aget(cache_key) if cache_key is not None else None
+    if result is not None:
+        logger.info("Turtle result served from cache")
+        cached = True
+
+    worker_timings = {}
+    if not cached:
+        pool_started = time.perf_counter()
+        try:
+            result = await turtle_pool.run(
+                run_turtle_code, request.code, request.width, request.height, request.animate,
+                output=request.output, format=request.format,
+                max_frames=request.max_frames, target_duration=request.target_duration, binary=binary
+            )
+        except (JobTimeoutError, ResourceLimitError) as e:
+            result = {'success': False, 'error': str(e)}
+            timer.add('killed', time.perf_counter() - pool_started)
+        else:
+            # 코드 자체의 오류도 결과가 같으므로 저장 (시간/자원 제한 초과는 저장하지 않음)
+            worker_timings = result.pop('timings', None) or {}
+            if cache_key is not None:
+                await turtle_cache.aput(cache_key, result)
+            if worker_timings:
+                # 작업 프로세스 밖에서 보낸 시간 = 대기열 대기 + 인자/결과 전송
+                pool_ms = (time.perf_counter() - pool_started) * 1000
+                timer.add('queue', max(0.0, pool_ms - sum(worker_timings.values())) / 1000)
+
+    timings = {**timer.as_ms(), **worker_timings,
+               'total': round((time.perf_counter() - started) * 1000, 2)}
+    turtle_timings.observe(timings)
+    return {**result, 'timings': timings}, cached
+
+def build_turtle_response(result: Dict) -> Dict:
+    """
+    run_turtle_code 결과를 API 응답 형식으로 변환
+    """
+    if result['success']:
+        if 'animation' in result:
+            logger.info(f"Turtle {result['format']} animation generated with {result['frame_count']} frames")
+            return {
+                "success": True,
+                "animation": result['animation'],
+                "format": result['format'],
+                "frame_count": result['frame_count'],
+                "source_frame_count": result['source_frame_count'],
+                "stats": result['stats'],
+                "timings": result.get('timings')
+            }
+        elif 'frames' in result:
+            logger.info(f"Turtle animation generated with {result.get('frame_count', 0)} frames")
+            return {
+                "success": True,
+                "frames": result['frames'],
+                "frame_count": result['frame_count'],
+                "source_frame_count": result['source_frame_count'],
+                "stats": result['stats'],
+                "timings": result.get('timings')
+            }
+        else:
+            logger.info("Turtle code executed successfully")
+            return {
+                "success": True,
+                "image": result['image'],
+                "stats": result['stats'],
+                "timings": result.get('timings')
+            }
+    else:
+        logger.error(f"Turtle code execution failed: {result['error']}")
+        response = {
+            "success": False,
+            "error": result['error']
+        }
+        if result.get('stats'):
+            response["stats"] = result['stats']
+        if result.get('timings'):
+            response["timings"] = result['timings']
+        return response
 
 # Turtle 코드 실행 API
 @app.post("/api/turtle/execute")
-async def execute_turtle_code(request: TurtleCodeRequest):
+async def execute_turtle_code(request: TurtleCodeRequest, http_request: Request, response: Response):
     """
     Turtle 코드를 실행하고 결과 이미지를 반환
+
+    단계별 소요 시간은 응답의 timings와 Server-Timing 헤더로 함께 반환.
+    stream이 지정되면 애니메이션 프레임을 렌더링되는 대로 SSE 또는 NDJSON으로 전송
+    (단계별 시간은 end 이벤트의 timings). animate=False이면 최종 이미지 한 장을 format 형식의
+    프레임으로 전송하고, 애니메이션에 frames 외의 output이나 png 외의 format을 지정하면 400.
+    stream이 없고 Accept 헤더가 이미지 형식
+    (TURTLE_BINARY_MEDIA_TYPES)을 요청하면 JSON 대신 이미지 바이트로 응답
+    - animate 요청에 Accept: image/png이면 애니메이션 PNG(APNG)로 응답하므로, APNG를 지원하지 않는
+      클라이언트는 첫 프레임만 표시할 수 있음 (image/gif 또는 image/webp 권장)
+    - 응답 형식이 Accept에 따라 달라지므로 오류 응답을 포함한 모든 응답에 Vary: Accept (VaryAcceptMiddleware)
     """
-    logger.info(f"Received turtle code execution request (animate={request.animate})")
+    logger.info(f"Received turtle code execution request (animate={request.animate}, output={request.output}, stream={request.stream})")
+
+    media_type = None
+    if request.stream is None:
+        media_type = negotiate_turtle_media_type(http_request.headers.get("accept"), request.animate)
+    if media_type is not None:
+        return await execute_turtle_binary(request, http_request, media_type)
+
+    if request.stream is not None:
+        check_stream_format(request.stream)
+        check_turtle_stream_options(request)
+
+        async def event_stream():
+            try:
+                async for event in turtle_pool.stream(stream_turtle_frames, request.code,
+                                                      request.width, request.height, request.animate,
+                                                      format=request.format,
+                                                      max_frames=request.max_frames,
+                                                      target_duration=request.target_duration):
+                    if event['type'] == 'error':
+                        logger.error(f"Turtle frame streaming failed: {event['error']}")
+                    elif event['type'] == 'end':
+                        logger.info(f"Turtle animation streamed with {event['frame_count']} frames")
+                        turtle_timings.observe(event.get('timings') or {})
+                    yield format_stream_event(event, request.stream)
+            except (PoolBusyError, JobTimeoutError, ResourceLimitError, WorkerCrashedError) as e:
+                logger.error(f"Turtle frame streaming failed: {str(e)}")
+                yield format_stream_event({'type': 'error', 'error': str(e)}, request.stream)
+
+        # 클라이언트 연결이 끊기면 스트림이 닫히고 작업 프로세스가 교체됨
+        return StreamingResponse(
+            event_stream(),
+            media_type=STREAM_MEDIA_TYPES[request.stream],
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
 
     try:
-        result = run_turtle_code(request.code, request.width, request.height, request.animate)
+        result, _ = await await_unless_disconnected(http_request, run_turtle_request(request))
+        response.headers["Server-Timing"] = format_server_timing(result['timings'])
+        return build_turtle_response(result)
+
+    except ClientDisconnected:
+        logger.info("Client disconnected, turtle execution cancelled")
+        return Response(status_code=499)
+    except PoolBusyError as e:
+        logger.warning(f"Turtle execution rejected: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 잠시 후 다시 시도해주세요."
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error in turtle execution: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Turtle 코드 실행 실패: {str(e)}"
+        )
 
-        if result['success']:
-            if request.animate:
-                logger.info(f"Turtle animation generated with {result.get('frame_count', 0)} frames")
-                return {
-                    "success": True,
-                    "frames": result['frames'],
-                    "frame_count": result['frame_count']
-                }
-            else:
-                logger.info("Turtle code executed successfully")
-                return {
-                    "success": True,
-                    "image": result['image']
-                }
-        else:
-            logger.error(f"Turtle code execution failed: {result['error']}")
-            return {
-                "success": False,
-                "error": result['error']
-            }
+def _etag_matches(http_request: Request, etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 포함되어 있는지 확인"""
+    if_none_match = http_request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
 
+async def execute_turtle_binary(request: TurtleCodeRequest, http_request: Request, media_type: str):
+    """
+    Turtle 실행 결과를 이미지 바이트로 응답 (negotiate_turtle_media_type 참고)
+
+    - 정적 이미지/애니메이션 이미지: Content-Type, ETag, Cache-Control과 함께 바이트 그대로 응답
+      결과가 항상 같은 코드는 캐시 키를 ETag로 쓰므로, If-None-Match가 같으면 실행하지 않고 304
+    - multipart/x-mixed-replace: 프레임을 렌더링되는 대로 PNG 파트로 전송 (<img>에서 바로 재생 가능)
+    - 코드 오류/제한 초과는 422와 JSON 오류 응답
+    """
+    static_format, animation_output = TURTLE_BINARY_MEDIA_TYPES[media_type]
+    if request.animate:
+        request = request.model_copy(update={"output": animation_output})
+    else:
+        request = request.model_copy(update={"format": static_format})
+
+    if request.output == "frames" and request.animate:
+        return stream_turtle_multipart(request)
+
+    try:
+        cache_key = turtle_cache_key(request, binary=True)
+        if cache_key is not None:
+            etag = f'"{cache_key}"'
+            cache_control = f"public, max-age={TURTLE_IMAGE_MAX_AGE}"
+            if _etag_matches(http_request, etag):
+                return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+        result, _ = await await_unless_disconnected(http_request, run_turtle_request(request, binary=True))
+        headers = {"Server-Timing": format_server_timing(result['timings'])}
+        if not result['success']:
+            return JSONResponse(status_code=422, content=build_turtle_response(result), headers=headers)
+
+        data = result['animation'] if request.animate else result['image']
+        if cache_key is None:
+            # 실행할 때마다 결과가 달라질 수 있으므로 HTTP 캐시에 저장하지 않고 내용 해시만 제공
+            etag = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+            cache_control = "no-store"
+        headers.update({"ETag": etag, "Cache-Control": cache_control})
+        if request.animate:
+            headers["X-Frame-Count"] = str(result['frame_count'])
+        if _etag_matches(http_request, etag):
+            return Response(status_code=304, headers=headers)
+        logger.info(f"Turtle {media_type} response ({len(data)} bytes)")
+        return Response(content=data, media_type=media_type, headers=headers)
+
+    except ClientDisconnected:
+        logger.info("Client disconnected, turtle execution cancelled")
+        return Response(status_code=499)
+    except PoolBusyError as e:
+        logger.warning(f"Turtle execution rejected: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 잠시 후 다시 시도해주세요."
+        )
     except Exception as e:
         logger.error(f"Unexpected error in turtle execution: {str(e)}")
         raise HTTPException(
@@ -137,6 +635,176 @@ async def execute_turtle_code(request: TurtleCodeRequest):
             detail=f"Turtle 코드 실행 실패: {str(e)}"
         )
 
+def stream_turtle_multipart(request: TurtleCodeRequest) -> StreamingResponse:
+    """
+    애니메이션 프레임을 multipart/x-mixed-replace의 PNG 파트로 스트리밍
+
+    실패하면 그 시점에 application/json 파트로 오류를 보내고 스트림을 닫음
+    """
+    boundary = MULTIPART_BOUNDARY.encode()
+
+    def part(content_type: str, body: bytes, index: Optional[int] = None) -> bytes:
+        headers = f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+        if index is not None:
+            headers += f"X-Frame-Index: {index}\r\n"
+        return b"--" + boundary + b"\r\n" + headers.encode() + b"\r\n" + body + b"\r\n"
+
+    def error_part(error: str) -> bytes:
+        body = json.dumps({"success": False, "error": error}, ensure_ascii=False).encode("utf-8")
+        return part("application/json", body)
+
+    async def frame_stream():
+        try:
+            async for event in turtle_pool.stream(stream_turtle_frames, request.code,
+                                                  request.width, request.height, format="png",
+                                                  max_frames=request.max_frames,
+                                                  target_duration=request.target_duration, binary=True):
+                if event['type'] == 'frame':
+                    yield part("image/png", event['image'], event['index'])
+                elif event['type'] == 'error':
+                    logger.error(f"Turtle frame streaming failed: {event['error']}")
+                    yield error_part(event['error'])
+                elif event['type'] == 'end':
+                    logger.info(f"Turtle animation streamed with {event['frame_count']} frames")
+                    turtle_timings.observe(event.get('timings') or {})
+        except (PoolBusyError, JobTimeoutError, ResourceLimitError, WorkerCrashedError) as e:
+            logger.error(f"Turtle frame streaming failed: {str(e)}")
+            yield error_part(str(e))
+        yield b"--" + boundary + b"--\r\n"
+
+    return StreamingResponse(
+        frame_stream(),
+        media_type=f"multipart/x-mixed-replace; boundary={MULTIPART_BOUNDARY}",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
+
+# Turtle 이미지 API (GET - <img src>와 HTTP 캐시에서 바로 사용)
+@app.get("/api/turtle/image")
+async def get_turtle_image(http_request: Request, code: str, width: int = 600, height: int = 600,
+                           animate: bool = False, max_frames: Optional[int] = None,
+                           target_duration: Optional[float] = None):
+    """
+    Turtle 코드를 실행하여 이미지 바이트로 응답
+
+    형식은 Accept 헤더로 선택하며 (TURTLE_BINARY_MEDIA_TYPES), 지정하지 않으면 PNG (애니메이션은 APNG)
+    - animate이면 image/png도 APNG로 응답 (APNG를 지원하지 않는 클라이언트는 첫 프레임만 표시할 수 있음)
+    - 오류 응답(406 등)을 포함한 모든 응답에 Vary: Accept (VaryAcceptMiddleware)
+    """
+    try:
+        request = TurtleCodeRequest(code=code, width=width, height=height, animate=animate,
+                                    max_frames=max_frames, target_duration=target_duration)
+    except ValidationError as e:
+        # 쿼리 매개변수도 본문 요청과 같은 범위로 검증 (422)
+        raise RequestValidationError([{**error, "loc": ("query", *error["loc"])} for error in e.errors()])
+    accept = http_request.headers.get("accept")
+    media_type = negotiate_turtle_media_type(accept, animate, default="image/png")
+    if media_type is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"지원하지 않는 응답 형식입니다: {accept} (가능: {', '.join(TURTLE_BINARY_MEDIA_TYPES)})"
+        )
+    return await execute_turtle_binary(request, http_request, media_type)
+
+# Turtle 일괄 실행 요청 모델
+class TurtleBatchItem(BaseModel):
+    id: str  # 결과를 요청 항목과 연결하기 위한 식별자 (예: 활동 ID)
+    code: str
+
+class TurtleBatchRequest(TurtleRenderOptions):
+    items: List[TurtleBatchItem]
+    include_output: bool = True  # False이면 이미지/프레임 없이 성공 여부와 오류만 전송
+    stream: str = "ndjson"  # 결과 스트리밍 형식: ndjson, sse
+
+# Turtle 일괄 실행 API
+@app.post("/api/turtle/execute-batch")
+async def execute_turtle_batch(request: TurtleBatchRequest):
+    """
+    여러 Turtle 코드를 실행 풀에서 병렬로 실행하고, 끝나는 순서대로 결과를 스트리밍
+
+    이벤트: start(count) → result(index, id, 응답 필드, cached, timings) x count → end(요약)
+    result의 timings: wait_ms(동시 실행 제한 대기), run_ms, elapsed_ms, stages(단계별 소요 시간)
+    """
+    logger.info(f"Received turtle batch execution request ({len(request.items)} items)")
+
+    check_stream_format(request.stream)
+    if len(request.items) > TURTLE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 실행할 수 있는 코드는 최대 {TURTLE_BATCH_MAX_ITEMS}개입니다"
+        )
+
+    options = request.model_dump(exclude={"items", "include_output", "stream"})
+    semaphore = batch_semaphore(turtle_pool)
+    started = time.perf_counter()
+
+    async def run_item(index: int, item: TurtleBatchItem) -> Dict:
+        queued = time.perf_counter()
+        async with semaphore:
+            begun = time.perf_counter()
+            cached = False
+            try:
+                result, cached = await run_turtle_request(TurtleCodeRequest(code=item.code, **options))
+                response = build_turtle_response(result)
+            except (PoolBusyError, WorkerCrashedError) as e:
+                logger.error(f"Turtle batch item {item.id} failed: {str(e)}")
+                response = {"success": False, "error": str(e)}
+        finished = time.perf_counter()
+        stages = response.pop("timings", None)
+
+        if not request.include_output:
+            response = {key: response[key] for key in ("success", "error", "stats") if key in response}
+        return {
+            "type": "result",
+            "index": index,
+            "id": item.id,
+            **response,
+            "cached": cached,
+            "timings": {
+                "wait_ms": round((begun - queued) * 1000, 1),
+                "run_ms": round((finished - begun) * 1000, 1),
+                "elapsed_ms": round((finished - started) * 1000, 1),
+                "stages": stages
+            }
+        }
+
+    async def finish(results: List[Dict]):
+        succeeded = sum(event["success"] for event in results)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Turtle batch finished: {succeeded}/{len(results)} succeeded in {elapsed_ms}ms")
+        yield {
+            "type": "end",
+            "count": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "elapsed_ms": elapsed_ms
+        }
+
+    return stream_batch_results(request.items, run_item, request.stream, finish)
+
+# Turtle 결과 캐시 상태 API
+@app.get("/api/turtle/cache/stats")
+async def get_turtle_cache_stats():
+    """
+    Turtle 결과 캐시의 적중/실패 횟수와 크기 조회
+    """
+    return {
+        "success": True,
+        "data": turtle_cache.stats()
+    }
+
+# Turtle 단계별 소요 시간 통계 API
+@app.get("/api/turtle/timings")
+async def get_turtle_timings():
+    """
+    Turtle 요청의 단계별(cache, queue, exec, integrate, render, encode, base64, total) 소요 시간 분포 조회
+
+    단계마다 요청 수, 합계/평균/최대, 분위수(p50/p95/p99 - 히스토그램 구간 상한), 구간별 개수를 반환
+    """
+    return {
+        "success": True,
+        "data": turtle_timings.snapshot()
+    }
+
 # 오류 보고 API
 @app.post("/api/error-report")
 async def send_error_report(report: ErrorReport):
@@ -147,7 +815,8 @@ async def send_error_report(report: ErrorReport):
 
     try:
         # 1. DB에 오류 저장 (중복 체크 포함)
-        save_result = save_error_report(
+        save_result = await run_in_threadpool(
+            save_error_report,
             level=report.level,
             activity=report.activity,
             error_message=report.error_message,
@@ -251,8 +920,9 @@ async def send_error_report(report: ErrorReport):
         )
 
 # 오류 통계 조회 API
+# 조회/상태 변경 API는 일반 함수로 두어 FastAPI 스레드 풀에서 실행 (연결 풀과 WAL 모드로 동시에 처리)
 @app.get("/api/error-reports/statistics")
-async def get_statistics():
+def get_statistics():
     """
     오류 통계 조회
     """
@@ -271,7 +941,7 @@ async def get_statistics():
 
 # 오류 보고 목록 조회 API
 @app.get("/api/error-reports")
-async def get_reports(limit: int = 100, offset: int = 0, filter_status: str = 'all'):
+def get_reports(limit: int = 100, offset: int = 0, filter_status: str = 'all'):
     """
     오류 보고 목록 조회
     """
@@ -291,7 +961,7 @@ async def get_reports(limit: int = 100, offset: int = 0, filter_status: str = 'a
 
 # 특정 오류 보고 조회 API
 @app.get("/api/error-reports/{error_id}")
-async def get_report(error_id: int):
+def get_report(error_id: int):
     """
     특정 오류 보고 조회
     """
@@ -316,87 +986,101 @@ async def get_report(error_id: int):
 # 코드 검증 API (오류 재현 확인)
 class CodeVerifyRequest(BaseModel):
     code: str
+    force: bool = False  # True이면 저장된 검증 결과가 있어도 다시 실행
+
+def verification_limit_result(error: Exception) -> Dict:
+    """제한 시간(JobTimeoutError)/자원 제한(ResourceLimitError) 초과를 검증 결과로 변환"""
+    if isinstance(error, JobTimeoutError):
+        message = f"코드 실행 시간이 초과되었습니다 ({VERIFY_TIMEOUT:g}초)"
+        error_type = "TimeoutError"
+    else:
+        message = str(error)
+        error_type = "ResourceLimitError"
+    return {
+        'error_occurred': True,
+        'error_message': message,
+        'error_type': error_type,
+        'output': '',
+        'output_truncated': False,
+        'timed_out': isinstance(error, JobTimeoutError)
+    }
 
-@app.post("/api/verify-code")
-async def verify_code(request: CodeVerifyRequest):
+async def store_verification(code: str, result: Dict) -> Dict:
     """
-    코드를 실행하여 오류가 발생하는지 확인 (보안 개선)
+    검증 결과에 출력 요약을 더해 저장하고 verified_at, cached를 붙여 반환
+
+    벽시계 기준 제한 시간 초과(timed_out)는 서버 부하 때문에 일시적으로 발생할 수 있으므로,
+    그 코드의 결과로 계속 반환되지 않도록 저장하지 않는다 (verified_at은 None).
     """
+    result = {**result, 'output_digest': output_digest(result['output'])}
+    if result['timed_out']:
+        return {**result, 'verified_at': None, 'cached': False}
     try:
-        # 출력 캡처를 위한 StringIO
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        sys.stdout = StringIO()
-        sys.stderr = StringIO()
-
-        error_occurred = False
-        error_message = ""
-        error_type = ""
-        output = ""
-
-        try:
-            # 제한된 globals/locals로 코드 실행 (보안 강화)
-            restricted_globals = {
-                '__builtins__': {
-                    'print': print,
-                    'len': len,
-                    'range': range,
-                    'str': str,
-                    'int': int,
-                    'float': float,
-                    'list': list,
-                    'dict': dict,
-                    'tuple': tuple,
-                    'set': set,
-                    'abs': abs,
-                    'max': max,
-                    'min': min,
-                    'sum': sum,
-                    'sorted': sorted,
-                    'enumerate': enumerate,
-                    'zip': zip,
-                    'map': map,
-                    'filter': filter,
-                }
-            }
+        verified_at = await run_in_threadpool(save_verification_result, code_hash(code), VERIFY_RESULT_VERSION, result)
+    except Exception as e:
+        logger.warning(f"Failed to save verification result: {str(e)}")
+        verified_at = None
+    return {**result, 'verified_at': verified_at, 'cached': False}
 
-            # 타임아웃 설정 (무한 루프 방지)
-            import signal
+def verification_response(result: Dict) -> Dict:
+    """검증 결과를 API 응답 형식으로 변환 (해결 방법 제안 포함)"""
+    return {
+        "success": True,
+        **result,
+        "suggestion": get_error_suggestion(result['error_message']) if result['error_occurred'] else "코드가 정상적으로 실행되었습니다! ✅"
+    }
 
-            def timeout_handler(signum, frame):
-                raise TimeoutError("코드 실행 시간이 초과되었습니다 (5초)")
+async def execute_verification(code: str) -> Dict:
+    """
+    검증 풀에서 코드를 실행하여 오류 발생 여부를 확인하고 결과를 저장 (code_verifier.verify_code 참고)
 
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(5)  # 5초 타임아웃
+    제한 시간/자원 제한 초과는 오류 결과로 바꾸고(제한 시간 초과는 저장하지 않음), PoolBusyError/WorkerCrashedError는 그대로 전달
+    작업 프로세스가 VERIFY_SOFT_TIMEOUT에 스스로 중단하면 그때까지의 출력이 결과에 포함된다.
+    """
+    try:
+        result = await verify_pool.run(run_code_verification, code, VERIFY_OUTPUT_MAX_KB * 1024,
+                                       time_limit=VERIFY_SOFT_TIMEOUT)
+    except (JobTimeoutError, ResourceLimitError) as e:
+        result = verification_limit_result(e)
+    return await store_verification(code, result)
+
+async def get_stored_verification(code: str) -> Optional[Dict]:
+    """같은 코드의 저장된 검증 결과 (현재 검증기 버전, 없으면 None)"""
+    digest = code_hash(code)
+    stored = (await run_in_threadpool(get_verification_results, [digest], VERIFY_RESULT_VERSION)).get(digest)
+    return {**stored, 'cached': True} if stored is not None else None
+
+async def run_verification(code: str, force: bool = False) -> Dict:
+    """
+    같은 코드의 저장된 검증 결과(현재 검증기 버전)가 있으면 반환하고, 없거나 force이면 실행
+    """
+    if not force:
+        stored = await get_stored_verification(code)
+        if stored is not None:
+            return stored
+    return await execute_verification(code)
 
-            try:
-                exec(request.code, restricted_globals, {})
-                output = sys.stdout.getvalue()
-            finally:
-                signal.alarm(0)  # 타임아웃 해제
-
-        except TimeoutError as e:
-            error_occurred = True
-            error_message = str(e)
-            error_type = "TimeoutError"
-        except Exception as e:
-            error_occurred = True
-            error_message = str(e)
-            error_type = type(e).__name__
-            output = sys.stderr.getvalue()
-        finally:
-            # stdout, stderr 복원
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+@app.post("/api/verify-code")
+async def verify_code(request: CodeVerifyRequest, http_request: Request):
+    """
+    코드를 실행하여 오류가 발생하는지 확인 (보안 개선)
 
-        return {
-            "success": True,
-            "error_occurred": error_occurred,
-            "error_message": error_message,
-            "error_type": error_type,
-            "output": output,
-            "suggestion": get_error_suggestion(error_message) if error_occurred else "코드가 정상적으로 실행되었습니다! ✅"
-        }
+    코드는 검증 풀의 작업 프로세스에서 실행되므로 API 프로세스를 막지 않고,
+    동시에 들어온 검증끼리 출력이나 제한 시간이 섞이지 않는다.
+    같은 코드를 이미 검증했으면 저장된 결과를 반환 (cached, verified_at - force이면 다시 실행)
+    """
+    try:
+        result = await await_unless_disconnected(http_request, run_verification(request.code, request.force))
+        return verification_response(result)
+    except ClientDisconnected:
+        logger.info("Client disconnected, code verification cancelled")
+        return Response(status_code=499)
+    except PoolBusyError as e:
+        logger.warning(f"Code verification rejected: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 잠시 후 다시 시도해주세요."
+        )
     except Exception as e:
         logger.error(f"Code verification failed: {str(e)}")
         raise HTTPException(
@@ -404,6 +1088,48 @@ async def verify_code(request: CodeVerifyRequest):
             detail=f"코드 검증 실패: {str(e)}"
         )
 
+@app.post("/api/verify-code/stream")
+async def verify_code_stream(request: CodeVerifyRequest):
+    """
+    /api/verify-code와 같지만 실행 중인 코드의 출력을 SSE로 바로 전송
+
+    이벤트: output(text) x N → result(/api/verify-code 응답과 같은 필드)
+            실패하면 error(error). 저장된 결과가 있으면 output 없이 result만 전송 (force이면 다시 실행)
+    전송되는 출력은 보관하는 출력의 앞부분(VERIFY_OUTPUT_MAX_KB의 절반)까지이며,
+    잘린 경우 result의 output에 앞부분과 뒷부분이 생략 표시와 함께 담김
+    """
+    async def event_stream():
+        if not request.force:
+            stored = await get_stored_verification(request.code)
+            if stored is not None:
+                yield format_stream_event({"type": "result", **verification_response(stored)}, "sse")
+                return
+
+        result = None
+        try:
+            async for event in verify_pool.stream(stream_verify_code, request.code, VERIFY_OUTPUT_MAX_KB * 1024,
+                                                  time_limit=VERIFY_SOFT_TIMEOUT):
+                if event['type'] == 'output':
+                    yield format_stream_event(event, "sse")
+                else:
+                    result = {key: value for key, value in event.items() if key != 'type'}
+        except (JobTimeoutError, ResourceLimitError) as e:
+            result = verification_limit_result(e)
+        except (PoolBusyError, WorkerCrashedError, RuntimeError) as e:
+            logger.error(f"Code verification streaming failed: {str(e)}")
+            yield format_stream_event({"type": "error", "error": str(e)}, "sse")
+            return
+
+        result = await store_verification(request.code, result)
+        yield format_stream_event({"type": "result", **verification_response(result)}, "sse")
+
+    # 클라이언트 연결이 끊기면 스트림이 닫히고 작업 프로세스가 교체됨
+    return StreamingResponse(
+        event_stream(),
+        media_type=STREAM_MEDIA_TYPES["sse"],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 def get_error_suggestion(error_message: str) -> str:
     """
     오류 메시지를 분석하여 해결 방법 제안
@@ -429,9 +1155,134 @@ def get_error_suggestion(error_message: str) -> str:
 
     return "💡 오류를 해결하려면 오류 메시지를 자세히 읽어보세요. 어떤 줄에서 무엇이 잘못되었는지 알려줍니다."
 
+# 오류 일괄 검증 요청 모델
+class ErrorVerifyBatchRequest(BaseModel):
+    ids: Optional[List[int]] = None  # 검증할 오류 ID 목록 (지정하면 아래 필터는 무시)
+    filter_status: str = "unresolved"  # all, resolved, unresolved
+    level: Optional[str] = None
+    activity: Optional[str] = None
+    limit: Optional[int] = None  # 필터로 조회할 최대 개수 (기본/최대: VERIFY_BATCH_MAX_ITEMS)
+    resolve_passing: bool = False  # True이면 이제 정상 실행되는 오류를 해결됨으로 표시
+    force: bool = False  # True이면 저장된 검증 결과가 있어도 다시 실행
+    stream: str = "ndjson"  # 결과 스트리밍 형식: ndjson, sse
+
+# 오류 일괄 검증 API
+@app.post("/api/error-reports/verify-batch")
+async def verify_error_reports_batch(request: ErrorVerifyBatchRequest):
+    """
+    저장된 오류 보고의 코드를 검증 풀에서 병렬로 검증하고, 끝나는 순서대로 결과를 스트리밍
+
+    이벤트: start(count) → result(index, id, level, activity, 검증 결과, cached, suggestion) x count
+            → end(count, passed, failed, cached, resolved_ids, elapsed_ms)
+    저장된 검증 결과는 한 번의 쿼리로 조회하고, 결과가 없는 코드만 실행 (force이면 모두 실행)
+    resolve_passing이면 모든 검증이 끝난 뒤 정상 실행된 오류를 한 번에 해결됨으로 표시
+    """
+    logger.info(f"Received error report batch verification request (ids={request.ids is not None}, filter={request.filter_status})")
+
+    check_stream_format(request.stream)
+    if request.filter_status not in ("all", "resolved", "unresolved"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 필터입니다: {request.filter_status} (가능: all, resolved, unresolved)"
+        )
+    if request.ids is not None and len(request.ids) > VERIFY_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 검증할 수 있는 오류는 최대 {VERIFY_BATCH_MAX_ITEMS}개입니다"
+        )
+
+    limit = min(request.limit or VERIFY_BATCH_MAX_ITEMS, VERIFY_BATCH_MAX_ITEMS)
+    try:
+        reports = await run_in_threadpool(
+            get_error_reports_for_verification,
+            ids=list(dict.fromkeys(request.ids)) if request.ids is not None else None,
+            filter_status=request.filter_status, level=request.level, activity=request.activity,
+            limit=limit
+        )
+    except Exception as e:
+        logger.error(f"Failed to load error reports for verification: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"조회 실패: {str(e)}"
+        )
+
+    stored = {}
+    if not request.force:
+        try:
+            stored = await run_in_threadpool(get_verification_results,
+                                             list({code_hash(report['user_code']) for report in reports}),
+                                             VERIFY_RESULT_VERSION)
+        except Exception as e:
+            logger.warning(f"Failed to load stored verification results: {str(e)}")
+
+    semaphore = batch_semaphore(verify_pool)
+    running = {}  # 코드 해시 -> 검증 작업 (같은 코드가 여러 보고에 있으면 한 번만 실행)
+    started = time.perf_counter()
+
+    async def execute_limited(code: str) -> Dict:
+        async with semaphore:
+            return await execute_verification(code)
+
+    async def verify_item(index: int, report: Dict) -> Dict:
+        digest = code_hash(report['user_code'])
+        result = stored.get(digest)
+        if result is not None:
+            result = {**result, 'cached': True}
+        else:
+            if digest not in running:
+                running[digest] = asyncio.ensure_future(execute_limited(report['user_code']))
+            try:
+                result = await running[digest]
+            except (PoolBusyError, WorkerCrashedError) as e:
+                logger.error(f"Verification of error {report['id']} failed: {str(e)}")
+                return {
+                    "type": "result",
+                    "index": index,
+                    "id": report['id'],
+                    "level": report['level'],
+                    "activity": report['activity'],
+                    "success": False,
+                    "error": str(e)
+                }
+        return {
+            "type": "result",
+            "index": index,
+            "id": report['id'],
+            "level": report['level'],
+            "activity": report['activity'],
+            **verification_response(result)
+        }
+
+    async def finish(results: List[Dict]):
+        passed_ids = [event["id"] for event in results if event["success"] and not event["error_occurred"]]
+        resolved_ids = []
+        if request.resolve_passing and passed_ids:
+            try:
+                resolved_ids = await run_in_threadpool(mark_errors_resolved, passed_ids)
+            except Exception as e:
+                yield {"type": "error", "error": f"해결 처리 실패: {str(e)}"}
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Error report batch verification finished: {len(passed_ids)}/{len(results)} passed in {elapsed_ms}ms")
+        yield {
+            "type": "end",
+            "count": len(results),
+            "passed": len(passed_ids),
+            "failed": len(results) - len(passed_ids),
+            "cached": sum(event.get("cached", False) for event in results),
+            "resolved_ids": resolved_ids,
+            "elapsed_ms": elapsed_ms
+        }
+
+    def cancel_running():
+        # 같은 코드를 공유하는 검증 작업도 취소
+        for task in running.values():
+            task.cancel()
+
+    return stream_batch_results(reports, verify_item, request.stream, finish, cancel_running)
+
 # 오류 해결 상태 토글 API
 @app.patch("/api/error-reports/{error_id}/toggle-resolved")
-async def toggle_resolved(error_id: int):
+def toggle_resolved(error_id: int):
     """
     오류 해결 상태 토글
     """
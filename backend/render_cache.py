@@ -0,0 +1,282 @@
+"""
+Turtle 실행 결과 캐시
+
+같은 활동에서 학생들이 똑같은 코드를 제출하는 경우가 많으므로, 정규화한 코드와
+렌더링 옵션의 해시를 키로 실행 결과를 저장해 두고 다시 실행하지 않는다.
+
+- 메모리 계층: 바이트 크기 기준으로 오래된 항목부터 제거하는 LRU
+- 디스크 계층(선택): 서버를 재시작해도 유지되는 JSON 파일 저장소
+  (파일 목록/크기/사용 순서는 메모리 인덱스로 관리하고, 파일 입출력은 lock 밖에서 수행)
+- 계층별 적중/실패 횟수 기록
+
+결과에 포함된 bytes 값(이미지 바이너리 응답)은 메모리 계층에는 그대로,
+디스크 계층에는 base64로 저장한다.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 캐시된 결과의 형식 버전 (실행 결과 dict의 키가 바뀌면 올려서 이전 항목을 무효화)
+CACHE_FORMAT_VERSION = 2
+
+# 실행할 때마다 결과가 달라질 수 있는 모듈을 사용하는 코드는 캐시하지 않음
+NONDETERMINISTIC_PATTERN = re.compile(r'\b(random|time|datetime|secrets|uuid)\b')
+
+
+def normalize_code(code: str) -> str:
+    """줄바꿈 문자, 줄 끝 공백, 앞뒤 빈 줄 차이를 없앤 코드"""
+    lines = code.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip('\n')
+
+
+def is_cacheable(code: str) -> bool:
+    """실행 결과가 항상 같은 코드인지 확인 (난수/시간 모듈 사용 시 False)"""
+    return NONDETERMINISTIC_PATTERN.search(code) is None
+
+
+def _encode_bytes(value):
+    """json.dumps의 default - bytes를 {'__bytes__': base64}로 변환"""
+    if isinstance(value, bytes):
+        return {'__bytes__': base64.b64encode(value).decode('ascii')}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_bytes(obj: Dict):
+    """json.loads의 object_hook - _encode_bytes의 역변환"""
+    if len(obj) == 1 and '__bytes__' in obj:
+        return base64.b64decode(obj['__bytes__'])
+    return obj
+
+
+def make_cache_key(code: str, **options) -> str:
+    """
+    정규화한 코드와 렌더링 옵션으로 캐시 키 생성
+
+    Args:
+        code: turtle 코드
+        **options: width, height, animate, output, format 등 결과에 영향을 주는 옵션
+    """
+    payload = json.dumps({'version': CACHE_FORMAT_VERSION, 'code': normalize_code(code), 'options': options},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    2계층(메모리 LRU + 디스크) 실행 결과 캐시
+
+    Args:
+        max_memory_bytes: 메모리 계층의 최대 크기 (0이면 메모리 계층 사용 안 함)
+        disk_dir: 디스크 계층 디렉토리 (None이면 디스크 계층 사용 안 함)
+        max_disk_bytes: 디스크 계층의 최대 크기 (0이면 제한 없음)
+    """
+
+    def __init__(self, max_memory_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 0):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, size)
+        self._memory_bytes = 0
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()  # key -> 파일 크기 (오래 사용하지 않은 순)
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+        }
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            # 시작할 때 한 번만 디렉토리를 읽어 인덱스 생성 (수정 시각 = 마지막 사용 시각)
+            for path, size, _ in sorted(self._scan_disk(), key=lambda entry: entry[2]):
+                self._disk_index[os.path.basename(path)[:-len('.json')]] = size
+                self._disk_bytes += size
+            logger.info(f"Render cache disk tier at {disk_dir} ({self._disk_bytes} bytes)")
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _scan_disk(self):
+        """디스크 계층의 (경로, 크기, 수정 시각) 목록"""
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _store_memory(self, key: str, value: Dict, size: int):
+        """메모리 계층에 저장하고 크기 한도를 넘으면 오래된 항목부터 제거 (lock 보유 상태에서 호출)"""
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._counters['memory_evictions'] += 1
+
+    def _evict_disk(self) -> list:
+        """
+        디스크 계층이 한도를 넘으면 오래 사용하지 않은 항목부터 인덱스에서 제거 (lock 보유 상태에서 호출)
+
+        Returns:
+            list: 삭제할 파일 경로 (lock 밖에서 _remove_files로 삭제)
+        """
+        paths = []
+        if not self.max_disk_bytes:
+            return paths
+        while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+            key, size = self._disk_index.popitem(last=False)
+            self._disk_bytes -= size
+            self._counters['disk_evictions'] += 1
+            paths.append(self._disk_path(key))
+        return paths
+
+    @staticmethod
+    def _remove_files(paths: list):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _get_memory(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            self._counters['memory_hits'] += 1
+            return entry[0]
+
+    def _get_disk(self, key: str) -> Optional[Dict]:
+        """디스크 계층에서 읽기 (파일 읽기는 lock 밖에서)"""
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = f.read()
+            value = json.loads(data, object_hook=_decode_bytes)
+        except (OSError, ValueError):
+            with self._lock:
+                # 다른 스레드/프로세스가 지운 파일은 인덱스에서도 제거
+                size = self._disk_index.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+            return None
+
+        try:
+            os.utime(path)  # 재시작 후에도 최근 사용 순서로 제거되도록
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._disk_index:
+                self._disk_index.move_to_end(key)
+            else:
+                # 다른 프로세스가 저장한 파일
+                self._disk_index[key] = len(data)
+                self._disk_bytes += len(data)
+            if self.max_memory_bytes:
+                self._store_memory(key, value, len(data))
+            self._counters['disk_hits'] += 1
+        return value
+
+    def _count_miss(self):
+        with self._lock:
+            self._counters['misses'] += 1
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시된 결과 반환 (없으면 None)"""
+        value = self._get_memory(key)
+        if value is None and self.disk_dir:
+            value = self._get_disk(key)
+        if value is None:
+            self._count_miss()
+        return value
+
+    async def aget(self, key: str) -> Optional[Dict]:
+        """get과 같지만 디스크 계층 읽기는 이벤트 루프를 막지 않도록 스레드에서 실행"""
+        value = self._get_memory(key)
+        if value is None and self.disk_dir:
+            value = await asyncio.to_thread(self._get_disk, key)
+        if value is None:
+            self._count_miss()
+        return value
+
+    def _put_disk(self, key: str, data: str):
+        """디스크 계층에 저장 (파일 쓰기/삭제는 lock 밖에서)"""
+        path = self._disk_path(key)
+        encoded = data.encode('utf-8')
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(encoded)
+            os.replace(temp_path, path)  # 다른 스레드/프로세스가 반쯤 쓴 파일을 읽지 않도록
+        except OSError as e:
+            logger.warning(f"Failed to write render cache entry: {e}")
+            return
+        with self._lock:
+            self._disk_bytes += len(encoded) - self._disk_index.pop(key, 0)
+            self._disk_index[key] = len(encoded)
+            evicted = self._evict_disk()
+        self._remove_files(evicted)
+
+    def put(self, key: str, value: Dict):
+        """결과 저장 (JSON으로 직렬화할 수 있는 dict, bytes 값 포함 가능)"""
+        data = json.dumps(value, ensure_ascii=False, default=_encode_bytes)
+        with self._lock:
+            self._counters['stores'] += 1
+            if self.max_memory_bytes:
+                self._store_memory(key, value, len(data))
+        if self.disk_dir:
+            self._put_disk(key, data)
+
+    async def aput(self, key: str, value: Dict):
+        """put과 같지만 디스크 계층이 있으면 직렬화와 파일 쓰기를 스레드에서 실행"""
+        if self.disk_dir:
+            await asyncio.to_thread(self.put, key, value)
+        else:
+            self.put(key, value)
+
+    def clear(self):
+        """메모리 계층 비우기 (디스크 계층은 유지)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict:
+        """계층별 적중/실패 횟수와 크기"""
+        with self._lock:
+            lookups = self._counters['memory_hits'] + self._counters['disk_hits'] + self._counters['misses']
+            hits = self._counters['memory_hits'] + self._counters['disk_hits']
+            return {
+                **self._counters,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'max_memory_bytes': self.max_memory_bytes,
+                'disk_enabled': bool(self.disk_dir),
+                'disk_bytes': self._disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes,
+            }
@@ -0,0 +1,114 @@
+"""
+단계별 실행 시간 측정
+
+요청 하나의 단계(코드 실행, 렌더링, 인코딩, base64 변환 등)별 시간을 재는 StageTimer와,
+여러 요청의 단계별 시간 분포를 모으는 StageHistograms를 제공한다.
+측정 결과는 Server-Timing 헤더와 응답 JSON의 timings 항목으로 내보낸다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+# 히스토그램 구간 상한 (ms) - 마지막 구간 이후는 +Inf
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class StageTimer:
+    """
+    단계별 소요 시간 누적
+
+    단계 안에서 다른 단계가 실행되면(예: 인코더가 프레임 제너레이터를 소비하며 렌더링)
+    안쪽 단계의 시간은 바깥 단계에서 빼므로, 각 단계에는 자기 자신의 시간만 남는다.
+    같은 이름의 단계는 여러 번 실행되면 합산된다.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}  # 단계 이름 -> 초
+        self._stack: List[list] = []  # [이름, 시작 시각, 안쪽 단계 시간]
+
+    @contextmanager
+    def stage(self, name: str):
+        entry = [name, time.perf_counter(), 0.0]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - entry[1]
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed - entry[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def add(self, name: str, seconds: float):
+        """따로 측정한 시간을 단계에 더함"""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def as_ms(self) -> Dict[str, float]:
+        """단계 이름 -> 밀리초 (소수점 둘째 자리)"""
+        return {name: round(seconds * 1000, 2) for name, seconds in self.durations.items()}
+
+
+def format_server_timing(timings_ms: Dict[str, float]) -> str:
+    """단계별 시간(ms)을 Server-Timing 헤더 값으로 변환"""
+    return ', '.join(f'{name};dur={duration:.2f}' for name, duration in timings_ms.items())
+
+
+class StageHistograms:
+    """
+    단계별 소요 시간 히스토그램 (스레드 안전)
+
+    Args:
+        buckets: 구간 상한 목록 (ms, 오름차순)
+    """
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._stages: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, timings_ms: Dict[str, float]):
+        """요청 하나의 단계별 시간(ms) 기록"""
+        with self._lock:
+            for name, duration in timings_ms.items():
+                stage = self._stages.get(name)
+                if stage is None:
+                    stage = {'counts': [0] * (len(self.buckets) + 1), 'count': 0, 'sum': 0.0, 'max': 0.0}
+                    self._stages[name] = stage
+                index = next((i for i, bound in enumerate(self.buckets) if duration <= bound), len(self.buckets))
+                stage['counts'][index] += 1
+                stage['count'] += 1
+                stage['sum'] += duration
+                stage['max'] = max(stage['max'], duration)
+
+    def _quantile(self, stage: Dict, q: float) -> float:
+        """q 분위수가 속한 구간의 상한 (마지막 구간이면 최댓값)"""
+        rank = q * stage['count']
+        seen = 0
+        for index, count in enumerate(stage['counts']):
+            seen += count
+            if seen >= rank and count:
+                return float(self.buckets[index]) if index < len(self.buckets) else stage['max']
+        return stage['max']
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """단계별 요청 수, 합계/평균/최대, 분위수(p50/p95/p99), 구간별 개수"""
+        with self._lock:
+            result = {}
+            for name, stage in self._stages.items():
+                bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+                result[name] = {
+                    'count': stage['count'],
+                    'sum_ms': round(stage['sum'], 2),
+                    'mean_ms': round(stage['sum'] / stage['count'], 2),
+                    'max_ms': round(stage['max'], 2),
+                    'p50_ms': self._quantile(stage, 0.5),
+                    'p95_ms': self._quantile(stage, 0.95),
+                    'p99_ms': self._quantile(stage, 0.99),
+                    'buckets': dict(zip(bounds, stage['counts'])),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
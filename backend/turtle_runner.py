@@ -2,24 +2,257 @@
 Turtle 코드를 matplotlib로 시뮬레이션하여 결과 이미지를 생성하는 모듈
 """
 import io
+import ast
 import base64
+import builtins
+import importlib
+import math
 import os
+import struct
+import zlib
+from array import array
 import matplotlib
 matplotlib.use('Agg')  # GUI 없이 이미지 생성
-import matplotlib.pyplot as plt
 import numpy as np
-from typing import List, Tuple
-from PIL import Image
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from PIL import Image, ImageChops, ImageDraw
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PathCollection, PolyCollection
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+from matplotlib.markers import MarkerStyle
+from stage_timing import StageTimer
+
+TURTLE_IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'turtle.png')
+TURTLE_SPRITE_SIZE = 28  # 렌더링되는 거북이 이미지 크기 (픽셀)
+SPRITE_ANGLE_STEP = 1  # 미리 회전해 두는 거북이 이미지의 각도 단위 (도)
+LINE_WIDTH = 2  # pensize 1일 때 선 두께 (포인트) - 실제 두께는 pensize x LINE_WIDTH
+FILL_ALPHA = 0.7  # 채워진 도형의 불투명도
+FRAME_DURATION_MS = 100  # 애니메이션 프레임 간격 (프론트엔드 플레이어와 동일)
+MAX_ANIMATION_FRAMES = int(os.getenv('TURTLE_MAX_FRAMES', '300'))  # 요청과 관계없이 렌더링하는 최대 프레임 수
+# 애니메이션 렌더링에 쓸 수 있는 예상 비용 (ms, simulation_stats의 render_cost_ms 기준)
+# 0이면 실행 제한 시간(TURTLE_JOB_TIMEOUT)의 절반 - 넘지 않도록 프레임 수를 줄임
+RENDER_BUDGET_MS = (float(os.getenv('TURTLE_RENDER_BUDGET_MS', '0'))
+                    or float(os.getenv('TURTLE_JOB_TIMEOUT', '30')) * 1000 / 2)
+
+# 시뮬레이션 작업량 제한 (0이면 제한 없음) - 넘으면 렌더링 전에 중단
+SIMULATION_LIMITS = {
+    'moves': int(os.getenv('TURTLE_MAX_MOVES', '1000000')),  # 이동/회전 명령 수
+    'segments': int(os.getenv('TURTLE_MAX_SEGMENTS', '100000')),  # 선분과 점 수
+    'fill_points': int(os.getenv('TURTLE_MAX_FILL_POINTS', '100000')),  # 채우기 꼭짓점 수
+    'frames': int(os.getenv('TURTLE_MAX_RECORDED_FRAMES', '100000')),  # 기록된 애니메이션 프레임 수
+}
+SIMULATION_LIMIT_LABELS = {
+    'moves': '이동/회전 명령',
+    'segments': '선분',
+    'fill_points': '채우기 꼭짓점',
+    'frames': '애니메이션 프레임',
+}
+
+# 예상 렌더링 비용 가중치 (raster 렌더러, 600x600 기준 대략적인 ms)
+RENDER_COST_PER_SEGMENT = 0.05
+RENDER_COST_PER_FILL_POINT = 0.01
+# 프레임 하나의 렌더링 + PNG 인코딩 (benchmark_turtle.py에서 선이 빽빽한 프레임은 약 60ms)
+RENDER_COST_PER_FRAME = 60.0
+
+# 일괄 처리 모드에서 한 번에 적분하는 최대 명령 수 (이보다 많이 쌓이면 바로 적분)
+TRACE_FLUSH_SIZE = 65536
+# 이보다 적게 쌓인 명령은 파이썬 루프로 적분 (NumPy 배열을 만드는 고정 비용이 더 큼)
+BATCH_MIN_COMMANDS = 64
+
+# 단일 파일 애니메이션 출력 형식: output 이름 -> MIME 타입
+ANIMATION_FORMATS = {
+    'apng': 'image/apng',
+    'webp': 'image/webp',
+    'gif': 'image/gif',
+}
+
+# 정적 이미지 형식별 MIME 타입
+IMAGE_FORMATS = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+}
+
+
+class SimulationBudgetExceeded(Exception):
+    """시뮬레이션 작업량이 SIMULATION_LIMITS를 넘은 경우"""
+
+    def __init__(self, name: str, limit: int, stats: Dict[str, int]):
+        self.name = name
+        self.limit = limit
+        self.stats = stats
+        super().__init__(f"그리기 작업이 너무 많아 중단했습니다: "
+                         f"{SIMULATION_LIMIT_LABELS[name]} {limit:,}개 초과")
+
+
+class SegmentLog:
+    """
+    선분과 점을 열(column) 단위 배열로 저장하는 로그
+
+    선분마다 dict와 리스트를 만드는 대신 x0/y0/x1/y1 좌표와 두께, 색상 인덱스,
+    종류(선/점)를 각각 array.array에 이어 붙인다. 색상은 self.colors 목록에
+    한 번만 저장하고 인덱스로 참조한다.
+    """
+
+    KIND_LINE = 0
+    KIND_DOT = 1
+
+    def __init__(self):
+        self.x0 = array('d')
+        self.y0 = array('d')
+        self.x1 = array('d')
+        self.y1 = array('d')
+        self.width = array('d')  # 선 두께 (점인 경우 점 크기)
+        self.color = array('I')  # self.colors의 인덱스
+        self.kind = array('B')  # KIND_LINE / KIND_DOT
+        self.colors: List = []
+        self._color_index: Dict = {}
+
+    def __len__(self):
+        return len(self.kind)
+
+    def intern_color(self, color) -> int:
+        """색상을 색상 목록에 등록하고 인덱스 반환"""
+        if isinstance(color, list):
+            color = tuple(color)
+        index = self._color_index.get(color)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(color)
+            self._color_index[color] = index
+        return index
+
+    def add_line(self, x0: float, y0: float, x1: float, y1: float, color, width: float):
+        """선분 추가"""
+        self.x0.append(x0)
+        self.y0.append(y0)
+        self.x1.append(x1)
+        self.y1.append(y1)
+        self.width.append(width)
+        self.color.append(self.intern_color(color))
+        self.kind.append(self.KIND_LINE)
+
+    def extend_lines(self, xs: np.ndarray, ys: np.ndarray, color, width: float):
+        """
+        꺾은선을 선분 len(xs) - 1개로 한 번에 추가
+
+        Args:
+            xs: 꼭짓점 x 좌표 배열
+            ys: 꼭짓점 y 좌표 배열
+        """
+        count = len(xs) - 1
+        if count < 1:
+            return
+        xs = np.asarray(xs, dtype='d')
+        ys = np.asarray(ys, dtype='d')
+        self.x0.frombytes(xs[:-1].tobytes())
+        self.y0.frombytes(ys[:-1].tobytes())
+        self.x1.frombytes(xs[1:].tobytes())
+        self.y1.frombytes(ys[1:].tobytes())
+        self.width.extend(array('d', [width]) * count)
+        self.color.extend(array('I', [self.intern_color(color)]) * count)
+        self.kind.extend(array('B', [self.KIND_LINE]) * count)
+
+    def extend_segments(self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray,
+                        color_indexes: np.ndarray, widths: np.ndarray):
+        """
+        색/두께가 선분마다 다른 선분들을 한 번에 추가
+
+        Args:
+            color_indexes: 선분별 색상 인덱스 (intern_color로 등록한 값)
+            widths: 선분별 두께
+        """
+        count = len(x0)
+        if count < 1:
+            return
+        self.x0.frombytes(np.asarray(x0, dtype='d').tobytes())
+        self.y0.frombytes(np.asarray(y0, dtype='d').tobytes())
+        self.x1.frombytes(np.asarray(x1, dtype='d').tobytes())
+        self.y1.frombytes(np.asarray(y1, dtype='d').tobytes())
+        self.width.frombytes(np.asarray(widths, dtype='d').tobytes())
+        self.color.frombytes(np.asarray(color_indexes, dtype=self.color.typecode).tobytes())
+        self.kind.extend(array('B', [self.KIND_LINE]) * count)
+
+    def add_dot(self, x: float, y: float, color, size: float):
+        """점 추가 (시작점과 끝점이 같은 항목으로 저장)"""
+        self.x0.append(x)
+        self.y0.append(y)
+        self.x1.append(x)
+        self.y1.append(y)
+        self.width.append(size)
+        self.color.append(self.intern_color(color))
+        self.kind.append(self.KIND_DOT)
+
+    def as_arrays(self, start: int = 0, stop: int = None) -> Dict[str, np.ndarray]:
+        """
+        [start, stop) 구간을 복사 없이 NumPy 배열로 반환
+
+        Returns:
+            dict: 'x0', 'y0', 'x1', 'y1', 'width', 'color', 'kind' 키의 배열
+        """
+        if stop is None:
+            stop = len(self)
+        columns = {
+            'x0': self.x0, 'y0': self.y0, 'x1': self.x1, 'y1': self.y1,
+            'width': self.width, 'color': self.color, 'kind': self.kind,
+        }
+        return {
+            name: np.frombuffer(column, dtype=column.typecode)[start:stop]
+            for name, column in columns.items()
+        }
+
+
+class Frame(NamedTuple):
+    """
+    애니메이션 프레임 - 세그먼트/채우기 로그의 오프셋과 거북이 자세
+
+    프레임 i는 segments[0, segment_end) + filled_shapes[0, fill_end) 로 그려진다.
+    """
+    segment_end: int
+    fill_end: int
+    x: float
+    y: float
+    angle: float
 
 
 class TurtleSimulator:
-    """Turtle 명령을 matplotlib로 시뮬레이션"""
+    """
+    Turtle 명령을 시뮬레이션하여 선분 로그와 프레임을 기록
+
+    batch=True이면 forward/left/right를 바로 계산하지 않고 명령 기록(opcode + 인자 + 펜 상태)에
+    쌓아 두었다가, 위치/방향을 읽거나 채우기/점/goto처럼 현재 위치가 필요할 때 한 번에 적분한다.
+    펜 색/두께/올림 여부는 명령마다 기록되므로 펜 상태를 바꿔도 적분하지 않는다.
+    쌓인 명령이 BATCH_MIN_COMMANDS보다 적으면 한 명령씩, 많으면 NumPy로
+    (회전 누적합 → cos/sin → 이동 누적합) 적분한다. 위치를 자주 읽어 짧은 기록만 적분하게 되면
+    기록하는 비용만 더해지므로, 그 뒤 BATCH_MIN_COMMANDS개 명령은 기록하지 않고 바로 계산한다.
+    batch=False이면 항상 명령마다 바로 계산한다.
+    """
 
-    def __init__(self, record_frames=False):
-        self.x = 0.0
-        self.y = 0.0
-        self.angle = 90.0  # 북쪽 방향 (위)
+    OP_MOVE = 0
+    OP_TURN = 1
+
+    def __init__(self, record_frames=False, batch=True, limits: Dict[str, int] = None):
+        self.batch = batch
+        self.limits = {**SIMULATION_LIMITS, **(limits or {})}
+        # 작업량 제한 (0/None이면 제한 없음)
+        self._max_moves = self.limits.get('moves') or math.inf
+        self._max_segments = self.limits.get('segments') or math.inf
+        self._max_fill_points = self.limits.get('fill_points') or math.inf
+        self._max_frames = self.limits.get('frames') or math.inf
+        self.move_count = 0  # 실행한 이동/회전 명령 수
+        self.filled_point_count = 0  # 완성된 채우기 도형의 꼭짓점 수
+        self._trace_op = array('B')  # OP_MOVE / OP_TURN
+        self._trace_arg = array('d')  # 이동 거리 / 회전 각도 (왼쪽이 양수)
+        self._trace_pen = array('I')  # 명령 시점의 펜 상태 (self._trace_pens의 인덱스)
+        self._trace_pens: List[Tuple] = []  # (색, 두께, 펜 내림 여부)
+        self._pen_changed = True  # 마지막으로 기록한 뒤 펜 상태(pen_color, pen_size, pen_down)가 바뀌었는지
+        self._eager_until = 0  # move_count가 여기에 닿을 때까지는 기록하지 않고 바로 계산
+        self._check_at = 0  # move_count가 여기에 닿으면 적분하고 작업량 확인 (_after_moves 참고)
+        self._x = 0.0
+        self._y = 0.0
+        self._angle = 90.0  # 북쪽 방향 (위)
         self.pen_down = True
         self.pen_color = 'black'
         self.fill_color = 'black'
@@ -29,67 +262,242 @@ class TurtleSimulator:
         self.turtle_shape = 'classic'  # 거북이 모양
         self.filling = False
         self.fill_points: List[Tuple[float, float]] = []
-        self.lines: List[dict] = []
+        self.segments = SegmentLog()
         self.filled_shapes: List[dict] = []  # 채워진 도형들
         self.record_frames = record_frames
-        self.frames: List[List[dict]] = []  # 각 프레임의 선 목록
-        self.positions: List[Tuple[float, float, float]] = []  # 거북이 위치 기록 (x, y, angle)
+        self.frames: List[Frame] = []  # 각 프레임의 로그 오프셋과 거북이 위치
+
+    @property
+    def x(self) -> float:
+        if self._trace_op:
+            self.flush()
+        return self._x
+
+    @x.setter
+    def x(self, value: float):
+        if self._trace_op:
+            self.flush()
+        self._x = value
+
+    @property
+    def y(self) -> float:
+        if self._trace_op:
+            self.flush()
+        return self._y
+
+    @y.setter
+    def y(self, value: float):
+        if self._trace_op:
+            self.flush()
+        self._y = value
+
+    @property
+    def angle(self) -> float:
+        if self._trace_op:
+            self.flush()
+        return self._angle
+
+    @angle.setter
+    def angle(self, value: float):
+        if self._trace_op:
+            self.flush()
+        self._angle = value
+
+    def flush(self):
+        """
+        쌓인 이동/회전 명령을 한 번에 적분하여 선분, 채우기 점, 프레임에 반영
 
-    def _save_frame(self):
-        """현재 상태를 프레임으로 저장"""
+        forward()/right()를 하나씩 실행한 것과 같은 결과.
+        """
+        ops = self._trace_op
+        if not ops:
+            return
+        args = self._trace_arg
+        pen_indexes = self._trace_pen
+        pens = self._trace_pens
+        self.move_count += len(ops)
+        self._pen_changed = True
+        if len(ops) < BATCH_MIN_COMMANDS:
+            # 짧은 기록은 NumPy 배열을 만드는 고정 비용이 더 크므로 한 명령씩 적분
+            for op, arg, pen in zip(ops, args, pen_indexes):
+                if op == self.OP_MOVE:
+                    self._move(arg, *pens[pen])
+                else:
+                    self._angle += arg
+            del ops[:], args[:], pen_indexes[:], pens[:]
+            self._eager_until = self.move_count + BATCH_MIN_COMMANDS
+        else:
+            self._trace_op = array('B')
+            self._trace_arg = array('d')
+            self._trace_pen = array('I')
+            self._trace_pens = []
+            self._integrate_vector(ops, args, pen_indexes, pens)
+        self._after_moves()
+
+    def _move(self, distance: float, color, width: float, down: bool):
+        """현재 방향으로 distance만큼 이동 (애니메이션 모드에서는 4단계로 분할하고 단계마다 프레임 저장)"""
+        radians = math.radians(self._angle)
+        cos = math.cos(radians)
+        sin = math.sin(radians)
+        animated = self.record_frames and distance != 0
+        steps = 4 if animated else 1
+        step = distance / steps
+        x, y = self._x, self._y
+        for _ in range(steps):
+            new_x = x + step * cos
+            new_y = y + step * sin
+            if down:
+                self.segments.add_line(x, y, new_x, new_y, color, width)
+                if animated:
+                    self.frames.append(Frame(len(self.segments), len(self.filled_shapes), x, y, self._angle))
+            x, y = new_x, new_y
+            if self.filling:
+                self.fill_points.append((x, y))
+        self._x, self._y = x, y
+
+    def _integrate_vector(self, ops, args, pen_indexes, pens):
+        """긴 명령 기록을 NumPy 누적합으로 적분"""
+        ops = np.frombuffer(ops, dtype=np.uint8)
+        args = np.frombuffer(args, dtype='d')
+
+        # 각 명령 직전의 방향 (순서대로 더해 forward/right를 하나씩 실행한 것과 같은 값)
+        is_move = ops == self.OP_MOVE
+        turns = np.where(is_move, 0.0, args)
+        headings = np.cumsum(np.concatenate(([self._angle], turns)))
+        self._angle = float(headings[-1])
+        if not is_move.any():
+            return
+
+        distances = args[is_move]
+        move_headings = headings[:-1][is_move]
+        move_pens = np.frombuffer(pen_indexes, dtype=np.uint32)[is_move]
+        # 애니메이션 모드에서는 forward()처럼 0이 아닌 이동을 4단계로 분할
         if self.record_frames:
-            # 현재까지의 모든 선과 채워진 도형을 복사하여 저장
-            frame_data = {
-                'lines': [line.copy() for line in self.lines],
-                'filled_shapes': [shape.copy() for shape in self.filled_shapes]
-            }
-            self.frames.append(frame_data)
-            # 현재 거북이 위치 저장
-            self.positions.append((self.x, self.y, self.angle))
-
-    def forward(self, distance: float):
-        """앞으로 이동 (부드러운 애니메이션을 위해 4단계로 분할)"""
-        # 애니메이션 모드일 때만 단계별로 나누기
-        if self.record_frames and abs(distance) > 0:
-            steps = 4  # 4단계로 분할 (성능 최적화)
-            step_distance = distance / steps
-
-            for _ in range(steps):
-                new_x = self.x + step_distance * np.cos(np.radians(self.angle))
-                new_y = self.y + step_distance * np.sin(np.radians(self.angle))
-
-                if self.pen_down:
-                    self.lines.append({
-                        'x': [self.x, new_x],
-                        'y': [self.y, new_y],
-                        'color': self.pen_color
-                    })
-                    self._save_frame()  # 각 단계마다 프레임 저장
-
-                self.x = new_x
-                self.y = new_y
-
-                # filling 모드일 때 점 기록
-                if self.filling:
-                    self.fill_points.append((self.x, self.y))
+            substeps = np.where(distances != 0, 4, 1)
+            step_distances = np.repeat(distances / substeps, substeps)
+            step_headings = np.repeat(move_headings, substeps)
+            step_pens = np.repeat(move_pens, substeps)
         else:
-            # 정적 모드일 때는 한 번에 이동
-            new_x = self.x + distance * np.cos(np.radians(self.angle))
-            new_y = self.y + distance * np.sin(np.radians(self.angle))
+            substeps = None
+            step_distances = distances
+            step_headings = move_headings
+            step_pens = move_pens
+
+        radians = np.radians(step_headings)
+        xs = np.cumsum(np.concatenate(([self._x], step_distances * np.cos(radians))))
+        ys = np.cumsum(np.concatenate(([self._y], step_distances * np.sin(radians))))
+
+        pen_down = np.array([down for _, _, down in pens], dtype=bool)
+        step_down = pen_down[step_pens]
+        if step_down.any():
+            segment_base = len(self.segments)
+            if len(pens) == 1:
+                # 펜 상태가 하나면 하나의 꺾은선
+                color, width, _ = pens[0]
+                self.segments.extend_lines(xs, ys, color, width)
+            else:
+                color_indexes = np.array([self.segments.intern_color(color) if down else 0
+                                          for color, _, down in pens], dtype=np.uint32)
+                widths = np.array([width for _, width, _ in pens], dtype='d')
+                drawn = np.flatnonzero(step_down)
+                self.segments.extend_segments(xs[drawn], ys[drawn], xs[drawn + 1], ys[drawn + 1],
+                                              color_indexes[step_pens[drawn]], widths[step_pens[drawn]])
+            if self.record_frames:
+                # forward()와 같이 각 단계의 선분을 그린 직후, 이동 전 자세로 프레임 저장
+                segment_ends = segment_base + np.cumsum(step_down)
+                animated = np.flatnonzero(np.repeat(distances != 0, substeps) & step_down)
+                fill_end = len(self.filled_shapes)
+                self.frames.extend(
+                    Frame(end, fill_end, x, y, angle)
+                    for end, x, y, angle in zip(segment_ends[animated].tolist(), xs[animated].tolist(),
+                                                ys[animated].tolist(), step_headings[animated].tolist())
+                )
+
+        if self.filling:
+            self.fill_points.extend(zip(xs[1:].tolist(), ys[1:].tolist()))
+
+        self._x = float(xs[-1])
+        self._y = float(ys[-1])
+
+    def usage(self) -> Dict[str, int]:
+        """현재까지의 작업량 (SIMULATION_LIMITS와 같은 키)"""
+        return {
+            'moves': self.move_count + len(self._trace_op),
+            'segments': len(self.segments),
+            'fill_points': self.filled_point_count + len(self.fill_points),
+            'frames': len(self.frames),
+        }
 
-            if self.pen_down:
-                self.lines.append({
-                    'x': [self.x, new_x],
-                    'y': [self.y, new_y],
-                    'color': self.pen_color
-                })
+    def _check_budget(self, **pending: int):
+        """
+        작업량이 제한을 넘으면 SimulationBudgetExceeded 발생
 
-            self.x = new_x
-            self.y = new_y
+        Args:
+            **pending: 곧 추가될 작업량 (예: segments=1000) - 큰 배열을 만들기 전에 확인
+        """
+        # 명령 기록 밖에서 작업량이 바뀌었으므로 다음 이동/회전 명령에서 확인 시점을 다시 계산
+        self._check_at = 0
+        usage = self.usage()
+        for name, used in usage.items():
+            limit = self.limits.get(name)
+            if limit and used + pending.get(name, 0) > limit:
+                raise SimulationBudgetExceeded(name, limit, usage)
+
+    def _after_moves(self):
+        """이동/회전 명령을 반영한 뒤, 확인 시점에 닿았으면 작업량을 확인하고 다음 확인 시점 계산"""
+        if self.move_count >= self._check_at:
+            self._check_budget()
+            self._check_at = self.move_count + self._queue_capacity()
+
+    def _queue_capacity(self) -> int:
+        """
+        명령 기록이 비어 있을 때, 이동/회전 명령을 몇 개 더 실행한 뒤 작업량을 확인해야 하는지
 
-            # filling 모드일 때 점 기록
-            if self.filling:
-                self.fill_points.append((self.x, self.y))
+        기록 중에는 채우기 상태가 바뀌지 않으므로(바뀌기 전에 적분) 명령 하나가 늘리는 작업량의
+        최댓값을 알 수 있다 (펜 상태는 기록 중에 바뀔 수 있으므로 펜이 내려져 있다고 가정).
+        남은 작업량을 넘을 수 있는 개수에서 적분하여, 제한을 넘더라도 명령 하나만큼만 넘고 중단된다.
+        """
+        substeps = 4 if self.record_frames else 1
+        capacity = min(TRACE_FLUSH_SIZE, max(0, self._max_moves - self.move_count) + 1,
+                       max(0, self._max_segments - len(self.segments.kind)) // substeps + 1)
+        if self.filling:
+            capacity = min(capacity, max(0, self._max_fill_points - self.filled_point_count
+                                         - len(self.fill_points)) // substeps + 1)
+        if self.record_frames:
+            capacity = min(capacity, max(0, self._max_frames - len(self.frames)) // substeps + 1)
+        return int(capacity)
+
+    def _queue(self, op: int, arg: float):
+        """이동/회전 명령을 현재 펜 상태와 함께 기록"""
+        pens = self._trace_pens
+        if self._pen_changed:
+            pens.append((self.pen_color, self.pen_size, self.pen_down))
+            self._pen_changed = False
+        ops = self._trace_op
+        ops.append(op)
+        self._trace_arg.append(arg)
+        self._trace_pen.append(len(pens) - 1)
+        if self.move_count + len(ops) >= self._check_at:
+            self.flush()
+
+    def _save_frame(self):
+        """현재 상태를 프레임으로 저장"""
+        if self.record_frames:
+            self.flush()
+            # 복사 없이 현재까지의 선/도형 개수와 거북이 위치만 기록
+            self.frames.append(Frame(len(self.segments), len(self.filled_shapes),
+                                     self._x, self._y, self._angle))
+            self._check_budget()
+
+    def forward(self, distance: float):
+        """앞으로 이동 (애니메이션 모드에서는 부드러운 애니메이션을 위해 4단계로 분할)"""
+        if self.batch and self.move_count >= self._eager_until:
+            self._queue(self.OP_MOVE, distance)
+            return
+        self._move(distance, self.pen_color, self.pen_size, self.pen_down)
+        self.move_count += 1
+        if self.move_count >= self._check_at:
+            self._after_moves()
 
     def backward(self, distance: float):
         """뒤로 이동"""
@@ -97,54 +505,85 @@ class TurtleSimulator:
 
     def right(self, angle: float):
         """오른쪽으로 회전"""
-        self.angle -= angle
+        self.left(-angle)
 
     def left(self, angle: float):
         """왼쪽으로 회전"""
-        self.angle += angle
+        if self.batch and self.move_count >= self._eager_until:
+            self._queue(self.OP_TURN, angle)
+            return
+        self._angle += angle
+        self.move_count += 1
+        if self.move_count >= self._check_at:
+            self._after_moves()
 
     def penup(self):
         """펜 들기"""
         self.pen_down = False
+        self._pen_changed = True
 
     def pendown(self):
         """펜 내리기"""
         self.pen_down = True
+        self._pen_changed = True
 
     def pencolor(self, color: str):
         """펜 색상 변경"""
         self.pen_color = color
+        self._pen_changed = True
 
-    def circle(self, radius: float, extent: float = 360):
-        """원 그리기 (근사) - 애니메이션 최적화"""
-        # 애니메이션 모드일 때는 원 전체를 한 번에 그리고 마지막에 한 번만 프레임 저장
-        if self.record_frames:
-            steps = 36  # 원을 부드럽게 그리기 위해 36단계 사용
-        else:
-            steps = int(abs(extent) / 5)  # 5도마다 선분 (정적 모드)
+    def circle(self, radius: float, extent: float = 360, steps: int = None):
+        """
+        원 그리기 (정다각형 근사)
 
-        if steps < 1:
-            steps = 1
+        모든 꼭짓점을 한 번에 계산해 선분 로그에 추가하고, 애니메이션 모드에서는
+        원을 다 그린 뒤 프레임을 한 번만 저장한다.
+
+        Args:
+            radius: 반지름 (양수면 오른쪽, 음수면 왼쪽으로 돌며 그림)
+            extent: 그릴 각도 (None이면 360)
+            steps: 나눌 선분 수 (None이면 애니메이션 모드 36, 정적 모드 5도마다 1개)
+        """
+        if extent is None:
+            extent = 360
+        if steps is None:
+            if self.record_frames:
+                steps = 36  # 원을 부드럽게 그리기 위해 36단계 사용
+            else:
+                steps = int(abs(extent) / 5)  # 5도마다 선분 (정적 모드)
+        steps = max(int(steps), 1)
+        self.flush()
+        self.move_count += 1
+        self._check_budget(segments=steps if self.pen_down else 0,
+                           fill_points=steps if self.filling else 0)
 
         step_angle = extent / steps
         step_distance = 2 * abs(radius) * np.sin(np.radians(abs(step_angle) / 2))
+        turn = -step_angle if radius > 0 else step_angle
+
+        # 각 선분의 진행 방향 → 누적합으로 꼭짓점 좌표 계산
+        headings = np.radians(self._angle + turn * np.arange(steps))
+        xs = np.empty(steps + 1)
+        ys = np.empty(steps + 1)
+        xs[0] = self._x
+        ys[0] = self._y
+        np.cumsum(step_distance * np.cos(headings), out=xs[1:])
+        np.cumsum(step_distance * np.sin(headings), out=ys[1:])
+        xs[1:] += self._x
+        ys[1:] += self._y
 
-        # 원을 그릴 때는 forward()의 프레임 분할과 프레임 기록을 모두 비활성화
-        original_record = self.record_frames
-        self.record_frames = False  # 임시로 프레임 기록 중지
+        if self.pen_down:
+            self.segments.extend_lines(xs, ys, self.pen_color, self.pen_size)
+        if self.filling:
+            self.fill_points.extend(zip(xs[1:].tolist(), ys[1:].tolist()))
 
-        for i in range(steps):
-            self.forward(step_distance)
-            self.right(step_angle) if radius > 0 else self.left(step_angle)
+        self._x = float(xs[-1])
+        self._y = float(ys[-1])
+        self._angle += turn * steps
 
-        # 원을 다 그린 후 마지막에 한 번만 프레임 저장
-        if original_record:
-            self.record_frames = True
+        if self.record_frames:
             self._save_frame()
 
-        # 원래 상태로 복원
-        self.record_frames = original_record
-
     def done(self):
         """아무것도 하지 않음 (호환성)"""
         pass
@@ -180,17 +619,16 @@ class TurtleSimulator:
             else:
                 return
 
+        self.flush()
         if self.pen_down:
-            self.lines.append({
-                'x': [self.x, x],
-                'y': [self.y, y],
-                'color': self.pen_color
-            })
+            self.segments.add_line(self._x, self._y, x, y, self.pen_color, self.pen_size)
             if self.record_frames:
                 self._save_frame()
 
-        self.x = x
-        self.y = y
+        self._x = x
+        self._y = y
+        self.move_count += 1
+        self._check_budget()
 
     def setpos(self, x: float, y: float = None):
         """goto의 별칭"""
@@ -272,6 +710,7 @@ class TurtleSimulator:
         if width is None:
             return self.pen_size
         self.pen_size = width
+        self._pen_changed = True
 
     def width(self, width: int = None):
         """pensize의 별칭"""
@@ -286,12 +725,13 @@ class TurtleSimulator:
         """펜 색상과 채우기 색상 설정"""
         if len(args) == 0:
             return (self.pen_color, self.fill_color)
-        elif len(args) == 1:
+        if len(args) == 1:
             self.pen_color = args[0]
             self.fill_color = args[0]
         elif len(args) == 2:
             self.pen_color = args[0]
             self.fill_color = args[1]
+        self._pen_changed = True
 
     def fillcolor(self, color: str = None):
         """채우기 색상 설정/반환"""
@@ -302,20 +742,26 @@ class TurtleSimulator:
     # === Filling ===
     def begin_fill(self):
         """채우기 시작"""
+        self.flush()
+        self._check_at = 0  # 채우기 점도 작업량에 포함되므로 다음 명령에서 확인 시점을 다시 계산
         self.filling = True
-        self.fill_points = [(self.x, self.y)]
+        self.fill_points = [(self._x, self._y)]
 
     def end_fill(self):
         """채우기 종료"""
-        if self.filling and len(self.fill_points) > 2:
+        self.flush()
+        points = self.fill_points
+        completed = self.filling and len(points) > 2
+        self.filling = False
+        self.fill_points = []
+        if completed:
             self.filled_shapes.append({
-                'points': self.fill_points.copy(),
+                'points': points,
                 'color': self.fill_color
             })
+            self.filled_point_count += len(points)
             if self.record_frames:
                 self._save_frame()
-        self.filling = False
-        self.fill_points = []
 
     # === More Drawing Control ===
     def dot(self, size: int = None, color: str = None):
@@ -326,15 +772,12 @@ class TurtleSimulator:
             color = self.pen_color
 
         # 점을 작은 원으로 표현
-        self.lines.append({
-            'x': [self.x],
-            'y': [self.y],
-            'color': color,
-            'marker': 'o',
-            'markersize': size
-        })
+        self.flush()
+        self.segments.add_dot(self._x, self._y, color, size)
         if self.record_frames:
             self._save_frame()
+        else:
+            self._check_budget()
 
     def speed(self, speed: int = None):
         """속도 설정 (시뮬레이션에서는 무시)"""
@@ -409,173 +852,1202 @@ class TurtleSimulator:
         pass
 
 
-def render_frame(frame_data, width: int, height: int, turtle_pos: Tuple[float, float, float] = None) -> str:
+def load_turtle_sprite() -> Optional[Image.Image]:
+    """거북이 PNG를 렌더링 크기로 축소하여 로드 (실패 시 None)"""
+    try:
+        img = Image.open(TURTLE_IMAGE_PATH).convert('RGBA')
+    except Exception:
+        return None
+    return img.resize((TURTLE_SPRITE_SIZE, TURTLE_SPRITE_SIZE), Image.LANCZOS)
+
+
+def _fallback_sprite() -> Image.Image:
+    """거북이 이미지가 없을 때 사용할 위쪽(북쪽)을 가리키는 초록 삼각형"""
+    sprite = Image.new('RGBA', (TURTLE_SPRITE_SIZE, TURTLE_SPRITE_SIZE), (0, 0, 0, 0))
+    center = size = TURTLE_SPRITE_SIZE / 2
+    rad = np.radians(90)
+    points = [(center + size * np.cos(rad + offset), center - size * np.sin(rad + offset))
+              for offset in (0, 2.5, -2.5)]
+    ImageDraw.Draw(sprite).polygon(points, fill='green')
+    return sprite
+
+
+class SpriteAtlas:
+    """
+    미리 회전해 둔 거북이 이미지 모음
+
+    프레임마다 이미지를 회전하지 않고 SPRITE_ANGLE_STEP 단위로 미리 회전한 이미지 중
+    가장 가까운 각도의 이미지를 붙여 넣는다.
+
+    Args:
+        sprite: 위쪽(북쪽)을 바라보는 RGBA 이미지
+        step: 회전 각도 단위 (도)
+    """
+
+    def __init__(self, sprite: Image.Image, step: int = SPRITE_ANGLE_STEP):
+        self.sprite = sprite
+        self.step = step
+        self.rotations: List[Tuple[Image.Image, int, int]] = []
+        for bucket in range(360 // step):
+            # angle은 북쪽이 90도이므로, 이미지는 위쪽을 향하도록 회전
+            rotated = sprite.rotate(90 - bucket * step, expand=True, resample=Image.BICUBIC)
+            self.rotations.append((rotated, rotated.width // 2, rotated.height // 2))
+
+    def get(self, angle: float) -> Tuple[Image.Image, int, int]:
+        """angle에 가장 가까운 (회전된 이미지, 중심 x 오프셋, 중심 y 오프셋)"""
+        return self.rotations[int(round(angle / self.step)) % len(self.rotations)]
+
+
+@lru_cache(maxsize=1)
+def get_sprite_atlas() -> SpriteAtlas:
+    """프로세스당 한 번만 거북이 이미지를 로드하고 회전 이미지를 계산"""
+    sprite = load_turtle_sprite()
+    return SpriteAtlas(sprite if sprite is not None else _fallback_sprite())
+
+
+def paste_turtle(image: Image.Image, turtle_pos: Tuple[float, float, float], width: int, height: int):
+    """
+    캔버스 이미지 위에 거북이를 합성
+
+    Args:
+        image: 거북이를 그릴 RGB 이미지 (제자리에서 수정)
+        turtle_pos: 거북이 위치 (x, y, angle)
+        width: 캔버스 너비
+        height: 캔버스 높이
+    """
+    x, y, angle = turtle_pos
+    rotated, dx, dy = get_sprite_atlas().get(angle)
+    # 거북이 좌표(원점 중심, y축 위쪽)를 픽셀 좌표로 변환
+    px = x + width / 2
+    py = height / 2 - y
+    image.paste(rotated, (int(round(px)) - dx, int(round(py)) - dy), rotated)
+
+
+def png_bytes(image: Image.Image) -> bytes:
+    """PIL 이미지를 PNG 바이트로 인코딩"""
+    img_byte_arr = io.BytesIO()
+    image.save(img_byte_arr, format='PNG')
+    return img_byte_arr.getvalue()
+
+
+def image_bytes(image: Image.Image, format: str) -> bytes:
+    """PIL 이미지를 PNG 또는 무손실 WebP 바이트로 인코딩"""
+    if format == 'png':
+        return png_bytes(image)
+    img_byte_arr = io.BytesIO()
+    image.save(img_byte_arr, format='WEBP', lossless=True)
+    return img_byte_arr.getvalue()
+
+
+def to_data_uri(data: bytes, mime_type: str) -> str:
+    """바이트를 base64 data URI로 변환"""
+    return f'data:{mime_type};base64,' + base64.b64encode(data).decode('utf-8')
+
+
+def encode_png(image: Image.Image) -> str:
+    """PIL 이미지를 PNG data URI로 인코딩"""
+    return to_data_uri(png_bytes(image), 'image/png')
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    """PNG 청크 바이트 생성 (길이 + 태그 + 데이터 + CRC)"""
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+
+def _iter_png_chunks(png: bytes):
+    """PNG 바이트에서 (태그, 데이터) 청크를 순서대로 반환"""
+    pos = 8  # PNG 시그니처 건너뛰기
+    while pos < len(png):
+        length, = struct.unpack('>I', png[pos:pos + 4])
+        yield png[pos + 4:pos + 8], png[pos + 8:pos + 8 + length]
+        pos += length + 12
+
+
+def write_apng(images, fp, duration_ms: int = FRAME_DURATION_MS):
+    """
+    프레임 이미지들을 APNG로 기록
+
+    Pillow의 APNG 저장은 모든 프레임을 메모리에 보관하므로, 이전 프레임과
+    달라진 영역만 잘라서 바로 압축하는 방식으로 직접 기록한다. 메모리에는
+    직전 프레임 한 장과 압축된 청크만 남는다. 변화가 없는 프레임은 앞 프레임의
+    표시 시간에 더한다.
+
+    Args:
+        images: RGB PIL 이미지 iterable (한 번만 순회)
+        fp: 바이트를 기록할 파일 객체
+        duration_ms: 프레임 간격
+    """
+    frames = []  # [fcTL 필드 리스트, 이미지 데이터 청크 리스트]
+    previous = None
+    ihdr = None
+    for image in images:
+        if previous is None:
+            x, y, region = 0, 0, image
+        else:
+            bbox = ImageChops.difference(previous, image).getbbox()
+            if bbox is None:
+                frames[-1][0][5] += duration_ms  # 같은 프레임은 표시 시간만 늘림
+                continue
+            x, y = bbox[0], bbox[1]
+            region = image.crop(bbox)
+        previous = image
+
+        buffer = io.BytesIO()
+        region.save(buffer, format='PNG')
+        data = []
+        for tag, chunk in _iter_png_chunks(buffer.getvalue()):
+            if tag == b'IHDR' and ihdr is None:
+                ihdr = chunk
+            elif tag == b'IDAT':
+                data.append(chunk)
+        # width, height, x_offset, y_offset, delay_num(ms 단위로 누적), delay_den
+        frames.append([[region.width, region.height, x, y, 0, duration_ms], data])
+
+    if ihdr is None:
+        raise ValueError("애니메이션 프레임이 없습니다")
+
+    fp.write(b'\x89PNG\r\n\x1a\n')
+    fp.write(_png_chunk(b'IHDR', ihdr))
+    fp.write(_png_chunk(b'acTL', struct.pack('>II', len(frames), 1)))  # 한 번만 재생
+    sequence = 0
+    for index, ((width, height, x, y, _, delay), data) in enumerate(frames):
+        # dispose_op=0 (NONE), blend_op=0 (SOURCE): 잘라낸 영역만 덮어씀
+        fp.write(_png_chunk(b'fcTL', struct.pack('>IIIIIHHBB', sequence, width, height, x, y,
+                                                 delay, 1000, 0, 0)))
+        sequence += 1
+        for chunk in data:
+            if index == 0:
+                fp.write(_png_chunk(b'IDAT', chunk))
+            else:
+                fp.write(_png_chunk(b'fdAT', struct.pack('>I', sequence) + chunk))
+                sequence += 1
+    fp.write(_png_chunk(b'IEND', b''))
+
+
+def gif_palette(segments: SegmentLog, filled_shapes: List[dict]) -> Image.Image:
+    """
+    GIF 프레임이 함께 쓰는 팔레트 (quantize(palette=...)에 사용하는 P 모드 이미지, 최대 255색)
+
+    프레임마다 팔레트를 새로 계산하면 느리고 프레임 사이에 색이 바뀌어 깜박이므로,
+    그려지는 색에서 한 번만 만든다. 우선순위: 흰색 배경과 펜/점 색, 채우기 색(FILL_ALPHA로 흰색과
+    섞인 색) → 거북이 이미지의 색 → 선과 채우기가 겹친 색 → 각 색과 흰색 사이의 단계(선 가장자리
+    안티앨리어싱). 색이 255개를 넘으면 median cut으로 줄인다. 마지막 한 칸은 투명 색으로 남겨 둔다.
+    """
+    def mix(color, over, alpha):
+        return tuple(int(round(c + (o - c) * alpha)) for c, o in zip(color, over))
+
+    white = (255, 255, 255)
+    pens = list(dict.fromkeys([(0, 0, 0)] + [color_to_rgb(color) for color in segments.colors]))
+    fills = list(dict.fromkeys(color_to_rgb(shape['color']) for shape in filled_shapes))
+    base = list(dict.fromkeys([white] + pens + [mix(white, fill, FILL_ALPHA) for fill in fills]))
+
+    if len(base) > 255:
+        strip = Image.fromarray(np.array(base, dtype=np.uint8).reshape(1, -1, 3))
+        return strip.quantize(colors=255, method=Image.Quantize.MEDIANCUT)
+
+    sprite = get_sprite_atlas().sprite
+    on_white = Image.alpha_composite(Image.new('RGBA', sprite.size, white + (255,)), sprite).convert('RGB')
+    sprite_palette = on_white.quantize(colors=16).getpalette()[:16 * 3]
+    candidates = base + [tuple(sprite_palette[i:i + 3]) for i in range(0, len(sprite_palette), 3)]
+    # 선 위에 채우기, 채우기 위에 선
+    candidates += [mix(pen, fill, FILL_ALPHA) for pen in pens for fill in fills]
+    for step in (0.5, 0.25, 0.75):
+        candidates += [mix(white, color, step) for color in base]
+        candidates += [mix(mix(white, fill, FILL_ALPHA), pen, step) for pen in pens for fill in fills]
+    # Pillow는 가까운 색을 RGB 5/6/5비트 구간 단위로 찾으므로, 구간마다 우선순위가 높은 색 하나만 남김
+    # (예: 흰색과 거북이 이미지의 흰색에 가까운 색이 같은 구간이면 배경이 흰색으로 유지되도록)
+    buckets = {}
+    for color in candidates:
+        buckets.setdefault((color[0] >> 3, color[1] >> 2, color[2] >> 3), color)
+    colors = list(buckets.values())[:255]
+
+    palette = Image.new('P', (1, 1))
+    palette.putpalette([channel for color in colors for channel in color])
+    return palette
+
+
+def _gif_delta_frames(images, palette: Image.Image):
+    """
+    공통 팔레트로 변환하고, 이전 프레임과 같은 픽셀은 투명 색(팔레트의 마지막 다음 칸)으로 바꾼 프레임
+
+    GIF 인코더의 optimize 옵션이 하는 것과 같은 처리(바뀌지 않은 픽셀을 투명하게 하여 압축률을 높임)를
+    NumPy 배열 비교로 한다. 첫 프레임은 그대로 둔다.
+
+    Yields:
+        P 모드 이미지 - 투명 색 인덱스는 len(palette 색)
+    """
+    colors = palette.getpalette()
+    transparent = len(colors) // 3
+    frame_palette = colors + [0, 0, 0]
+    previous = None
+    for image in images:
+        indexed = np.asarray(image.quantize(palette=palette, dither=Image.Dither.NONE))
+        frame = indexed if previous is None else np.where(indexed == previous, transparent, indexed).astype(np.uint8)
+        previous = indexed
+        frame_image = Image.fromarray(frame, mode='P')
+        frame_image.putpalette(frame_palette)
+        yield frame_image
+
+
+def animation_bytes(images, output: str, palette: Optional[Image.Image] = None) -> bytes:
+    """
+    프레임 이미지들을 하나의 애니메이션 이미지(APNG/WebP/GIF) 바이트로 인코딩
+
+    각 인코더는 이전 프레임과 달라진 영역만 저장하므로 프레임별 PNG 배열보다
+    훨씬 작다. 애니메이션은 한 번만 재생된다.
+
+    Args:
+        images: RGB PIL 이미지 iterable (제너레이터 가능 - 한 번만 순회)
+        output: 'apng', 'webp', 'gif' 중 하나
+        palette: gif의 모든 프레임에 쓸 팔레트 (gif_palette, None이면 프레임마다 계산 - 느림)
+    """
+    img_byte_arr = io.BytesIO()
+    if output == 'apng':
+        write_apng(images, img_byte_arr)
+    else:
+        images = iter(images)
+        if output == 'gif':
+            # 프레임을 미리 팔레트로 변환하여 인코더가 보관하는 메모리를 줄임 (gif는 loop를 생략해야 한 번만 재생)
+            if palette is not None:
+                # 공통 팔레트에서 가장 가까운 색으로 변환 (디더링 없음 - 프레임 사이 깜박임 없음)
+                # 바뀌지 않은 픽셀은 이미 투명하게 했으므로 인코더의 느린 optimize는 끔
+                images = _gif_delta_frames(images, palette)
+                options = {'transparency': len(palette.getpalette()) // 3, 'disposal': 1, 'optimize': False}
+            else:
+                images = (image.quantize(colors=256) for image in images)
+                options = {}
+        else:
+            options = {'lossless': True, 'loop': 1}
+        first = next(images)
+        first.save(img_byte_arr, format=output.upper(), save_all=True, append_images=images,
+                   duration=FRAME_DURATION_MS, **options)
+    return img_byte_arr.getvalue()
+
+
+def encode_animation(images, output: str) -> str:
+    """프레임 이미지들을 하나의 애니메이션 이미지 data URI로 인코딩 (animation_bytes 참고)"""
+    return to_data_uri(animation_bytes(images, output), ANIMATION_FORMATS[output])
+
+
+def iter_polylines(columns: Dict[str, np.ndarray]):
+    """
+    선분 열 배열을 이어진 폴리라인 단위로 묶어서 순서대로 반환
+
+    앞 선분의 끝점에서 시작하고 색상과 두께가 같은 선분들을 하나로 묶는다.
+    점은 항상 단독 항목이 된다.
+
+    Yields:
+        (kind, color_index, width, xs, ys) - xs/ys는 꼭짓점 좌표 배열
+    """
+    count = len(columns['kind'])
+    if count == 0:
+        return
+    kind = columns['kind']
+    # 이전 선분과 이어지지 않는 위치를 벡터 연산으로 찾기
+    breaks = np.ones(count, dtype=bool)
+    breaks[1:] = ((kind[1:] != SegmentLog.KIND_LINE)
+                  | (kind[:-1] != SegmentLog.KIND_LINE)
+                  | (columns['color'][1:] != columns['color'][:-1])
+                  | (columns['width'][1:] != columns['width'][:-1])
+                  | (columns['x0'][1:] != columns['x1'][:-1])
+                  | (columns['y0'][1:] != columns['y1'][:-1]))
+    starts = np.flatnonzero(breaks)
+    stops = np.append(starts[1:], count)
+    for start, stop in zip(starts, stops):
+        if kind[start] == SegmentLog.KIND_DOT:
+            yield (SegmentLog.KIND_DOT, int(columns['color'][start]), float(columns['width'][start]),
+                   columns['x0'][start:start + 1], columns['y0'][start:start + 1])
+        else:
+            xs = np.concatenate((columns['x0'][start:start + 1], columns['x1'][start:stop]))
+            ys = np.concatenate((columns['y0'][start:start + 1], columns['y1'][start:stop]))
+            yield (SegmentLog.KIND_LINE, int(columns['color'][start]), float(columns['width'][start]), xs, ys)
+
+
+def nonzero_fill_mask(xs: np.ndarray, ys: np.ndarray, width: int, height: int):
+    """
+    다각형 내부를 nonzero winding 규칙으로 계산한 마스크 반환
+
+    자기 교차하는 도형(별 등)도 matplotlib과 같이 안쪽이 채워지도록
+    모든 (행, 변) 교차점을 한 번에 계산하는 스캔라인 방식으로 구현한다.
+
+    Args:
+        xs, ys: 픽셀 좌표의 꼭짓점 배열
+        width, height: 캔버스 크기
+
+    Returns:
+        (left, top, mask) - mask는 bool 배열, 캔버스에 보이는 부분이 없으면 None
+    """
+    x0, y0 = xs, ys
+    x1, y1 = np.roll(xs, -1), np.roll(ys, -1)
+    edges = np.flatnonzero(y0 != y1)  # 수평인 변은 교차점이 없음
+    x0, y0, x1, y1 = x0[edges], y0[edges], x1[edges], y1[edges]
+
+    # 각 변이 가로지르는 픽셀 행(중심 기준) 범위
+    row_start = np.clip(np.ceil(np.minimum(y0, y1) - 0.5), 0, height).astype(np.int64)
+    row_stop = np.clip(np.ceil(np.maximum(y0, y1) - 0.5), 0, height).astype(np.int64)
+    counts = row_stop - row_start
+    total = int(counts.sum())
+    if total == 0:
+        return None
+
+    # 모든 교차점 (행, x, 방향) 생성
+    edge_index = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    rows = row_start[edge_index] + offsets
+    t = (rows + 0.5 - y0[edge_index]) / (y1[edge_index] - y0[edge_index])
+    xc = x0[edge_index] + t * (x1[edge_index] - x0[edge_index])
+    direction = np.where(y1[edge_index] > y0[edge_index], 1, -1)
+
+    order = np.lexsort((xc, rows))
+    rows, xc, direction = rows[order], xc[order], direction[order]
+
+    # 닫힌 도형은 행마다 방향의 합이 0이므로 전체 누적합이 곧 행 안의 winding 값
+    winding = np.cumsum(direction)[:-1]
+    inside = np.flatnonzero(winding != 0)
+    if len(inside) == 0:
+        return None
+    span_rows = rows[inside]
+    span_start = np.clip(np.ceil(xc[inside] - 0.5), 0, width).astype(np.int64)
+    span_stop = np.clip(np.ceil(xc[inside + 1] - 0.5), 0, width).astype(np.int64)
+
+    # 경계 상자 안에서만 마스크 계산
+    top, bottom = int(span_rows.min()), int(span_rows.max()) + 1
+    left, right = int(span_start.min()), int(span_stop.max())
+    if right <= left:
+        return None
+    diff = np.zeros((bottom - top, right - left + 1), dtype=np.int32)
+    np.add.at(diff, (span_rows - top, span_start - left), 1)
+    np.add.at(diff, (span_rows - top, span_stop - left), -1)
+    mask = np.cumsum(diff[:, :-1], axis=1) > 0
+    return left, top, mask
+
+
+def color_to_rgb(color) -> Tuple[int, int, int]:
+    """turtle 색상 값(이름, 16진수, 튜플, 리스트)을 0~255 RGB 튜플로 변환"""
+    if isinstance(color, list):
+        color = tuple(color)  # 캐시 키로 쓸 수 있도록 변환
+    try:
+        return _color_to_rgb(color)
+    except TypeError:  # 해시할 수 없는 값
+        return (0, 0, 0)
+
+
+@lru_cache(maxsize=256)
+def _color_to_rgb(color) -> Tuple[int, int, int]:
+    if isinstance(color, tuple) and any(c > 1 for c in color):
+        color = tuple(c / 255 for c in color)  # colormode(255) 형식
+    try:
+        r, g, b = to_rgb(color)
+    except (ValueError, TypeError):
+        return (0, 0, 0)
+    return (int(round(r * 255)), int(round(g * 255)), int(round(b * 255)))
+
+
+class CanvasRenderer:
+    """
+    렌더러 백엔드 인터페이스
+
+    채워진 도형과 선분을 누적 캔버스에 그리고, 현재 캔버스의 복사본을 PIL 이미지로
+    돌려준다. 채워진 도형은 선분 아래 층에 그려지므로, 그리는 순서와 관계없이
+    도형 → 선분 순서로 겹친다 (선분을 다시 그리지 않아도 됨). 인스턴스는 한 번의
+    렌더링 작업에서만 사용하며 전역 상태를 공유하지 않는다.
+    """
+
+    name = ''
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+    def draw_fill(self, points: List[Tuple[float, float]], color):
+        """채워진 도형 그리기 (이미 그린 선분 아래에 깔림)"""
+        raise NotImplementedError
+
+    def draw_fills(self, fills: List[Tuple[List[Tuple[float, float]], object]]):
+        """(points, color) 목록의 채워진 도형을 순서대로 그리기"""
+        for points, color in fills:
+            self.draw_fill(points, color)
+
+    def draw_segments(self, segments: SegmentLog, start: int, stop: int):
+        """[start, stop) 구간의 선분과 점 그리기"""
+        raise NotImplementedError
+
+    def to_image(self) -> Image.Image:
+        """현재 캔버스의 RGB 복사본 반환"""
+        raise NotImplementedError
+
+    def close(self):
+        """자원 해제"""
+        pass
+
+
+class MatplotlibRenderer(CanvasRenderer):
+    """
+    matplotlib Agg 캔버스를 사용하는 기준(reference) 렌더러
+
+    채워진 도형은 흰 배경 캔버스에, 선분과 점은 투명 배경 캔버스에 그리고
+    to_image에서 두 층을 한 번 합성한다.
+    """
+
+    name = 'matplotlib'
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        self.fill_layer = self._create_layer('white')
+        self.line_layer = self._create_layer('none')
+
+    def _create_layer(self, facecolor):
+        """
+        (Figure, Axes) 층 생성 - pyplot 전역 상태를 쓰지 않고 Figure를 직접 생성
+
+        빈 배경을 먼저 그리고, 이후 그리기는 이 캔버스 버퍼에 누적한다.
+        """
+        fig = Figure(figsize=(self.width/100, self.height/100), dpi=100, facecolor=facecolor)
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_aspect('equal')
+        ax.set_xlim(-self.width/2, self.width/2)
+        ax.set_ylim(-self.height/2, self.height/2)
+        ax.axis('off')
+        fig.canvas.draw()
+        return fig, ax
+
+    def _draw_artist(self, artist, layer, data_transform: bool = True):
+        """아티스트를 Axes에 붙이지 않고 층의 캔버스 버퍼에 바로 그림"""
+        fig, ax = layer
+        artist.set_figure(fig)
+        artist.axes = ax
+        if data_transform:
+            artist.set_transform(ax.transData)
+        artist.set_clip_path(ax.patch)
+        ax.draw_artist(artist)
+
+    @staticmethod
+    def _rgb(color) -> Tuple[float, float, float]:
+        r, g, b = color_to_rgb(color)
+        return (r / 255, g / 255, b / 255)
+
+    def draw_fill(self, points, color):
+        self.draw_fills([(points, color)])
+
+    def draw_fills(self, fills):
+        if not fills:
+            return
+        colors = [self._rgb(color) for _, color in fills]
+        self._draw_artist(PolyCollection([np.asarray(points, dtype=float) for points, _ in fills],
+                                         facecolors=colors, edgecolors=colors, linewidths=1.0,
+                                         alpha=FILL_ALPHA), self.fill_layer)
+
+    def draw_segments(self, segments, start, stop):
+        if stop <= start:
+            return
+        colors = segments.colors
+        # 연속된 같은 스타일의 폴리라인(또는 연속된 점)을 하나의 컬렉션으로 묶어 그리는 순서 유지
+        groups = []  # [(key, items)] - 선: key=(색상, 두께), 점: key=None
+        for kind, color_index, size, xs, ys in iter_polylines(segments.as_arrays(start, stop)):
+            if kind == SegmentLog.KIND_DOT:
+                key, item = None, (color_index, size, xs[0], ys[0])
+            else:
+                key, item = (color_index, size), np.column_stack((xs, ys))
+            if groups and groups[-1][0] == key:
+                groups[-1][1].append(item)
+            else:
+                groups.append((key, [item]))
+
+        for key, items in groups:
+            if key is None:
+                self._draw_dots(colors, items)
+            else:
+                color_index, size = key
+                self._draw_artist(LineCollection(items, colors=[self._rgb(colors[color_index])],
+                                                 linewidths=size * LINE_WIDTH,
+                                                 capstyle='round', joinstyle='round'), self.line_layer)
+
+    def _draw_dots(self, colors, dots):
+        """(색상 인덱스, 지름(포인트), x, y) 목록의 점을 하나의 컬렉션으로 그리기"""
+        marker = MarkerStyle('o')
+        path = marker.get_path().transformed(marker.get_transform())
+        sizes = np.array([size for _, size, _, _ in dots], dtype=float)
+        collection = PathCollection(
+            (path,), sizes=sizes ** 2,  # 면적(포인트^2)
+            offsets=np.array([(x, y) for _, _, x, y in dots], dtype=float),
+            offset_transform=self.line_layer[1].transData,
+            facecolors=[self._rgb(colors[color_index]) for color_index, _, _, _ in dots],
+            linewidths=0
+        )
+        self._draw_artist(collection, self.line_layer, data_transform=False)
+
+    def to_image(self):
+        image = Image.fromarray(np.asarray(self.fill_layer[0].canvas.buffer_rgba()))
+        image.alpha_composite(Image.fromarray(np.asarray(self.line_layer[0].canvas.buffer_rgba())))
+        return image.convert('RGB')
+
+    def close(self):
+        self.fill_layer[0].clear()
+        self.line_layer[0].clear()
+
+
+class RasterRenderer(CanvasRenderer):
+    """
+    Pillow 버퍼에 직접 그리는 경량 렌더러
+
+    SUPERSAMPLE배 크기의 캔버스에 그린 뒤 축소하여 안티앨리어싱을 적용한다.
+    선분과 점은 불투명하게 그리면서 그린 픽셀을 선 마스크에도 표시하고, 채워진 도형은
+    선 마스크에 표시되지 않은 픽셀만 칠하여 이미 그린 선분 아래에 깔리게 한다.
+    선 두께와 점 크기는 matplotlib 렌더러와 같은 포인트 단위를 사용한다.
+    """
+
+    name = 'raster'
+    SUPERSAMPLE = 2
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        scale = self.SUPERSAMPLE
+        self.scale = scale
+        self.canvas = Image.new('RGB', (width * scale, height * scale), 'white')
+        self.draw = ImageDraw.Draw(self.canvas)
+        self.line_mask = Image.new('L', self.canvas.size, 0)  # 선분/점이 그려진 픽셀 (255)
+        self.mask_draw = ImageDraw.Draw(self.line_mask)
+        self.points_to_pixels = 100 / 72 * scale  # matplotlib(dpi=100)과 같은 크기
+
+    def _to_pixels(self, xs: np.ndarray, ys: np.ndarray) -> List[Tuple[float, float]]:
+        """거북이 좌표 배열을 캔버스 픽셀 좌표 목록으로 변환"""
+        px = (np.asarray(xs) + self.width / 2) * self.scale
+        py = (self.height / 2 - np.asarray(ys)) * self.scale
+        return list(zip(px.tolist(), py.tolist()))
+
+    def draw_fill(self, points, color):
+        points = np.asarray(points, dtype=float)
+        px = (points[:, 0] + self.width / 2) * self.scale
+        py = (self.height / 2 - points[:, 1]) * self.scale
+        result = nonzero_fill_mask(px, py, *self.canvas.size)
+        if result is None:
+            return
+        left, top, mask = result
+        alpha = mask.astype(np.uint8) * int(FILL_ALPHA * 255)
+        # 이미 그린 선분 아래에 깔리도록 선 마스크의 픽셀은 칠하지 않음
+        bbox = (left, top, left + alpha.shape[1], top + alpha.shape[0])
+        alpha[np.asarray(self.line_mask.crop(bbox)) > 0] = 0
+        alpha = Image.fromarray(alpha)
+        self.canvas.paste(color_to_rgb(color), (left, top, left + alpha.width, top + alpha.height), alpha)
+
+    def draw_segments(self, segments, start, stop):
+        if stop <= start:
+            return
+        colors = segments.colors
+        for kind, color_index, size, xs, ys in iter_polylines(segments.as_arrays(start, stop)):
+            rgb = color_to_rgb(colors[color_index])
+            points = self._to_pixels(xs, ys)
+            for draw, fill in ((self.draw, rgb), (self.mask_draw, 255)):
+                if kind == SegmentLog.KIND_DOT:
+                    self._draw_dot(draw, points[0], size, fill)
+                else:
+                    self._draw_polyline(draw, points, size, fill)
+
+    def _draw_dot(self, draw: ImageDraw.ImageDraw, point: Tuple[float, float], size: float, fill):
+        x, y = point
+        radius = size * self.points_to_pixels / 2
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=fill)
+
+    def _draw_polyline(self, draw: ImageDraw.ImageDraw, points: List[Tuple[float, float]], size: float, fill):
+        line_width = max(1, int(round(size * LINE_WIDTH * self.points_to_pixels)))
+        cap_radius = line_width / 2
+        draw.line(points, fill=fill, width=line_width, joint='curve')
+        if cap_radius > 1:
+            # 선 끝을 둥글게 처리
+            for x, y in (points[0], points[-1]):
+                draw.ellipse((x - cap_radius, y - cap_radius, x + cap_radius, y + cap_radius), fill=fill)
+
+    def to_image(self):
+        if self.scale == 1:
+            return self.canvas.copy()
+        return self.canvas.reduce(self.scale)
+
+
+RENDERERS = {
+    MatplotlibRenderer.name: MatplotlibRenderer,
+    RasterRenderer.name: RasterRenderer,
+}
+# 기본값은 기존 출력과 같은 matplotlib - raster는 안티에일리어싱/선 끝 처리가 조금 다름
+DEFAULT_RENDERER = os.getenv('TURTLE_RENDERER', MatplotlibRenderer.name)
+
+
+def create_renderer(name: str, width: int, height: int) -> CanvasRenderer:
+    """
+    이름으로 렌더러 백엔드 생성
+
+    Args:
+        name: 'matplotlib' 또는 'raster' (None이면 TURTLE_RENDERER 환경 변수 또는 'matplotlib')
+        width: 캔버스 너비
+        height: 캔버스 높이
+    """
+    name = name or DEFAULT_RENDERER
+    if name not in RENDERERS:
+        raise ValueError(f"지원하지 않는 렌더러입니다: {name} (가능: {', '.join(RENDERERS)})")
+    return RENDERERS[name](width, height)
+
+
+class AnimationRenderer:
+    """
+    애니메이션 프레임을 하나의 캔버스에 누적하여 렌더링
+
+    렌더러 백엔드를 한 번만 만들고, 각 프레임에서는 이전 프레임 이후 새로 추가된
+    선분과 채워진 도형만 캔버스에 그린다. 거북이는 캔버스의 복사본에 합성하므로
+    캔버스에는 남지 않는다. 전체 렌더링 비용은 선분 수에 비례한다.
+    """
+
+    def __init__(self, segments: SegmentLog, filled_shapes: List[dict], width: int, height: int,
+                 renderer: str = None):
+        self.segments = segments
+        self.filled_shapes = filled_shapes
+        self.width = width
+        self.height = height
+        self.backend = create_renderer(renderer, width, height)
+        self.segment_end = 0  # 캔버스에 이미 그려진 선분 개수
+        self.fill_end = 0  # 캔버스에 이미 그려진 채워진 도형 개수
+
+    def render_image(self, frame: Frame) -> Image.Image:
+        """프레임을 렌더링하여 PIL 이미지로 반환"""
+        # 새로 추가된 채워진 도형 (백엔드가 이미 그린 선분 아래에 깔아 줌)
+        self.backend.draw_fills([(shape['points'], shape['color'])
+                                 for shape in self.filled_shapes[self.fill_end:frame.fill_end]])
+        self.fill_end = max(self.fill_end, frame.fill_end)
+
+        # 새로 추가된 선분만 그리기
+        self.backend.draw_segments(self.segments, self.segment_end, frame.segment_end)
+        self.segment_end = max(self.segment_end, frame.segment_end)
+
+        # 캔버스 복사본에 거북이 합성
+        image = self.backend.to_image()
+        paste_turtle(image, (frame.x, frame.y, frame.angle), self.width, self.height)
+        return image
+
+    def render(self, frame: Frame) -> str:
+        """프레임을 렌더링하여 PNG data URI로 반환"""
+        return encode_png(self.render_image(frame))
+
+    def close(self):
+        """렌더러 자원 해제"""
+        self.backend.close()
+
+
+def render_image(segments: SegmentLog, filled_shapes: List[dict], width: int, height: int,
+                 turtle_pos: Tuple[float, float, float] = None,
+                 segment_end: int = None, fill_end: int = None, renderer: str = None) -> Image.Image:
+    """render_frame과 같지만 인코딩하지 않은 PIL 이미지를 반환"""
+    backend = create_renderer(renderer, width, height)
+    try:
+        # 채워진 도형 먼저 그리기 (배경)
+        backend.draw_fills([(shape['points'], shape['color'])
+                            for shape in filled_shapes[:fill_end] if len(shape['points']) > 2])
+
+        # 모든 선 그리기
+        backend.draw_segments(segments, 0, len(segments) if segment_end is None else segment_end)
+        image = backend.to_image()
+    finally:
+        backend.close()
+
+    # 거북이 그리기 (PNG 이미지 사용)
+    if turtle_pos is not None:
+        paste_turtle(image, turtle_pos, width, height)
+    return image
+
+
+def render_frame(segments: SegmentLog, filled_shapes: List[dict], width: int, height: int,
+                 turtle_pos: Tuple[float, float, float] = None,
+                 segment_end: int = None, fill_end: int = None, renderer: str = None) -> str:
     """
     프레임을 이미지로 렌더링
 
     Args:
-        frame_data: dict with 'lines' and 'filled_shapes' or just a list of lines (legacy)
+        segments: 선분/점 로그
+        filled_shapes: 채워진 도형 목록
         width: 캔버스 너비
         height: 캔버스 높이
         turtle_pos: 거북이 위치 (x, y, angle) - None이면 거북이를 그리지 않음
+        segment_end: 그릴 선분 개수 (None이면 전체)
+        fill_end: 그릴 채워진 도형 개수 (None이면 전체)
+        renderer: 렌더러 백엔드 이름 (None이면 기본 렌더러)
     """
-    fig, ax = plt.subplots(figsize=(width/100, height/100), dpi=100)
-    ax.set_aspect('equal')
-    ax.set_xlim(-width/2, width/2)
-    ax.set_ylim(-height/2, height/2)
-    ax.axis('off')
+    return encode_png(render_image(segments, filled_shapes, width, height, turtle_pos,
+                                   segment_end, fill_end, renderer))
 
-    # frame_data가 dict인지 list인지 확인 (하위 호환성)
-    if isinstance(frame_data, dict):
-        lines = frame_data.get('lines', [])
-        filled_shapes = frame_data.get('filled_shapes', [])
-    else:
-        lines = frame_data
-        filled_shapes = []
+
+def _svg_coords(xs: np.ndarray, ys: np.ndarray) -> str:
+    """좌표 배열을 SVG 좌표 문자열로 변환 (소수점 둘째 자리, y축 반전)"""
+    xs = np.round(np.asarray(xs, dtype=float), 2) + 0.0  # -0.0 제거
+    ys = np.round(-np.asarray(ys, dtype=float), 2) + 0.0
+    return ' '.join(f'{x:g},{y:g}' for x, y in zip(xs.tolist(), ys.tolist()))
+
+
+def _svg_color(color) -> str:
+    """turtle 색상을 SVG 색상 문자열(#rrggbb)로 변환"""
+    return '#%02x%02x%02x' % color_to_rgb(color)
+
+
+@lru_cache(maxsize=1)
+def _turtle_sprite_data_uri() -> str:
+    """SVG에 포함할 거북이 이미지 data URI (한 번만 인코딩)"""
+    img_byte_arr = io.BytesIO()
+    get_sprite_atlas().sprite.save(img_byte_arr, format='PNG', optimize=True)
+    return 'data:image/png;base64,' + base64.b64encode(img_byte_arr.getvalue()).decode('utf-8')
+
+
+def render_svg(segments: SegmentLog, filled_shapes: List[dict], width: int, height: int,
+               turtle_pos: Tuple[float, float, float] = None) -> str:
+    """
+    세그먼트 로그를 SVG 문서로 직렬화 (렌더러를 거치지 않음)
+
+    이어진 같은 색상/두께의 선분은 하나의 polyline으로 합친다. 선 두께와 점 크기는
+    래스터 렌더러와 같은 픽셀 크기를 사용한다.
+
+    Args:
+        segments: 선분/점 로그
+        filled_shapes: 채워진 도형 목록
+        width: 캔버스 너비
+        height: 캔버스 높이
+        turtle_pos: 거북이 위치 (x, y, angle) - None이면 거북이를 그리지 않음
+
+    Returns:
+        str: SVG 문서 문자열
+    """
+    points_to_pixels = 100 / 72
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="{-width / 2:g} {-height / 2:g} {width} {height}">',
+        f'<rect x="{-width / 2:g}" y="{-height / 2:g}" width="{width}" height="{height}" fill="#ffffff"/>',
+    ]
 
     # 채워진 도형 먼저 그리기 (배경)
     for shape in filled_shapes:
-        points = shape['points']
+        points = np.asarray(shape['points'], dtype=float)
         if len(points) > 2:
-            xs = [p[0] for p in points]
-            ys = [p[1] for p in points]
-            ax.fill(xs, ys, color=shape['color'], alpha=0.7)
-
-    # 모든 선 그리기
-    for line in lines:
-        if 'marker' in line:
-            # 점 그리기
-            ax.plot(line['x'], line['y'], color=line['color'],
-                   marker=line['marker'], markersize=line.get('markersize', 10))
+            parts.append(f'<polygon points="{_svg_coords(points[:, 0], points[:, 1])}" '
+                         f'fill="{_svg_color(shape["color"])}" fill-opacity="{FILL_ALPHA:g}"/>')
+
+    # 선과 점 그리기
+    line_width = LINE_WIDTH * points_to_pixels
+    parts.append(f'<g fill="none" stroke-width="{line_width:.2f}" '
+                 f'stroke-linecap="round" stroke-linejoin="round">')
+    colors = segments.colors
+    for kind, color_index, size, xs, ys in iter_polylines(segments.as_arrays()):
+        color = _svg_color(colors[color_index])
+        if kind == SegmentLog.KIND_DOT:
+            parts.append(f'<circle cx="{xs[0]:.2f}" cy="{-ys[0]:.2f}" '
+                         f'r="{size * points_to_pixels / 2:.2f}" fill="{color}"/>')
+        elif size != 1:
+            parts.append(f'<polyline points="{_svg_coords(xs, ys)}" stroke="{color}" '
+                         f'stroke-width="{size * line_width:.2f}"/>')
         else:
-            # 선 그리기
-            ax.plot(line['x'], line['y'], color=line['color'], linewidth=2)
+            parts.append(f'<polyline points="{_svg_coords(xs, ys)}" stroke="{color}"/>')
+    parts.append('</g>')
 
-    # 거북이 그리기 (PNG 이미지 사용)
+    # 거북이 그리기
     if turtle_pos is not None:
         x, y, angle = turtle_pos
+        sprite_uri = _turtle_sprite_data_uri()
+        half = TURTLE_SPRITE_SIZE / 2
+        # SVG의 rotate는 화면 기준 시계 방향이므로 PIL 회전(90 - angle)과 부호가 반대
+        transform = f'rotate({angle - 90:.2f} {x:.2f} {-y:.2f})'
+        parts.append(f'<image href="{sprite_uri}" x="{x - half:.2f}" y="{-y - half:.2f}" '
+                     f'width="{TURTLE_SPRITE_SIZE}" height="{TURTLE_SPRITE_SIZE}" '
+                     f'transform="{transform}"/>')
 
-        # PNG 이미지 로드
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        turtle_img_path = os.path.join(script_dir, 'static', 'turtle.png')
+    parts.append('</svg>')
+    return ''.join(parts)
 
-        try:
-            # PNG 이미지 로드
-            img = Image.open(turtle_img_path)
 
-            # 이미지 회전 (거북이가 바라보는 방향)
-            # angle은 북쪽이 90도이므로, 이미지는 위쪽을 향하도록 회전
-            rotated_img = img.rotate(90 - angle, expand=True, resample=Image.BICUBIC)
+def encode_svg(svg: str) -> str:
+    """SVG 문서를 data URI로 인코딩"""
+    return to_data_uri(svg.encode('utf-8'), 'image/svg+xml')
 
-            # matplotlib에 이미지 추가
-            imagebox = OffsetImage(rotated_img, zoom=0.15)
-            ab = AnnotationBbox(imagebox, (x, y), frameon=False, pad=0)
-            ax.add_artist(ab)
-        except Exception as e:
-            # 이미지 로드 실패 시 이모지 사용
-            ax.text(x, y, '🐢', fontsize=40, ha='center', va='center',
-                    rotation=90-angle,
-                    rotation_mode='anchor')
 
-    # 이미지를 바이트로 변환
-    img_byte_arr = io.BytesIO()
-    plt.savefig(img_byte_arr, format='PNG', bbox_inches='tight',
-                facecolor='white', edgecolor='none')
-    plt.close(fig)
-    img_byte_arr.seek(0)
+def frame_budget(max_frames: int = None, target_duration: float = None) -> int:
+    """
+    요청한 프레임 수/재생 시간과 서버 최대 프레임 수 중 가장 작은 프레임 수
+    (렌더링 시에는 affordable_frames로 예상 비용에 맞게 한 번 더 줄임)
+
+    Args:
+        max_frames: 최대 프레임 수 (None이면 제한 없음)
+        target_duration: 목표 재생 시간 (초, FRAME_DURATION_MS 간격 기준, None이면 제한 없음)
+    """
+    budget = MAX_ANIMATION_FRAMES
+    if max_frames is not None:
+        if max_frames < 1:
+            raise ValueError("max_frames는 1 이상이어야 합니다")
+        budget = min(budget, max_frames)
+    if target_duration is not None:
+        if target_duration <= 0:
+            raise ValueError("target_duration은 0보다 커야 합니다")
+        budget = min(budget, max(1, int(target_duration * 1000 / FRAME_DURATION_MS)))
+    return budget
+
+
+def select_keyframes(frames: List[Frame], segments: SegmentLog, max_frames: int) -> List[Frame]:
+    """
+    그려진 경로 길이가 고르게 나뉘도록 최대 max_frames개의 키프레임 선택
+
+    프레임은 로그의 오프셋이므로 중간 프레임을 건너뛰어도 다음 키프레임에 그 사이의
+    선분이 모두 그려진다. 마지막 프레임은 항상 포함하여 최종 그림이 같도록 한다.
+    """
+    if len(frames) <= max_frames:
+        return frames
+    segment_ends = np.fromiter((frame.segment_end for frame in frames), dtype=np.int64, count=len(frames))
+    columns = segments.as_arrays(0, int(segment_ends.max()))
+    lengths = np.hypot(columns['x1'] - columns['x0'], columns['y1'] - columns['y0'])
+    progress = np.concatenate(([0.0], np.cumsum(lengths)))[segment_ends]
+
+    total = progress[-1]
+    if total > 0:
+        # 경로 길이를 max_frames 등분한 지점에 처음 도달하는 프레임
+        targets = np.linspace(0, total, max_frames + 1)[1:]
+        indices = np.searchsorted(progress, targets, side='left')
+    else:
+        # 점/채우기만 있는 경우 프레임 순서대로 고르게 선택
+        indices = np.linspace(0, len(frames) - 1, max_frames).round().astype(np.int64)
+    indices = np.minimum(indices, len(frames) - 1)
+    indices[-1] = len(frames) - 1
+    return [frames[i] for i in np.unique(indices).tolist()]
+
+
+def simulation_stats(t: TurtleSimulator, rendered_frames: int, width: int, height: int) -> Dict:
+    """
+    응답에 포함할 작업량과 예상 렌더링 비용
+
+    Returns:
+        dict: moves, segments, fill_points, frames(기록된 프레임), rendered_frames,
+              render_cost_ms(RENDER_COST_* 가중치로 계산한 대략적인 렌더링 시간)
+    """
+    usage = t.usage()
+    area_ratio = width * height / (600 * 600)
+    render_cost = (usage['segments'] * RENDER_COST_PER_SEGMENT
+                   + usage['fill_points'] * RENDER_COST_PER_FILL_POINT
+                   + rendered_frames * RENDER_COST_PER_FRAME * area_ratio)
+    return {**usage, 'rendered_frames': rendered_frames, 'render_cost_ms': round(render_cost, 1)}
+
 
-    # Base64 인코딩
-    img_base64 = base64.b64encode(img_byte_arr.getvalue()).decode('utf-8')
-    return f'data:image/png;base64,{img_base64}'
+def affordable_frames(t: TurtleSimulator, width: int, height: int, budget_ms: float = None) -> int:
+    """
+    예상 렌더링 비용(simulation_stats의 render_cost_ms)이 budget_ms를 넘지 않는 최대 프레임 수 (최소 1)
+
+    프레임 수 상한(MAX_ANIMATION_FRAMES)만으로는 큰 캔버스나 선이 많은 코드의 렌더링 시간이
+    실행 제한 시간을 넘을 수 있으므로, 시뮬레이션 결과로 비용을 추정하여 프레임 수를 더 줄인다.
+    """
+    budget_ms = RENDER_BUDGET_MS if budget_ms is None else budget_ms
+    usage = t.usage()
+    fixed = usage['segments'] * RENDER_COST_PER_SEGMENT + usage['fill_points'] * RENDER_COST_PER_FILL_POINT
+    per_frame = RENDER_COST_PER_FRAME * width * height / (600 * 600)
+    return max(1, int((budget_ms - fixed) // per_frame))
+
+
+# 사용자 turtle 코드에서 import 할 수 있는 모듈 (import turtle은 코드에서 제거됨)
+TURTLE_ALLOWED_MODULES = ('math', 'random')
 
+# 사용자 turtle 코드에서 사용할 수 있는 내장 함수 (파일/모듈/인터프리터 접근 없음)
+TURTLE_BUILTINS = {
+    name: getattr(builtins, name) for name in (
+        'abs', 'all', 'any', 'bool', 'chr', 'dict', 'divmod', 'enumerate', 'filter', 'float',
+        'int', 'isinstance', 'len', 'list', 'map', 'max', 'min', 'ord', 'pow', 'print', 'range',
+        'reversed', 'round', 'set', 'sorted', 'str', 'sum', 'tuple', 'zip',
+        'ArithmeticError', 'Exception', 'IndexError', 'KeyError', 'TypeError', 'ValueError',
+        'ZeroDivisionError',
+    )
+}
+
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """TURTLE_ALLOWED_MODULES만 import 허용"""
+    if level or name not in TURTLE_ALLOWED_MODULES:
+        raise ImportError(f"turtle 코드에서는 {name} 모듈을 사용할 수 없습니다 "
+                          f"(가능: {', '.join(TURTLE_ALLOWED_MODULES)})")
+    return importlib.import_module(name)
+
+
+def _check_user_code(code: str):
+    """
+    밑줄 두 개로 시작하는 속성 접근(__class__, __globals__ 등) 금지
 
-def run_turtle_code(code: str, width: int = 600, height: int = 600, animate: bool = False) -> dict:
+    허용한 모듈/내장 함수의 속성을 거쳐 다른 모듈이나 내장 함수에 접근하지 못하게 한다.
     """
-    Turtle 코드를 matplotlib로 시뮬레이션하여 결과 이미지를 Base64로 반환
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, ast.Attribute) and node.attr.startswith('__'):
+            raise ValueError(f"turtle 코드에서는 {node.attr} 속성을 사용할 수 없습니다")
+
+
+def simulate_turtle_code(code: str, animate: bool = False, timer: StageTimer = None) -> TurtleSimulator:
+    """
+    사용자 turtle 코드를 실행하여 시뮬레이터 상태를 반환
+
+    Args:
+        code: 실행할 Python turtle 코드
+        animate: True이면 애니메이션 프레임도 기록
+        timer: 단계별 시간을 기록할 StageTimer ('exec': 사용자 코드 실행,
+               'integrate': 마지막으로 남은 이동 명령의 좌표 계산)
+
+    Returns:
+        TurtleSimulator: 실행이 끝난 시뮬레이터 (사용자 코드의 예외는 그대로 전달)
+    """
+    # Turtle 시뮬레이터 생성
+    t = TurtleSimulator(record_frames=animate)
+
+    # 사용자 코드 실행 (t.done() 제거)
+    user_code = code.replace('t.done()', '').replace('turtle.done()', '')
+    user_code = user_code.replace('import turtle as t', '')
+    user_code = user_code.replace('import turtle', '')
+
+    # input() 함수를 기본값으로 대체하는 함수
+    def mock_input(prompt=''):
+        # 숫자를 요구하는 경우 기본값 반환
+        if '변의 수' in prompt or '수' in prompt:
+            return '6'
+        return '5'
+
+    # 전역 네임스페이스에 t 추가 (내장 함수와 import는 허용 목록만)
+    exec_globals = {
+        '__builtins__': {**TURTLE_BUILTINS, 'input': mock_input, '__import__': _restricted_import},
+        't': t,
+        '_': None  # for _ in range() 지원
+    }
+
+    # 코드 실행
+    timer = timer or StageTimer()
+    with timer.stage('exec'):
+        _check_user_code(user_code)
+        exec(user_code, exec_globals)
+    with timer.stage('integrate'):
+        t.flush()
+    return t
+
+
+def _finish_output(timer: StageTimer, data: bytes, mime_type: str, binary: bool):
+    """binary이면 바이트 그대로, 아니면 base64 data URI로 변환"""
+    if binary:
+        return data
+    with timer.stage('base64'):
+        return to_data_uri(data, mime_type)
+
+
+def render_final_image(t: TurtleSimulator, width: int, height: int, format: str, renderer: str,
+                       timer: StageTimer, binary: bool = False):
+    """시뮬레이션의 최종 결과를 거북이 위치와 함께 format 형식으로 렌더링하고 인코딩"""
+    final_turtle_pos = (t.x, t.y, t.angle) if t.is_visible else None
+    if format == 'svg':
+        # svg는 렌더링이 곧 직렬화
+        with timer.stage('render'):
+            svg = render_svg(t.segments, t.filled_shapes, width, height, final_turtle_pos)
+        return _finish_output(timer, svg.encode('utf-8'), IMAGE_FORMATS['svg'], binary)
+    with timer.stage('render'):
+        image = render_image(t.segments, t.filled_shapes, width, height, final_turtle_pos,
+                             renderer=renderer)
+    with timer.stage('encode'):
+        data = image_bytes(image, format)
+    return _finish_output(timer, data, IMAGE_FORMATS[format], binary)
+
+
+def render_keyframes(t: TurtleSimulator, keyframes: List[Frame], width: int, height: int,
+                     renderer: str, timer: StageTimer):
+    """키프레임을 하나의 캔버스에 누적하여 렌더링한 PIL 이미지를 하나씩 생성 (render 단계 시간 기록)"""
+    animation = AnimationRenderer(t.segments, t.filled_shapes, width, height, renderer)
+    try:
+        for frame in keyframes:
+            with timer.stage('render'):
+                image = animation.render_image(frame)
+            yield image
+    finally:
+        animation.close()
+
+
+def render_png_frames(t: TurtleSimulator, keyframes: List[Frame], width: int, height: int,
+                      renderer: str, timer: StageTimer, binary: bool = False):
+    """render_keyframes의 이미지를 PNG로 인코딩하여 data URI(binary이면 바이트)로 하나씩 생성"""
+    images = render_keyframes(t, keyframes, width, height, renderer, timer)
+    try:
+        for image in images:
+            with timer.stage('encode'):
+                data = png_bytes(image)
+            yield _finish_output(timer, data, 'image/png', binary)
+    finally:
+        images.close()
+
+
+def run_turtle_code(code: str, width: int = 600, height: int = 600, animate: bool = False,
+                    renderer: str = None, output: str = 'frames', format: str = 'png',
+                    max_frames: int = None, target_duration: float = None, binary: bool = False) -> dict:
+    """
+    Turtle 코드를 시뮬레이션하여 결과 이미지를 Base64로 반환
 
     Args:
         code: 실행할 Python turtle 코드
         width: 캔버스 너비 (픽셀)
         height: 캔버스 높이 (픽셀)
         animate: True이면 프레임 배열 반환, False이면 최종 이미지만 반환
+        renderer: 렌더러 백엔드 이름 ('raster' 또는 'matplotlib', None이면 기본값)
+        output: 애니메이션 출력 형식 - 'frames'이면 프레임별 PNG 배열,
+                'apng'/'webp'/'gif'이면 하나의 애니메이션 이미지
+        format: 정적 이미지 형식 - 'png', 'webp' 또는 'svg' (svg는 렌더러 없이 벡터로 직렬화)
+        max_frames: 애니메이션 최대 프레임 수 (None이면 서버 최대값)
+        target_duration: 애니메이션 목표 재생 시간 (초)
+        binary: True이면 image/frames/animation을 data URI 대신 인코딩된 바이트로 반환
 
     Returns:
         dict: {
             'success': bool,
-            'image': str (base64 encoded image) - animate=False일 때,
-            'frames': list[str] (base64 encoded images) - animate=True일 때,
+            'image': str (base64 encoded PNG/WebP/SVG image) - animate=False일 때,
+            'frames': list[str] (base64 encoded images) - animate=True, output='frames'일 때,
+            'animation': str (base64 encoded animated image) - animate=True, output이 애니메이션 형식일 때,
+            'source_frame_count': int (키프레임 선택 전 프레임 수) - animate=True일 때,
+            'stats': dict (simulation_stats - 작업량과 예상 렌더링 비용),
+            'timings': dict (단계별 소요 시간 ms - exec, integrate, render, encode, base64),
             'error': str (에러 메시지, 있는 경우)
         }
     """
+    timer = StageTimer()
     try:
-        # Turtle 시뮬레이터 생성
-        t = TurtleSimulator(record_frames=animate)
-
-        # 사용자 코드 실행 (t.done() 제거)
-        user_code = code.replace('t.done()', '').replace('turtle.done()', '')
-        user_code = user_code.replace('import turtle as t', '')
-        user_code = user_code.replace('import turtle', '')
-
-        # input() 함수를 기본값으로 대체하는 함수
-        def mock_input(prompt=''):
-            # 숫자를 요구하는 경우 기본값 반환
-            if '변의 수' in prompt or '수' in prompt:
-                return '6'
-            return '5'
-
-        # 전역 네임스페이스에 t 추가
-        exec_globals = {
-            't': t,
-            'input': mock_input,
-            'int': int,
-            'range': range,
-            '__import__': __import__,  # import 문 지원
-            '_': None  # for _ in range() 지원
-        }
-
-        # 코드 실행
-        exec(user_code, exec_globals)
-
-        # 애니메이션 모드인 경우 모든 프레임 렌더링
+        if output != 'frames' and output not in ANIMATION_FORMATS:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {output} "
+                             f"(가능: frames, {', '.join(ANIMATION_FORMATS)})")
+        if format not in IMAGE_FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 형식입니다: {format} (가능: {', '.join(IMAGE_FORMATS)})")
+        if format == 'svg' and animate:
+            raise ValueError("svg 형식은 정적 이미지(animate=False)에서만 사용할 수 있습니다")
+        budget = frame_budget(max_frames, target_duration)
+
+        t = simulate_turtle_code(code, animate, timer)
+
+        # 애니메이션 모드인 경우 키프레임만 렌더링
         if animate and t.frames:
-            frames = []
-            for i, frame_data in enumerate(t.frames):
-                # 해당 프레임의 거북이 위치 가져오기
-                turtle_pos = t.positions[i] if i < len(t.positions) else None
-                frame_image = render_frame(frame_data, width, height, turtle_pos)
-                frames.append(frame_image)
-
+            keyframes = select_keyframes(t.frames, t.segments, min(budget, affordable_frames(t, width, height)))
+            if output in ANIMATION_FORMATS:
+                # 모든 프레임을 하나의 애니메이션 이미지로 인코딩
+                # (인코더가 제너레이터를 소비하며 렌더링하므로 render 시간은 encode에서 빠짐)
+                images = render_keyframes(t, keyframes, width, height, renderer, timer)
+                try:
+                    with timer.stage('encode'):
+                        palette = gif_palette(t.segments, t.filled_shapes) if output == 'gif' else None
+                        data = animation_bytes(images, output, palette)
+                finally:
+                    images.close()
+                return {
+                    'success': True,
+                    'animation': _finish_output(timer, data, ANIMATION_FORMATS[output], binary),
+                    'format': output,
+                    'frame_count': len(keyframes),
+                    'source_frame_count': len(t.frames),
+                    'stats': simulation_stats(t, len(keyframes), width, height),
+                    'timings': timer.as_ms(),
+                    'error': None
+                }
+            frames = list(render_png_frames(t, keyframes, width, height, renderer, timer, binary))
             return {
                 'success': True,
                 'frames': frames,
                 'frame_count': len(frames),
+                'source_frame_count': len(t.frames),
+                'stats': simulation_stats(t, len(frames), width, height),
+                'timings': timer.as_ms(),
                 'error': None
             }
 
         # 정적 이미지 모드 - 최종 결과만 렌더링 (거북이 위치 포함)
-        final_turtle_pos = (t.x, t.y, t.angle) if t.is_visible else None
-        final_frame_data = {
-            'lines': t.lines,
-            'filled_shapes': t.filled_shapes
-        }
-        final_image = render_frame(final_frame_data, width, height, final_turtle_pos)
-
+        image = render_final_image(t, width, height, format, renderer, timer, binary)
         return {
             'success': True,
-            'image': final_image,
+            'image': image,
+            'stats': simulation_stats(t, 0 if format == 'svg' else 1, width, height),
+            'timings': timer.as_ms(),
             'error': None
         }
 
+    except MemoryError:
+        raise  # 실행 풀이 메모리 제한 초과로 처리하도록 그대로 전달
+    except SimulationBudgetExceeded as e:
+        return {
+            'success': False,
+            'image': None,
+            'stats': e.stats,
+            'timings': timer.as_ms(),
+            'error': str(e)
+        }
     except Exception as e:
-        # 에러 발생 시 matplotlib 정리
-        try:
-            plt.close('all')
-        except:
-            pass
-
         return {
             'success': False,
             'image': None,
+            'timings': timer.as_ms(),
             'error': str(e)
         }
 
+
+def stream_turtle_frames(code: str, width: int = 600, height: int = 600, animate: bool = True,
+                         renderer: str = None, format: str = 'png', max_frames: int = None,
+                         target_duration: float = None, binary: bool = False):
+    """
+    애니메이션 프레임을 준비되는 대로 하나씩 생성하는 제너레이터
+
+    시뮬레이션 후 프레임을 하나씩 렌더링하고 인코딩하여 바로 내보내므로,
+    첫 프레임까지의 시간과 메모리 사용량이 애니메이션 길이와 무관하다.
+    animate=False이거나 기록된 프레임이 없으면 최종 이미지 한 장을 프레임으로 보낸다.
+
+    Args:
+        code: 실행할 Python turtle 코드
+        width: 캔버스 너비 (픽셀)
+        height: 캔버스 높이 (픽셀)
+        animate: False이면 최종 이미지만 format 형식으로 전송
+        renderer: 렌더러 백엔드 이름 (None이면 기본값)
+        format: 최종 이미지 형식 - 'png', 'webp' 또는 'svg' (애니메이션 프레임은 항상 PNG이므로 'png'만 가능)
+        max_frames: 최대 프레임 수 (None이면 서버 최대값)
+        target_duration: 목표 재생 시간 (초)
+        binary: True이면 프레임 image를 data URI 대신 인코딩된 바이트로 전달
+
+    Yields:
+        dict: 이벤트 - 순서대로
+            {'type': 'start', 'frame_count': int, 'source_frame_count': int, 'stats': dict}
+            {'type': 'frame', 'index': int, 'image': str 또는 bytes} (frame_count번)
+            {'type': 'end', 'frame_count': int, 'timings': dict (단계별 소요 시간 ms)}
+            실패하면 그 시점에 {'type': 'error', 'error': str}를 내보내고 종료
+    """
+    timer = StageTimer()
+    try:
+        if format not in IMAGE_FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 형식입니다: {format} (가능: {', '.join(IMAGE_FORMATS)})")
+        if animate and format != 'png':
+            raise ValueError("애니메이션 프레임은 png 형식으로만 스트리밍할 수 있습니다")
+        budget = frame_budget(max_frames, target_duration)
+        t = simulate_turtle_code(code, animate=animate, timer=timer)
+    except MemoryError:
+        raise  # 실행 풀이 메모리 제한 초과로 처리하도록 그대로 전달
+    except SimulationBudgetExceeded as e:
+        yield {'type': 'error', 'error': str(e), 'stats': e.stats}
+        return
+    except Exception as e:
+        yield {'type': 'error', 'error': str(e)}
+        return
+
+    if not animate or not t.frames:
+        yield {'type': 'start', 'frame_count': 1, 'source_frame_count': len(t.frames),
+               'stats': simulation_stats(t, 0 if format == 'svg' else 1, width, height)}
+        try:
+            image = render_final_image(t, width, height, format, renderer, timer, binary)
+        except MemoryError:
+            raise
+        except Exception as e:
+            yield {'type': 'error', 'error': str(e)}
+            return
+        yield {'type': 'frame', 'index': 0, 'image': image}
+        yield {'type': 'end', 'frame_count': 1, 'timings': timer.as_ms()}
+        return
+
+    keyframes = select_keyframes(t.frames, t.segments, min(budget, affordable_frames(t, width, height)))
+    yield {'type': 'start', 'frame_count': len(keyframes), 'source_frame_count': len(t.frames),
+           'stats': simulation_stats(t, len(keyframes), width, height)}
+    frames = render_png_frames(t, keyframes, width, height, renderer, timer, binary)
+    try:
+        for index, image in enumerate(frames):
+            yield {'type': 'frame', 'index': index, 'image': image}
+    except MemoryError:
+        raise
+    except Exception as e:
+        yield {'type': 'error', 'error': str(e)}
+        return
+    finally:
+        frames.close()
+    yield {'type': 'end', 'frame_count': len(keyframes), 'timings': timer.as_ms()}
@@ -9,9 +9,12 @@ export const API_ENDPOINTS = {
   errorReport: (id: number) => `${API_BASE_URL}/api/error-reports/${id}`,
   toggleResolved: (id: number) => `${API_BASE_URL}/api/error-reports/${id}/toggle-resolved`,
   verifyCode: `${API_BASE_URL}/api/verify-code`,
+  verifyCodeStream: `${API_BASE_URL}/api/verify-code/stream`,
+  verifyBatch: `${API_BASE_URL}/api/error-reports/verify-batch`,
 
   // Turtle
   turtleExecute: `${API_BASE_URL}/api/turtle/execute`,
+  turtleExecuteBatch: `${API_BASE_URL}/api/turtle/execute-batch`,
 
   // 오류 보고
   sendErrorReport: `${API_BASE_URL}/api/error-report`,
@@ -49,3 +52,30 @@ export async function fetchAPI<T>(
   }
 }
 
+
+// NDJSON 스트리밍 응답 읽기 (한 줄에 하나의 이벤트 - 일괄 실행/검증 API)
+// 이벤트는 도착하는 대로 onEvent로 전달되고, 스트림이 끝나면 resolve
+export async function readNdjsonStream(
+  response: Response,
+  onEvent: (event: any) => void
+): Promise<void> {
+  if (!response.ok || !response.body) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop() || '';
+    for (const line of lines) {
+      if (line.trim()) onEvent(JSON.parse(line));
+    }
+  }
+  buffer += decoder.decode();
+  if (buffer.trim()) onEvent(JSON.parse(buffer));
+}
@@ -1,7 +1,7 @@
 import { useState, useEffect, useCallback, useMemo } from 'react';
 import Header from '../components/Header';
 import Footer from '../components/Footer';
-import { API_ENDPOINTS, fetchAPI } from '../config/api';
+import { API_ENDPOINTS, fetchAPI, readNdjsonStream } from '../config/api';
 import './ErrorManagement.css';
 
 interface ErrorReport {
@@ -58,6 +58,7 @@ export default function ErrorManagement() {
   const [verifyingReport, setVerifyingReport] = useState<ErrorReport | null>(null);
   const [verificationResult, setVerificationResult] = useState<VerificationResult | null>(null);
   const [isVerifying, setIsVerifying] = useState(false);
+  const [liveOutput, setLiveOutput] = useState('');
   const [bulkVerifying, setBulkVerifying] = useState(false);
   const [bulkVerificationResults, setBulkVerificationResults] = useState<BulkVerificationResult[]>([]);
   const itemsPerPage = 10;
@@ -154,14 +155,15 @@ export default function ErrorManagement() {
     }
   }, []);
 
-  // 코드 검증 함수 (최적화)
+  // 코드 검증 함수 (실행 중 출력을 SSE로 받아 바로 표시)
   const verifyCode = useCallback(async (report: ErrorReport) => {
     setVerifyingReport(report);
     setIsVerifying(true);
     setVerificationResult(null);
+    setLiveOutput('');
 
     try {
-      const response = await fetch(API_ENDPOINTS.verifyCode, {
+      const response = await fetch(API_ENDPOINTS.verifyCodeStream, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -170,9 +172,38 @@ export default function ErrorManagement() {
           code: report.user_code,
         }),
       });
+      if (!response.ok || !response.body) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
 
-      const result = await response.json();
-      setVerificationResult(result);
+      // SSE: 빈 줄로 구분된 이벤트의 data 줄
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let finished = false;
+      while (!finished) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop() || '';
+        for (const block of events) {
+          const data = block.split('\n').find(line => line.startsWith('data: '));
+          if (!data) continue;
+          const event = JSON.parse(data.slice('data: '.length));
+          if (event.type === 'output') {
+            setLiveOutput(prev => prev + event.text);
+          } else if (event.type === 'result') {
+            setVerificationResult(event);
+            finished = true;
+          } else if (event.type === 'error') {
+            throw new Error(event.error);
+          }
+        }
+      }
+      if (!finished) {
+        throw new Error('검증 결과를 받지 못했습니다');
+      }
     } catch (error) {
       console.error('Failed to verify code:', error);
       setVerificationResult({
@@ -260,7 +291,7 @@ export default function ErrorManagement() {
     });
   }, []);
 
-  // 선택된 항목 일괄 검증 (최적화)
+  // 선택된 항목 일괄 검증 (서버에서 병렬 검증, 끝나는 순서대로 결과 표시)
   const verifySelected = useCallback(async () => {
     if (selectedIds.length === 0) {
       alert('검증할 오류를 선택해주세요.');
@@ -270,50 +301,39 @@ export default function ErrorManagement() {
     setBulkVerifying(true);
     setBulkVerificationResults([]);
 
+    const reportsById = new Map(reports.map(report => [report.id, report]));
+
     try {
-      // 선택된 오류들의 정보 가져오기
-      const selectedReports = reports.filter(r => selectedIds.includes(r.id));
-
-      // 모든 선택된 오류를 검증 (병렬 처리)
-      const results = await Promise.all(
-        selectedReports.map(async (report) => {
-          try {
-            const response = await fetch(API_ENDPOINTS.verifyCode, {
-              method: 'POST',
-              headers: {
-                'Content-Type': 'application/json',
-              },
-              body: JSON.stringify({
-                code: report.user_code,
-              }),
-            });
-
-            const result = await response.json();
-            return {
-              id: report.id,
-              level: report.level,
-              activity: report.activity,
-              error_message: report.error_message,
-              user_code: report.user_code,
-              ...result,
-            };
-          } catch {
-            return {
-              id: report.id,
-              level: report.level,
-              activity: report.activity,
-              user_code: report.user_code,
-              error_message: report.error_message,
+      const response = await fetch(API_ENDPOINTS.verifyBatch, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ ids: selectedIds }),
+      });
+
+      await readNdjsonStream(response, event => {
+        if (event.type !== 'result') return;
+
+        const report = reportsById.get(event.id);
+        const base = {
+          id: event.id,
+          level: event.level,
+          activity: event.activity,
+          error_message: report?.error_message ?? '',
+          user_code: report?.user_code ?? '',
+        };
+        const result = (event.success
+          ? { ...base, ...event }
+          : {
+              ...base,
               success: false,
               error_occurred: true,
               error_message_new: '검증 실패',
               suggestion: '백엔드 서버를 확인해주세요.',
-            };
-          }
-        })
-      );
-
-      setBulkVerificationResults(results);
+            }) as BulkVerificationResult;
+        setBulkVerificationResults(prev => [...prev, result]);
+      });
     } catch (error) {
       console.error('Failed to verify selected errors:', error);
       alert('일괄 검증 중 오류가 발생했습니다.');
@@ -321,30 +341,61 @@ export default function ErrorManagement() {
     }
   }, [selectedIds, reports]);
 
-  // 일괄 검증 후 해결 가능한 항목만 해결 (최적화)
-  const resolveVerifiedItems = useCallback(async (resolvedIds: number[]) => {
+  // 일괄 검증 후 해결 처리 후 화면 정리
+  const finishBulkResolve = useCallback(async (resolvedCount: number) => {
+    // 데이터 새로고침
+    await fetchData();
+    // 선택 목록 초기화
+    setSelectedIds([]);
+    // 모달 닫기
+    setBulkVerifying(false);
+    setBulkVerificationResults([]);
+    alert(`${resolvedCount}개의 오류가 해결됨으로 표시되었습니다.`);
+  }, [fetchData]);
+
+  // 일괄 검증 후 정상 실행된 항목만 해결
+  // 서버가 저장된 검증 결과로 다시 확인하고 정상 실행된 오류를 한 번에 해결됨으로 표시 (resolve_passing)
+  const resolvePassingItems = useCallback(async (passingIds: number[]) => {
+    try {
+      const response = await fetch(API_ENDPOINTS.verifyBatch, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ ids: passingIds, resolve_passing: true }),
+      });
+
+      const outcome: { resolvedIds?: number[]; error?: string } = {};
+      await readNdjsonStream(response, event => {
+        if (event.type === 'end') outcome.resolvedIds = event.resolved_ids;
+        else if (event.type === 'error') outcome.error = event.error;
+      });
+      if (outcome.error) throw new Error(outcome.error);
+      if (!outcome.resolvedIds) throw new Error('해결 처리 결과를 받지 못했습니다');
+
+      await finishBulkResolve(outcome.resolvedIds.length);
+    } catch (error) {
+      console.error('Failed to resolve verified items:', error);
+      alert('해결 처리 중 오류가 발생했습니다.');
+    }
+  }, [finishBulkResolve]);
+
+  // 검증 결과와 관계없이 모든 항목 해결
+  const resolveAllItems = useCallback(async (ids: number[]) => {
     try {
       await Promise.all(
-        resolvedIds.map(id =>
+        ids.map(id =>
           fetch(API_ENDPOINTS.toggleResolved(id), {
             method: 'PATCH',
           })
         )
       );
-
-      // 데이터 새로고침
-      await fetchData();
-      // 선택 목록 초기화
-      setSelectedIds([]);
-      // 모달 닫기
-      setBulkVerifying(false);
-      setBulkVerificationResults([]);
-      alert(`${resolvedIds.length}개의 오류가 해결됨으로 표시되었습니다.`);
+      await finishBulkResolve(ids.length);
     } catch (error) {
       console.error('Failed to resolve verified items:', error);
       alert('해결 처리 중 오류가 발생했습니다.');
     }
-  }, [fetchData]);
+  }, [finishBulkResolve]);
 
   // 선택된 항목 일괄 해결
   const resolveSelected = useCallback(async () => {
@@ -782,6 +833,11 @@ export default function ErrorManagement() {
                     <div className="verification-loading">
                       <span className="spinner"></span>
                       <p>코드를 실행하여 오류를 검증하는 중...</p>
+                      {liveOutput && (
+                        <div className="output-box">
+                          <pre>{liveOutput}</pre>
+                        </div>
+                      )}
                     </div>
                   ) : verificationResult ? (
                     <div className="verification-result">
@@ -985,7 +1041,7 @@ export default function ErrorManagement() {
                         return;
                       }
                       if (window.confirm(`정상 실행된 ${resolvedIds.length}개의 오류를 해결됨으로 표시하시겠습니까?`)) {
-                        resolveVerifiedItems(resolvedIds);
+                        resolvePassingItems(resolvedIds);
                       }
                     }}
                     disabled={bulkVerificationResults.filter(r => !r.error_occurred).length === 0}
@@ -997,7 +1053,7 @@ export default function ErrorManagement() {
                     onClick={() => {
                       const allIds = bulkVerificationResults.map(r => r.id);
                       if (window.confirm(`모든 ${allIds.length}개의 오류를 해결됨으로 표시하시겠습니까?`)) {
-                        resolveVerifiedItems(allIds);
+                        resolveAllItems(allIds);
                       }
                     }}
                   >
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { pythonCurriculum } from '../data/pythonCurriculum';
 import { usePyodide, setupPythonEnvironment, wrapUserCode } from '../hooks/usePyodide';
+import { API_ENDPOINTS, readNdjsonStream } from '../config/api';
 import './TestCurriculum.css';
 
 interface TestResult {
@@ -66,6 +67,56 @@ const skipTests: string[] = [
   '7-2', // while True 무한 루프 (0이 나올 때까지)
 ];
 
+interface TurtleBatchResult {
+  success: boolean;
+  error?: string;
+}
+
+const isTurtleActivity = (code: string) =>
+  code.includes('import turtle') || code.includes('from turtle');
+
+// 모든 Turtle 예제를 한 번의 요청으로 백엔드에서 병렬 실행
+// 결과는 끝나는 순서대로 스트리밍되므로 활동 ID별 Promise로 돌려줌
+function runTurtleBatch(items: { id: string; code: string }[]): Map<string, Promise<TurtleBatchResult>> {
+  const resolvers = new Map<string, (result: TurtleBatchResult) => void>();
+  const promises = new Map<string, Promise<TurtleBatchResult>>();
+  for (const item of items) {
+    promises.set(item.id, new Promise(resolve => resolvers.set(item.id, resolve)));
+  }
+
+  const finishRemaining = (error: string) => {
+    resolvers.forEach(resolve => resolve({ success: false, error }));
+    resolvers.clear();
+  };
+
+  (async () => {
+    try {
+      const response = await fetch(API_ENDPOINTS.turtleExecuteBatch, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          items,
+          width: 600,
+          height: 600,
+          animate: false, // 테스트에서는 정적 이미지만
+          include_output: false, // 성공 여부만 필요
+        }),
+      });
+      await readNdjsonStream(response, event => {
+        if (event.type === 'result') {
+          resolvers.get(event.id)?.({ success: event.success, error: event.error });
+          resolvers.delete(event.id);
+        }
+      });
+      finishRemaining('결과를 받지 못했습니다');
+    } catch (err: any) {
+      finishRemaining(`백엔드 연결 실패: ${err.message}`);
+    }
+  })();
+
+  return promises;
+}
+
 export default function TestCurriculum() {
   const { pyodide, isReady, isLoading } = usePyodide();
   const [testing, setTesting] = useState(false);
@@ -95,6 +146,14 @@ export default function TestCurriculum() {
     const allActivities: TestResult[] = [];
     let testIndex = 0;
 
+    // Turtle 예제는 Pyodide 테스트와 동시에 백엔드에서 미리 실행
+    const turtleResults = runTurtleBatch(
+      pythonCurriculum.levels
+        .flatMap(level => level.activities)
+        .filter(activity => !skipTests.includes(activity.id) && isTurtleActivity(activity.starterCode))
+        .map(activity => ({ id: activity.id, code: activity.starterCode }))
+    );
+
     for (const level of pythonCurriculum.levels) {
       for (const activity of level.activities) {
         testIndex++;
@@ -129,31 +188,15 @@ export default function TestCurriculum() {
         }
 
         // Turtle 모듈 테스트 (백엔드 API 사용)
-        const isTurtleCode = activity.starterCode.includes('import turtle') ||
-                            activity.starterCode.includes('from turtle');
-
-        if (isTurtleCode) {
-          try {
-            const response = await fetch('http://localhost:8000/api/turtle/execute', {
-              method: 'POST',
-              headers: { 'Content-Type': 'application/json' },
-              body: JSON.stringify({
-                code: activity.starterCode,
-                width: 600,
-                height: 600,
-                animate: false, // 테스트에서는 정적 이미지만
-              }),
-            });
-
-            const result = await response.json();
-
-            if (result.success) {
-              output = '🐢 Turtle 그래픽 실행 성공!\n(이미지는 실제 학습 페이지에서 확인하세요)';
-            } else {
-              error = result.error || 'Turtle 실행 실패';
-            }
-          } catch (err: any) {
-            error = `백엔드 연결 실패: ${err.message}`;
+        const turtleResult = turtleResults.get(activity.id);
+
+        if (turtleResult) {
+          const result = await turtleResult;
+
+          if (result.success) {
+            output = '🐢 Turtle 그래픽 실행 성공!\n(이미지는 실제 학습 페이지에서 확인하세요)';
+          } else {
+            error = result.error || 'Turtle 실행 실패';
           }
 
           allActivities.push({